@@ -0,0 +1,102 @@
+import asyncio
+import hmac
+import tracemalloc
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response
+from loguru import logger
+
+from utils.config import debug_endpoints, debug_token
+from utils.profiling import (
+    StackSampler,
+    dump_snapshot,
+    memory_report,
+    start_memory_tracing,
+    stop_memory_tracing,
+)
+
+
+def require_debug_access(x_debug_token: Optional[str] = Header(None)):
+    """
+    Garde des endpoints de profilage : invisibles (404) tant qu'ils ne sont pas
+    activés avec un token, puis réservés aux appels qui présentent ce token.
+    """
+    if not debug_endpoints or not debug_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_debug_token or not hmac.compare_digest(x_debug_token.encode(), debug_token.encode()):
+        raise HTTPException(status_code=403, detail="Invalid debug token")
+
+
+debug = APIRouter(prefix="/debug", tags=["Debug"], dependencies=[Depends(require_debug_access)])
+_profile_lock = asyncio.Lock()
+
+
+@debug.get("/profile", response_class=PlainTextResponse, summary="Sample the CPU stacks of the running process")
+async def profile(
+    seconds: float = Query(10, gt=0, le=120),
+    interval_ms: float = Query(5, ge=1, le=1000),
+    format: Literal["collapsed", "text"] = "collapsed",
+    idle: bool = False,
+    top: int = Query(30, ge=1, le=500),
+):
+    """
+    Échantillonne les piles de tous les threads pendant seconds secondes.
+
+    format=collapsed renvoie des piles repliées ("thread;racine;...;feuille nombre"),
+    directement lisibles par flamegraph.pl ou speedscope ; format=text un
+    classement self/cumulé des fonctions. idle=true garde les threads en attente.
+    """
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    async with _profile_lock:
+        logger.info(f"CPU profile requested for {seconds}s every {interval_ms}ms")
+        sampler = StackSampler(interval=interval_ms / 1000, include_idle=idle)
+        await asyncio.to_thread(sampler.run, seconds)
+    return sampler.collapsed() if format == "collapsed" else sampler.top(top)
+
+
+@debug.post("/memory/start", summary="Start tracing Python allocations")
+def memory_start(frames: int = Query(10, ge=1, le=100)):
+    """Démarre tracemalloc ; le surcoût mémoire et CPU dure jusqu'à /debug/memory/stop."""
+    started = start_memory_tracing(frames)
+    logger.info(f"tracemalloc {'started' if started else 'already running'} ({tracemalloc.get_traceback_limit()} frames)")
+    return {"status": "started" if started else "already tracing", "frames": tracemalloc.get_traceback_limit()}
+
+
+@debug.post("/memory/stop", summary="Stop tracing Python allocations")
+def memory_stop():
+    return {"status": "stopped" if stop_memory_tracing() else "not tracing"}
+
+
+def _require_tracing():
+    if not tracemalloc.is_tracing():
+        raise HTTPException(
+            status_code=409,
+            detail="tracemalloc is not tracing: POST /debug/memory/start or set PYTHONTRACEMALLOC",
+        )
+
+
+@debug.get("/memory", response_class=PlainTextResponse, summary="Top allocations or their growth since the last call")
+def memory(
+    top: int = Query(25, ge=1, le=500),
+    group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+    diff: bool = True,
+):
+    """
+    Principales allocations vivantes ; avec diff=true (défaut), leur évolution
+    depuis l'appel précédent, pour repérer ce qui grossit entre deux mesures.
+    """
+    _require_tracing()
+    return memory_report(top=top, group_by=group_by, diff=diff)
+
+
+@debug.get("/memory/snapshot", summary="Download a raw tracemalloc snapshot")
+def memory_snapshot():
+    """Instantané complet, à charger hors ligne avec tracemalloc.Snapshot.load()."""
+    _require_tracing()
+    return Response(
+        content=dump_snapshot(),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": 'attachment; filename="memory.snapshot"'},
+    )
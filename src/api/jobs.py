@@ -0,0 +1,21 @@
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, HTTPException
+
+from core.jobs import job_registry
+
+jobs = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@jobs.get("", summary="Recent background jobs", description="Background jobs of this API replica, newest first")
+def list_jobs() -> List[Dict[str, Any]]:
+    return [job.to_dict() for job in job_registry.list()]
+
+
+@jobs.get("/{job_id}", summary="Background job status and progress")
+def get_job(job_id: str) -> Dict[str, Any]:
+    """Statut et progression d'un job (ex. GET /delete-rs)"""
+    job = job_registry.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
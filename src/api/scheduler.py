@@ -7,7 +7,7 @@ from loguru import logger
 from pydantic import BaseModel
 
 from core.dbManager import DatabaseManager
-from core.models import ScheduleStatus, WorkloadSchedule
+from core.models import ScheduleStatus, WorkloadSchedule, WorkloadStartup
 from utils.clean_cron import clean_cron_expression
 
 scheduler = APIRouter(tags=["Schedule Management"])
@@ -158,7 +158,8 @@ async def update_schedule_route(
         Un objet ScheduleResponse indiquant le succès de l'opération
     """
     try:
-        data = schedule.model_dump()
+        # Mise à jour partielle : seuls les champs envoyés sont modifiés (l'UI n'envoie que les crons)
+        data = schedule.model_dump(exclude_unset=True)
         validated_data = prepare_schedule_data(data)
         
         updated_schedule = WorkloadSchedule(**validated_data)
@@ -258,4 +259,85 @@ async def remove_crons_from_schedule(
         raise e
     except Exception as e:
         logger.error(f"Error removing cron expressions from schedule with UID {uid}: {e}")
-        raise HTTPException(status_code=500, detail=f"Error updating schedule: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error updating schedule: {str(e)}")
+
+
+@scheduler.post(
+    "/startup-metrics",
+    response_model=ScheduleResponse,
+    summary="Record a workload startup time",
+    description="Store the time-to-ready measured after a scheduled scale-up"
+)
+async def create_startup_metric(
+    metric: WorkloadStartup = Body(..., description="The startup measurement to store")
+) -> ScheduleResponse:
+    """
+    Enregistre le temps de démarrage (time-to-ready) d'un workload.
+
+    Args:
+        metric: Mesure de démarrage envoyée par le moteur de scheduling
+    Returns:
+        Un objet ScheduleResponse indiquant le succès de l'opération
+    """
+    try:
+        data = metric.model_dump(exclude={"id"})
+        for key in ("started_at", "ready_at"):
+            if isinstance(data.get(key), str):
+                data[key] = datetime.fromisoformat(data[key].replace("Z", "+00:00"))
+        await db_manager.store_startup_metric(WorkloadStartup(**data))
+        return ScheduleResponse(status="created", detail="Startup metric recorded")
+    except ValueError as ve:
+        logger.error(f"Validation error: {ve}")
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"Error recording startup metric: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@scheduler.get(
+    "/startup-summary",
+    response_model=Dict[str, Dict[str, Optional[float]]],
+    summary="Get startup time percentiles",
+    description="Rolling p50/p95 time-to-ready per workload UID, used to compute pre-warm lead times"
+)
+async def get_startup_summary(samples: int = 20) -> Dict[str, Dict[str, Any]]:
+    """
+    Récupère les percentiles glissants des temps de démarrage par workload.
+
+    Args:
+        samples: Nombre de mesures récentes prises en compte par workload
+    Returns:
+        Dictionnaire uid -> {count, p50, p95}
+    """
+    try:
+        return await db_manager.get_startup_summary(samples=samples)
+    except Exception as e:
+        logger.error(f"Error computing startup summary: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@scheduler.get(
+    "/startup-metrics/{uid}",
+    response_model=List[WorkloadStartup],
+    summary="Get workload startup times",
+    description="Retrieve the most recent time-to-ready measurements of a workload"
+)
+async def get_startup_metrics(
+    uid: str = Path(..., description="UID of the workload"),
+    limit: int = 50,
+) -> List[WorkloadStartup]:
+    """
+    Récupère les derniers temps de démarrage d'un workload.
+
+    Args:
+        uid: Identifiant unique du workload
+        limit: Nombre maximal de mesures retournées
+    Returns:
+        Liste des mesures, de la plus récente à la plus ancienne
+    """
+    try:
+        return list(await db_manager.get_startup_metrics(uid, limit))
+    except Exception as e:
+        logger.error(f"Error fetching startup metrics for {uid}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
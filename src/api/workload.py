@@ -1,13 +1,46 @@
+import asyncio
+from functools import partial
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query, Response
 from kubernetes.client.rest import ApiException
 from loguru import logger
 from pydantic import BaseModel
 
 from core.dbManager import DatabaseManager
-from utils.config import protected_namespaces
-from utils.helpers import apps_v1, core_v1
+from core.jobs import Job, job_registry
+from core.kub_list import (
+    build_namespace_field_selector,
+    find_by_uid,
+    index_raw_replicaset_owners,
+    iter_filtered,
+    iter_list,
+    list_filtered,
+    resolve_raw_pod_workloads,
+)
+from core.replicaset_gc import delete_zero_replicasets
+from core.scale_state import (
+    HPA_KINDS,
+    build_scale_down_patch,
+    build_scale_up_patch,
+    find_hpa,
+    index_hpas,
+    workload_readiness,
+)
+from core.waves import build_scale_waves, describe_waves, wait_for_wave_ready
+from utils.config import (
+    allowed_namespaces,
+    default_node_pool,
+    drain_excluded_workloads,
+    namespaced_list_threshold,
+    node_pools,
+    protected_namespaces,
+    replicaset_delete_concurrency,
+    replicaset_delete_qps,
+)
+from utils.helpers import apps_v1, autoscaling_v2, core_v1
+from utils.metrics import track_scale
+from utils.startup import startup_tasks
 
 
 class PodStatus(BaseModel):
@@ -17,6 +50,7 @@ class PodStatus(BaseModel):
 
 class ReplicaSetResponse(BaseModel):
     status: str
+    job_id: Optional[str] = None
     deleted_replicasets: Optional[int] = None
     message: Optional[str] = None
 
@@ -24,18 +58,29 @@ class WorkloadResponse(BaseModel):
     status: str
     message: str
 
+class WorkloadReadinessResponse(BaseModel):
+    status: str
+    desired_replicas: Optional[int] = None
+    ready_replicas: Optional[int] = None
+    ready: bool = False
+    message: Optional[str] = None
+
 class BulkActionResponse(BaseModel):
     message: str
+    status: Optional[str] = None
+    job_id: Optional[str] = None
+    matched: Optional[int] = None
+    argocd_applications: Optional[Dict[str, List[str]]] = None
+    waves: Optional[List[List[str]]] = None
 
 workload = APIRouter(tags=["Workload Management"])
 health_route = APIRouter()
 
-async def process_deployment(deploy, mode):
+async def process_deployment(deploy, mode, disable_argocd=True, hpa_index=None):
     """Traite un déploiement pour le scaling up/down"""
     try:
         deploy_name = deploy.metadata.name
         deploy_namespace = deploy.metadata.namespace
-        deploy_uid = deploy.metadata.uid
         
         if deploy_namespace in protected_namespaces:
             logger.info(f"Skipping deployment {deploy_name} in protected namespace {deploy_namespace}")
@@ -43,19 +88,18 @@ async def process_deployment(deploy, mode):
         
         if mode == "down":
             logger.info(f"Scaling down deployment '{deploy_name}' in namespace '{deploy_namespace}'")
-            await manage_status("down", "deploy", deploy_uid)
+            await scale_deployment_object(deploy, 0, disable_argocd=disable_argocd, hpa_index=hpa_index)
         elif mode == "up":
             logger.info(f"Scaling up deployment '{deploy_name}' in namespace '{deploy_namespace}'")
-            await manage_status("up", "deploy", deploy_uid)
+            await scale_deployment_object(deploy, None, disable_argocd=disable_argocd)
     except Exception as e:
         logger.error(f"Error processing deployment {deploy.metadata.name}: {e}")
 
-async def process_statefulset(sts, mode):
+async def process_statefulset(sts, mode, disable_argocd=True, hpa_index=None):
     """Traite un statefulset pour le scaling up/down"""
     try:
         sts_name = sts.metadata.name
         sts_namespace = sts.metadata.namespace
-        sts_uid = sts.metadata.uid
         
         if sts_namespace in protected_namespaces:
             logger.info(f"Skipping statefulset {sts_name} in protected namespace {sts_namespace}")
@@ -63,252 +107,394 @@ async def process_statefulset(sts, mode):
         
         if mode == "down":
             logger.info(f"Scaling down StatefulSet '{sts_name}' in namespace '{sts_namespace}'")
-            await manage_status("down", "sts", sts_uid)
+            await scale_statefulset_object(sts, 0, disable_argocd=disable_argocd, hpa_index=hpa_index)
         elif mode == "up":
             logger.info(f"Scaling up StatefulSet '{sts_name}' in namespace '{sts_namespace}'")
-            await manage_status("up", "sts", sts_uid)
+            await scale_statefulset_object(sts, None, disable_argocd=disable_argocd)
     except Exception as e:
         logger.error(f"Error processing statefulset {sts.metadata.name}: {e}")
 
+def iter_pool_pods(node_names):
+    """
+    Pods (JSON brut) planifiés sur les nœuds donnés : une liste par nœud (spec.nodeName)
+    jusqu'à namespaced_list_threshold nœuds, au-delà une seule liste filtrée côté client.
+    """
+    list_args = (core_v1.list_pod_for_all_namespaces, core_v1.list_namespaced_pod, protected_namespaces)
+    if len(node_names) <= namespaced_list_threshold:
+        for node_name in sorted(node_names):
+            yield from iter_filtered(*list_args, allowed_namespaces=allowed_namespaces, raw=True,
+                                     field_selector=f"spec.nodeName={node_name}")
+    else:
+        for pod in iter_filtered(*list_args, allowed_namespaces=allowed_namespaces, raw=True):
+            if (pod.get("spec") or {}).get("nodeName") in node_names:
+                yield pod
+
+def is_drain_excluded(resource) -> bool:
+    """Workload exclu du drain d'un pool (DRAIN_EXCLUDED_WORKLOADS : "name" ou "namespace/name")"""
+    name, namespace = resource.metadata.name, resource.metadata.namespace
+    return name in drain_excluded_workloads or f"{namespace}/{name}" in drain_excluded_workloads
+
+def list_pool_workloads(pool: str):
+    """
+    Deployments et StatefulSets (non exclus) dont des pods tournent sur un pool de nœuds.
+
+    Returns:
+        (noms des nœuds du pool, deployments, statefulsets)
+    """
+    node_names = {
+        node["metadata"]["name"]
+        for node in iter_list(core_v1.list_node, raw=True, label_selector=node_pools[pool])
+    }
+    logger.info(f"Node pool '{pool}' has {len(node_names)} nodes")
+
+    # Owners resolved through ownerReferences (Pod -> ReplicaSet -> Deployment, Pod -> StatefulSet):
+    # one pass over the ReplicaSets and one over the pods of the pool, instead of matching selectors
+    owners = {"Deployment": set(), "StatefulSet": set()}
+    if node_names:
+        replicaset_owners = index_raw_replicaset_owners(iter_filtered(
+            apps_v1.list_replica_set_for_all_namespaces, apps_v1.list_namespaced_replica_set,
+            protected_namespaces, allowed_namespaces=allowed_namespaces, raw=True,
+        ))
+        owners = resolve_raw_pod_workloads(iter_pool_pods(node_names), replicaset_owners)
+    logger.info(
+        f"Pods on node pool '{pool}' belong to {len(owners['Deployment'])} deployments "
+        f"and {len(owners['StatefulSet'])} statefulsets"
+    )
+
+    def runs_on_pool(resource, kind):
+        if resource.metadata.uid not in owners[kind]:
+            return False
+        if is_drain_excluded(resource):
+            logger.info(f"Skipping excluded {kind} '{resource.metadata.namespace}/{resource.metadata.name}'")
+            return False
+        return True
+
+    target_deployments, target_statefulsets = [], []
+    if owners["Deployment"]:
+        target_deployments = [d for d in list_filtered(
+            apps_v1.list_deployment_for_all_namespaces, apps_v1.list_namespaced_deployment,
+            protected_namespaces, allowed_namespaces=allowed_namespaces,
+        ) if runs_on_pool(d, "Deployment")]
+    if owners["StatefulSet"]:
+        target_statefulsets = [s for s in list_filtered(
+            apps_v1.list_stateful_set_for_all_namespaces, apps_v1.list_namespaced_stateful_set,
+            protected_namespaces, allowed_namespaces=allowed_namespaces,
+        ) if runs_on_pool(s, "StatefulSet")]
+    return node_names, target_deployments, target_statefulsets
+
 @workload.get(
     "/manage-all/down-workers",
     response_model=BulkActionResponse,
-    summary="Shutdown workloads on worker nodes",
-    description="Scale down all deployments and statefulsets running on worker nodes (non-control-plane)"
+    summary="Shutdown workloads on a node pool",
+    description="Scale down all deployments and statefulsets with pods on a node pool (NODE_POOLS, "
+                "default: every non-control-plane node)"
 )
-async def shutdown_worker_nodes() -> Dict[str, Any]:
-    """Arrête tous les workloads tournant sur les nœuds workers (ryzen, nvidia)"""
-    logger.info("Received request to shutdown workloads on worker nodes")
+async def shutdown_worker_nodes(pool: Optional[str] = None) -> Dict[str, Any]:
+    """Arrête tous les workloads dont des pods tournent sur un pool de nœuds (sélecteur de labels de NODE_POOLS)"""
+    pool = pool or default_node_pool
+    if pool not in node_pools:
+        raise HTTPException(status_code=404, detail=f"Unknown node pool '{pool}' (known: {', '.join(node_pools)})")
+    logger.info(f"Received request to shutdown workloads on node pool '{pool}' ({node_pools[pool]})")
 
-    # Liste des nœuds workers (non-control-plane)
-    worker_nodes = ["ryzen", "nvidia"]
+    try:
+        # Listes et index cluster-wide bloquants : hors de l'event loop
+        node_names, target_deployments, target_statefulsets = await asyncio.to_thread(list_pool_workloads, pool)
 
-    # Liste des workloads critiques à ne jamais arrêter
-    excluded_workloads = ["traefik", "kyverno"]
+        # Disable ArgoCD auto-sync once per distinct Application before any scale PATCH
+        from utils.argocd import disable_auto_sync_for_resources
+        argocd_report = await disable_auto_sync_for_resources(target_deployments + target_statefulsets)
 
-    shutdown_count = 0
+        hpa_index = await asyncio.to_thread(list_hpa_index)
 
-    try:
-        deployments = apps_v1.list_deployment_for_all_namespaces()
-        logger.info(f"Found {len(deployments.items)} deployments to check")
-
-        statefulsets = apps_v1.list_stateful_set_for_all_namespaces()
-        logger.info(f"Found {len(statefulsets.items)} statefulsets to check")
-
-        # Get all pods to check their nodes
-        all_pods = core_v1.list_pod_for_all_namespaces()
-
-        # Process deployments
-        for deploy in deployments.items:
-            if deploy.metadata.namespace in protected_namespaces:
-                continue
-
-            # Skip excluded workloads
-            if deploy.metadata.name in excluded_workloads:
-                logger.info(f"Skipping excluded deployment '{deploy.metadata.name}'")
-                continue
-
-            # Check if any pod of this deployment runs on worker nodes
-            # Get pods that belong to this deployment by checking labels
-            deploy_selector = deploy.spec.selector.match_labels if deploy.spec.selector and deploy.spec.selector.match_labels else {}
-
-            deploy_pods = [p for p in all_pods.items
-                          if p.metadata.namespace == deploy.metadata.namespace
-                          and p.metadata.labels
-                          and all(p.metadata.labels.get(k) == v for k, v in deploy_selector.items())]
-
-            runs_on_worker = any(pod.spec.node_name and any(worker in pod.spec.node_name for worker in worker_nodes)
-                               for pod in deploy_pods)
-
-            if runs_on_worker:
-                logger.info(f"Shutdown deployment '{deploy.metadata.name}' in namespace '{deploy.metadata.namespace}' (runs on worker node)")
-
-                # Check if deployment has ArgoCD auto-sync and disable it
-                if deploy.metadata.labels and "argocd.argoproj.io/instance" in deploy.metadata.labels:
-                    from utils.argocd import enable_auto_sync
-                    instance_name = deploy.metadata.labels["argocd.argoproj.io/instance"]
-                    logger.info(f"Deployment '{deploy.metadata.name}' has ArgoCD auto-sync, disabling it first")
-                    try:
-                        enable_auto_sync(instance_name)
-                    except Exception as e:
-                        logger.warning(f"Failed to disable ArgoCD auto-sync for '{instance_name}': {e}. Continuing anyway...")
-
-                await process_deployment(deploy, "down")
-                shutdown_count += 1
-
-        # Process statefulsets
-        for sts in statefulsets.items:
-            if sts.metadata.namespace in protected_namespaces:
-                continue
-
-            # Skip excluded workloads
-            if sts.metadata.name in excluded_workloads:
-                logger.info(f"Skipping excluded statefulset '{sts.metadata.name}'")
-                continue
-
-            # Check if any pod of this statefulset runs on worker nodes
-            # Get pods that belong to this statefulset by checking labels
-            sts_selector = sts.spec.selector.match_labels if sts.spec.selector and sts.spec.selector.match_labels else {}
-
-            sts_pods = [p for p in all_pods.items
-                       if p.metadata.namespace == sts.metadata.namespace
-                       and p.metadata.labels
-                       and all(p.metadata.labels.get(k) == v for k, v in sts_selector.items())]
-
-            runs_on_worker = any(pod.spec.node_name and any(worker in pod.spec.node_name for worker in worker_nodes)
-                               for pod in sts_pods)
-
-            if runs_on_worker:
-                logger.info(f"Shutdown statefulset '{sts.metadata.name}' in namespace '{sts.metadata.namespace}' (runs on worker node)")
-
-                # Check if statefulset has ArgoCD auto-sync and disable it
-                if sts.metadata.labels and "argocd.argoproj.io/instance" in sts.metadata.labels:
-                    from utils.argocd import enable_auto_sync
-                    instance_name = sts.metadata.labels["argocd.argoproj.io/instance"]
-                    logger.info(f"StatefulSet '{sts.metadata.name}' has ArgoCD auto-sync, disabling it first")
-                    try:
-                        enable_auto_sync(instance_name)
-                    except Exception as e:
-                        logger.warning(f"Failed to disable ArgoCD auto-sync for '{instance_name}': {e}. Continuing anyway...")
-
-                await process_statefulset(sts, "down")
-                shutdown_count += 1
-
-        logger.success(f"Shutdown {shutdown_count} workloads on worker nodes")
+        for resource in target_deployments + target_statefulsets:
+            logger.info(f"Shutdown '{resource.metadata.name}' in namespace '{resource.metadata.namespace}' (runs on node pool '{pool}')")
+
+        waves = await run_scale_waves(
+            [("deploy", d) for d in target_deployments] + [("sts", s) for s in target_statefulsets],
+            "down",
+            hpa_index=hpa_index,
+        )
+
+        shutdown_count = len(target_deployments) + len(target_statefulsets)
+        logger.success(f"Shutdown {shutdown_count} workloads on node pool '{pool}'")
         return {
-            "message": f"Shutdown {shutdown_count} workloads running on worker nodes (ryzen, nvidia)"
+            "message": f"Shutdown {shutdown_count} workloads running on node pool '{pool}' ({len(node_names)} nodes)",
+            "matched": shutdown_count,
+            "argocd_applications": argocd_report,
+            "waves": describe_waves(waves),
         }
     except Exception as e:
-        logger.error(f"Error while shutting down worker nodes: {e}")
+        logger.error(f"Error while shutting down node pool '{pool}': {e}")
         return {
-            "message": f"Error while shutting down worker nodes: {str(e)}"
+            "message": f"Error while shutting down node pool '{pool}': {str(e)}"
         }
 
+def list_all_workloads():
+    """Deployments et StatefulSets hors namespaces protégés, en (type, objet)"""
+    deployments = list_filtered(
+        apps_v1.list_deployment_for_all_namespaces, apps_v1.list_namespaced_deployment,
+        protected_namespaces, allowed_namespaces=allowed_namespaces,
+    )
+    logger.info(f"Found {len(deployments)} deployments to process")
+
+    statefulsets = list_filtered(
+        apps_v1.list_stateful_set_for_all_namespaces, apps_v1.list_namespaced_stateful_set,
+        protected_namespaces, allowed_namespaces=allowed_namespaces,
+    )
+    logger.info(f"Found {len(statefulsets)} statefulsets to process")
+
+    return [
+        (kind, r)
+        for kind, items in (("deploy", deployments), ("sts", statefulsets))
+        for r in items
+        if r.metadata.namespace not in protected_namespaces
+    ]
+
 @workload.get(
     "/manage-all/{mode}",
     response_model=BulkActionResponse,
     summary="Manage all deployments and statefulsets",
-    description="Scale up or down all deployments and statefulsets in the cluster"
+    description="Scale up or down all deployments and statefulsets in the cluster, as a background job "
+                "(progress at /jobs/{job_id}); wait=true blocks until every wave is done"
 )
-async def manage_all_deployments(mode: str) -> Dict[str, Any]:
+async def manage_all_deployments(mode: str, response: Response, wait: bool = False) -> Dict[str, Any]:
     """Gère tous les déploiements et statefulsets dans le cluster"""
     logger.info("Received request to manage all workloads.")
     logger.info(f"mode: {mode}")
+    if mode not in ("up", "down"):
+        return {"status": "error", "message": f"Unknown mode: {mode}"}
     try:
-        deployments = apps_v1.list_deployment_for_all_namespaces()
-        logger.info(f"Found {len(deployments.items)} deployments to process")
-
-        statefulsets = apps_v1.list_stateful_set_for_all_namespaces()
-        logger.info(f"Found {len(statefulsets.items)} statefulsets to process")
+        workloads = await asyncio.to_thread(list_all_workloads)
 
-        for deploy in deployments.items:
-            await process_deployment(deploy, mode)
-
-        for sts in statefulsets.items:
-            await process_statefulset(sts, mode)
-
-        return {
-            "message": f"Bulk action to {mode} all workloads initiated. Check logs for individual action results."
-        }
+        # Le scale-up attend chaque vague Ready : bien au-delà d'un timeout HTTP, d'où le job
+        job = submit_scale_job("manage-all", workloads, mode)
+        return await scale_job_response(job, response, wait, f"Bulk action to {mode} {len(workloads)} workloads")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error while scaling {mode} all workloads: {e}")
         return {
             "message": f"Error while scaling {mode} all workloads: {str(e)}"
         }
 
+def list_group_workloads(namespace: Optional[str] = None, label_selector: Optional[str] = None):
+    """
+    Résout un groupe (namespace et/ou sélecteur de labels) en liste de workloads.
+
+    Le filtrage est fait par l'apiserver : un seul appel par type de ressource.
+    """
+    kwargs = {"label_selector": label_selector} if label_selector else {}
+    if namespace:
+        deployments = iter_list(apps_v1.list_namespaced_deployment, namespace, **kwargs)
+        statefulsets = iter_list(apps_v1.list_namespaced_stateful_set, namespace, **kwargs)
+    else:
+        field_selector = build_namespace_field_selector(protected_namespaces)
+        deployments = iter_list(apps_v1.list_deployment_for_all_namespaces, field_selector=field_selector, **kwargs)
+        statefulsets = iter_list(apps_v1.list_stateful_set_for_all_namespaces, field_selector=field_selector, **kwargs)
+
+    return [
+        (kind, r)
+        for kind, items in (("deploy", deployments), ("sts", statefulsets))
+        for r in items
+        if r.metadata.namespace not in protected_namespaces
+    ]
+
+@workload.get(
+    "/manage-group/{action}",
+    response_model=BulkActionResponse,
+    summary="Manage a group of workloads",
+    description="Scale up or down every deployment and statefulset matching a namespace and/or label selector, "
+                "as a background job (progress at /jobs/{job_id}); wait=true blocks until every wave is done"
+)
+async def manage_group(action: str, response: Response, namespace: Optional[str] = None,
+                       label_selector: Optional[str] = None, wait: bool = False) -> Dict[str, Any]:
+    """Scale en une seule opération groupée tous les workloads d'un namespace ou d'un sélecteur"""
+    logger.info(f"Managing group namespace={namespace} label_selector={label_selector} with action {action}")
+
+    if action not in ("up", "down"):
+        return {"status": "error", "message": f"Unknown action: {action}"}
+    if not namespace and not label_selector:
+        return {"status": "error", "message": "A namespace or a label selector is required"}
+    if namespace in protected_namespaces:
+        return {"status": "error", "message": f"Namespace {namespace} is protected"}
+
+    try:
+        workloads = await asyncio.to_thread(list_group_workloads, namespace, label_selector)
+        # Un job par groupe : un nouvel appel (retry du moteur...) renvoie le job en cours,
+        # l'action inverse est refusée tant qu'il tourne
+        job = submit_scale_job(f"manage-group:{namespace or ''}:{label_selector or ''}", workloads, action)
+        return await scale_job_response(job, response, wait, f"Scaled {action} {len(workloads)} workloads")
+    except ApiException as e:
+        logger.error(f"Error while scaling {action} group: {e}")
+        return {"status": "error", "message": str(e)}
+
+async def run_scale_waves(workloads, mode, hpa_index=None, progress=None):
+    """
+    Scale un ensemble de workloads vague par vague.
+
+    Chaque vague est exécutée en parallèle. Au scale-up, la vague suivante
+    n'est lancée qu'une fois la précédente Ready (ou son délai dépassé) ; au
+    scale-down, les vagues sont parcourues dans l'ordre inverse sans attente.
+    progress (suivi d'un job) reçoit les vagues et celle en cours.
+    """
+    waves = build_scale_waves(workloads)
+    if mode == "down":
+        waves = list(reversed(waves))
+    if progress is not None:
+        progress.update(waves=describe_waves(waves), wave=0)
+
+    for index, wave in enumerate(waves):
+        logger.info(f"Scaling {mode} wave {index + 1}/{len(waves)} ({len(wave)} workloads)")
+        if progress is not None:
+            progress["wave"] = index + 1
+        await asyncio.gather(*(
+            process_deployment(resource, mode, disable_argocd=False, hpa_index=hpa_index)
+            if kind == "deploy"
+            else process_statefulset(resource, mode, disable_argocd=False, hpa_index=hpa_index)
+            for kind, resource in wave
+        ))
+        if mode == "up" and index < len(waves) - 1:
+            await wait_for_wave_ready(apps_v1, wave)
+    return waves
+
+async def scale_workloads_job(workloads, mode, progress):
+    """Corps d'un job de scaling groupé : auto-sync ArgoCD désactivé (scale-down), puis les vagues"""
+    progress.update(matched=len(workloads), argocd_applications={})
+    hpa_index = None
+    if mode == "down":
+        hpa_index = await asyncio.to_thread(list_hpa_index)
+        # Disable ArgoCD auto-sync once per distinct Application before any scale PATCH
+        from utils.argocd import disable_auto_sync_for_resources
+        progress["argocd_applications"] = await disable_auto_sync_for_resources([r for _, r in workloads])
+    await run_scale_waves(workloads, mode, hpa_index=hpa_index, progress=progress)
+
+def submit_scale_job(kind: str, workloads, mode: str, trigger: str = "api") -> Job:
+    """
+    Lance (ou renvoie, s'il tourne déjà) le job de scaling groupé kind.
+
+    kind désigne la cible, pas le sens : un scale-down demandé pendant un
+    scale-up de la même cible (ou l'inverse) est refusé en 409, sinon les
+    vagues restantes du premier job défont le second.
+    """
+    running = job_registry.running(kind)
+    if running is not None and running.progress.get("mode") != mode:
+        raise HTTPException(
+            status_code=409,
+            detail=f"A scale {running.progress.get('mode')} job is already running for {kind} (job {running.id})",
+        )
+    job = job_registry.submit(kind, partial(scale_workloads_job, workloads, mode), trigger=trigger)
+    job.progress.setdefault("mode", mode)
+    job.progress.setdefault("matched", len(workloads))
+    return job
+
+async def scale_job_response(job: Job, response: Response, wait: bool, message: str) -> Dict[str, Any]:
+    """
+    Réponse d'une action groupée lancée en job : 202 et job_id tout de suite, ou,
+    avec wait, le résultat une fois toutes les vagues terminées.
+    """
+    if not wait:
+        response.status_code = 202
+        return {"status": "accepted", "job_id": job.id, "matched": job.progress.get("matched"),
+                "message": f"{message} (progress at /jobs/{job.id})"}
+
+    await job_registry.wait(job)
+    if job.status == "error":
+        return {"status": "error", "job_id": job.id, "message": job.error}
+    return {
+        "status": "success",
+        "job_id": job.id,
+        "message": message,
+        "matched": job.progress.get("matched"),
+        "argocd_applications": job.progress.get("argocd_applications"),
+        "waves": job.progress.get("waves"),
+    }
+
+async def _disable_argocd_for(resource, kind):
+    """Désactive l'auto-sync des Applications ArgoCD gérant un workload avant un scale-down"""
+    from utils.argocd import disable_auto_sync_for_resources
+
+    report = await disable_auto_sync_for_resources([resource])
+    for argocd_apps in report.values():
+        logger.info(f"{kind} '{resource.metadata.name}' is managed by ArgoCD Application(s) {argocd_apps}")
+
+def list_hpa_index():
+    """Indexe tous les HPA du cluster en un seul appel pour les opérations groupées"""
+    if autoscaling_v2 is None:
+        return None
+    try:
+        return index_hpas(iter_list(autoscaling_v2.list_horizontal_pod_autoscaler_for_all_namespaces))
+    except ApiException as e:
+        logger.warning(f"Could not list HPAs, falling back to per-workload lookups: {e}")
+        return None
+
+async def _scale_object(resource_type, resource, action_nbr, disable_argocd=True, hpa_index=None):
+    """
+    Scale un workload (deploy ou sts) déjà récupéré, en un seul PATCH.
+
+    Args:
+        action_nbr: 0 pour arrêter (la capacité courante et les bornes du HPA
+            sont mémorisées en annotation), None pour restaurer la capacité
+            mémorisée, ou un nombre explicite de réplicas
+    """
+    kind = HPA_KINDS[resource_type]
+    with track_scale(resource_type, "down" if action_nbr == 0 else "up"):
+        if action_nbr == 0:
+            # Check if workload is managed by ArgoCD and disable auto-sync before scaling down
+            if disable_argocd and resource.metadata.labels:
+                await _disable_argocd_for(resource, kind)
+            hpa = await asyncio.to_thread(find_hpa, autoscaling_v2, resource_type, resource, hpa_index)
+            body = build_scale_down_patch(resource, hpa)
+        elif action_nbr is None:
+            body = build_scale_up_patch(resource)
+        else:
+            body = {"spec": {"replicas": action_nbr}}
+
+        patch = apps_v1.patch_namespaced_deployment if resource_type == "deploy" else apps_v1.patch_namespaced_stateful_set
+        await asyncio.to_thread(patch, name=resource.metadata.name, namespace=resource.metadata.namespace, body=body)
+
+    replicas = body["spec"]["replicas"]
+    logger.success(f"Scaled {kind.lower()} '{resource.metadata.name}' to {replicas} replicas")
+    return {
+        "status": "success",
+        "message": f"{kind.lower()} '{resource.metadata.name}' in namespace '{resource.metadata.namespace}' has been scaled to {replicas} replicas",
+    }
+
+async def scale_deployment_object(deploy, action_nbr=None, disable_argocd=True, hpa_index=None):
+    """Scale un déploiement déjà récupéré"""
+    return await _scale_object("deploy", deploy, action_nbr, disable_argocd, hpa_index)
+
+async def scale_statefulset_object(stateful_set, action_nbr=None, disable_argocd=True, hpa_index=None):
+    """Scale un statefulset déjà récupéré"""
+    return await _scale_object("sts", stateful_set, action_nbr, disable_argocd, hpa_index)
+
 async def scale_deployment(uid, action_nbr):
     """Scale un déploiement spécifique"""
-    c = apps_v1.list_deployment_for_all_namespaces()
-    for deploy in c.items:
-        if deploy.metadata.uid == uid:
-            # Check if deployment is managed by ArgoCD and disable auto-sync before scaling down
-            if action_nbr == 0 and deploy.metadata.labels:
-                from utils.argocd import (
-                    enable_auto_sync,
-                    find_argocd_application_for_resource,
-                )
-
-                labels_dict = deploy.metadata.labels if deploy.metadata.labels else {}
-                argocd_apps = find_argocd_application_for_resource(
-                    resource_name=deploy.metadata.name,
-                    resource_namespace=deploy.metadata.namespace,
-                    resource_labels=labels_dict
-                )
-
-                if argocd_apps:
-                    for argocd_app in argocd_apps:
-                        logger.info(f"Deployment '{deploy.metadata.name}' is managed by ArgoCD Application '{argocd_app}', disabling auto-sync before scaling down")
-                        try:
-                            enable_auto_sync(argocd_app)
-                        except Exception as e:
-                            logger.warning(f"Failed to disable ArgoCD auto-sync for '{argocd_app}': {e}. Continuing anyway...")
-
-            # ic(deploy.metadata.uid)
-            body = {"spec": {"replicas": action_nbr}}
-            apps_v1.patch_namespaced_deployment_scale(
-                name=deploy.metadata.name, namespace=deploy.metadata.namespace, body=body
-            )
-            logger.success(f"Scaled deployment to {action_nbr} replicas")
-            return {
-                "status": "success",
-                "message": f"deployment '{deploy.metadata.name}' in namespace '{deploy.metadata.namespace}' has been scaled accordingly",
-            }
+    deploy = find_by_uid(apps_v1.list_deployment_for_all_namespaces, uid)
+    if deploy:
+        return await scale_deployment_object(deploy, action_nbr)
     return None
 
 async def scale_statefulset(uid, action_nbr):
     """Scale un statefulset spécifique"""
-    c = apps_v1.list_stateful_set_for_all_namespaces()
-    for stateful_set in c.items:
-        if stateful_set.metadata.uid == uid:
-            # Check if statefulset is managed by ArgoCD and disable auto-sync before scaling down
-            if action_nbr == 0 and stateful_set.metadata.labels:
-                from utils.argocd import (
-                    enable_auto_sync,
-                    find_argocd_application_for_resource,
-                )
-
-                labels_dict = stateful_set.metadata.labels if stateful_set.metadata.labels else {}
-                argocd_apps = find_argocd_application_for_resource(
-                    resource_name=stateful_set.metadata.name,
-                    resource_namespace=stateful_set.metadata.namespace,
-                    resource_labels=labels_dict
-                )
-
-                if argocd_apps:
-                    for argocd_app in argocd_apps:
-                        logger.info(f"StatefulSet '{stateful_set.metadata.name}' is managed by ArgoCD Application '{argocd_app}', disabling auto-sync before scaling down")
-                        try:
-                            enable_auto_sync(argocd_app)
-                        except Exception as e:
-                            logger.warning(f"Failed to disable ArgoCD auto-sync for '{argocd_app}': {e}. Continuing anyway...")
-
-            # ic(stateful_set.metadata.uid)
-            body = {"spec": {"replicas": action_nbr}}
-            apps_v1.patch_namespaced_stateful_set_scale(
-                name=stateful_set.metadata.name, namespace=stateful_set.metadata.namespace, body=body
-            )
-            logger.success(f"Scaled statefulset to {action_nbr} replicas")
-            return {
-                "status": "success",
-                "message": f"statefulset '{stateful_set.metadata.name}' in namespace '{stateful_set.metadata.namespace}' has been scaled accordingly",
-            }
+    stateful_set = find_by_uid(apps_v1.list_stateful_set_for_all_namespaces, uid)
+    if stateful_set:
+        return await scale_statefulset_object(stateful_set, action_nbr)
     return None
 
 async def scale_daemonset(uid, action_nbr):
     """Scale un daemonset spécifique"""
-    c = apps_v1.list_daemon_set_for_all_namespaces()
-    for daemonset in c.items:
-        if daemonset.metadata.uid == uid:
-            # ic(daemonset.metadata.uid)
-            body = {"spec": {"replicas": action_nbr}}
+    daemonset = find_by_uid(apps_v1.list_daemon_set_for_all_namespaces, uid)
+    if daemonset:
+        body = {"spec": {"replicas": 1 if action_nbr is None else action_nbr}}
+        with track_scale("ds", "down" if action_nbr == 0 else "up"):
             apps_v1.patch_namespaced_daemon_set(
                 name=daemonset.metadata.name, namespace=daemonset.metadata.namespace, body=body
             )
-            logger.success(f"Scaled daemonset to {action_nbr} replicas")
-            return {
-                "status": "success",
-                "message": f"daemonset '{daemonset.metadata.name}' in namespace '{daemonset.metadata.namespace}' has been scaled accordingly",
-            }
+        logger.success(f"Scaled daemonset to {body['spec']['replicas']} replicas")
+        return {
+            "status": "success",
+            "message": f"daemonset '{daemonset.metadata.name}' in namespace '{daemonset.metadata.namespace}' has been scaled accordingly",
+        }
     return None
 
 @workload.get(
@@ -318,11 +504,11 @@ async def scale_daemonset(uid, action_nbr):
     description="Manage deployment, statefulset, or daemonset status"
 )
 async def manage_status(action: str, resource_type: str, uid: str) -> Dict[str, Any]:
-    """Scale up or shutdown the specified resource"""
+    """Scale up (to the capacity recorded at scale-down) or shutdown the specified resource"""
     logger.info(f"Managing resource {uid} of type {resource_type} with action {action}")
 
     try:
-        action_nbr = 1 if action == "up" else 0
+        action_nbr = None if action == "up" else 0
         result = None
         
         if resource_type == "deploy":
@@ -344,40 +530,62 @@ async def manage_status(action: str, resource_type: str, uid: str) -> Dict[str,
         return {"status": "error", "message": str(e)}
 
 @workload.get(
-    "/delete-rs",
-    response_model=ReplicaSetResponse,
-    summary="Delete ReplicaSets with zero replicas",
-    description="Deletes all ReplicaSets with desired replicas set to 0"
+    "/status/{resource_type}/{uid}",
+    response_model=WorkloadReadinessResponse,
+    summary="Readiness of a specific resource",
+    description="Return desired and ready replicas of a deployment or statefulset"
 )
-def delete_rs_zero():
-    """Deletes all ReplicaSets with desired replicas set to 0."""
+async def get_workload_status(resource_type: str, uid: str) -> Dict[str, Any]:
+    """Indique si tous les réplicas d'un workload sont Ready"""
     try:
-        namespaces = core_v1.list_namespace()
-        deleted_replicasets = []
-
-        for ns in namespaces.items:
-            if ns.metadata.name not in protected_namespaces:
-                replicasets = apps_v1.list_namespaced_replica_set(ns.metadata.name)
-                for rs in replicasets.items:
-                    if rs.spec.replicas == 0:
-                        apps_v1.delete_namespaced_replica_set(
-                            name=rs.metadata.name, namespace=rs.metadata.namespace
-                        )
-                        deleted_replicasets.append(
-                            {
-                                "name": rs.metadata.name,
-                                "namespace": rs.metadata.namespace,
-                            }
-                        )
-
-        logger.info(
-            f"Deleted {len(deleted_replicasets)} ReplicaSets with 0 desired replicas"
-        )
-        return {"status": "success", "deleted_replicasets": len(deleted_replicasets)}
+        if resource_type == "deploy":
+            resource = find_by_uid(apps_v1.list_deployment_for_all_namespaces, uid)
+        elif resource_type == "sts":
+            resource = find_by_uid(apps_v1.list_stateful_set_for_all_namespaces, uid)
+        else:
+            return {"status": "error", "message": f"Unknown resource type: {resource_type}"}
+
+        if resource:
+            return {"status": "success", **workload_readiness(resource)}
+
+        return {"status": "error", "message": f"Resource with UID {uid} not found"}
     except ApiException as e:
-        logger.error(f"Error deleting ReplicaSets: {str(e)}")
+        logger.error(e)
         return {"status": "error", "message": str(e)}
 
+def start_delete_rs_job(limit: Optional[int] = None, trigger: str = "api") -> Job:
+    """Lance (ou renvoie, s'il tourne déjà) le job de suppression des ReplicaSets à zéro réplica"""
+    return job_registry.submit("delete-rs", lambda progress: delete_zero_replicasets(
+        apps_v1, protected_namespaces, allowed_namespaces, limit=limit,
+        concurrency=replicaset_delete_concurrency, qps=replicaset_delete_qps, progress=progress,
+    ), trigger=trigger)
+
+@workload.get(
+    "/delete-rs",
+    response_model=ReplicaSetResponse,
+    summary="Delete ReplicaSets with zero replicas",
+    description="Starts a background job deleting all ReplicaSets with desired replicas set to 0 "
+                "(progress at /jobs/{job_id}); wait=true blocks until it is done"
+)
+async def delete_rs_zero(response: Response, wait: bool = False, limit: Optional[int] = Query(None, ge=1)):
+    """Deletes all ReplicaSets with desired replicas set to 0, as a background job."""
+    job = start_delete_rs_job(limit)
+    if not wait:
+        response.status_code = 202
+        return {"status": "accepted", "job_id": job.id, "message": f"Progress at /jobs/{job.id}"}
+
+    await job_registry.wait(job)
+    if job.status == "error":
+        return {"status": "error", "job_id": job.id, "message": job.error}
+    return {"status": "success", "job_id": job.id, "deleted_replicasets": job.progress["deleted"]}
+
+async def replicaset_gc_loop(interval: float, batch: int):
+    """Ramasse-miettes périodique : une passe bornée à batch suppressions toutes les interval secondes"""
+    logger.info(f"ReplicaSet garbage collector every {interval:.0f}s, at most {batch} deletions per pass")
+    while True:
+        await asyncio.sleep(interval)
+        await job_registry.wait(start_delete_rs_job(limit=batch, trigger="gc"))
+
 @health_route.get(
     "/live",
     response_model=WorkloadResponse,
@@ -388,6 +596,18 @@ def live():
     """Simple liveness check"""
     return {"status": "success", "message": "Application is live"}
 
+@health_route.get(
+    "/ready",
+    summary="Application readiness check",
+    description="Ready once the background startup tasks (Kubernetes clients, workload UIDs...) have completed"
+)
+def ready(response: Response):
+    """Readiness : 503 tant que les tâches de démarrage requises ne sont pas terminées"""
+    is_ready = startup_tasks.ready()
+    if not is_ready:
+        response.status_code = 503
+    return {"status": "success" if is_ready else "starting", "tasks": startup_tasks.status()}
+
 async def check_database() -> Dict[str, Any]:
     """Vérifie l'état de la base de données"""
     db_result: Dict[str, Any] = {"status": "success"}
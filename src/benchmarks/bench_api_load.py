@@ -0,0 +1,293 @@
+"""
+Test de charge de l'API : tableau de bord et CRUD des programmations.
+
+Des utilisateurs virtuels concurrents enchaînent un mélange pondéré de
+requêtes (GET /, /schedules, /schedule/{uid}, POST /schedule,
+PUT /schedules/{id}, /manage/...), éventuellement accompagnés de réplicas du
+moteur de scheduling qui interrogent /schedules à intervalle fixe. Le rapport
+donne, par endpoint, le débit, le taux d'erreur et les latences p50/p95/p99 ;
+il peut être écrit en JSON (--output) pour comparer deux exécutions.
+
+Par défaut l'application de main.py est appelée en mémoire (httpx
+ASGITransport), contre le faux apiserver (benchmarks/fake_kube.py) et une base
+SQLite temporaire (--database-url pour une autre base). --url cible à la place
+une instance déjà lancée.
+
+Usage (depuis src/):
+    python -m benchmarks.bench_api_load --users 20 --duration 30 --pods 2000 --output load.json
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from contextlib import ExitStack
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+# Les clients Kubernetes sont ceux du faux apiserver
+os.environ.setdefault("TESTING", "1")
+
+import httpx  # noqa: E402
+from loguru import logger  # noqa: E402
+
+from benchmarks.fake_kube import FakeApiServer, Faults  # noqa: E402
+from benchmarks.synthetic_cluster import ClusterSpec  # noqa: E402
+from core.dbManager import DatabaseManager, percentile  # noqa: E402
+from utils.fastjson import dumps  # noqa: E402
+from utils.metrics import instrument_kube_client  # noqa: E402
+
+# Poids par défaut : surtout des lectures, comme l'interface et le moteur
+DEFAULT_MIX = {"index": 5, "schedules": 30, "schedule": 25, "create": 10, "update": 20, "manage": 10}
+CRONS = ["0 8 * * 1-5", "0 19 * * 1-5", "30 7 * * *", "0 20 * * *", "*/30 * * * *", "0 */2 * * *"]
+
+
+class LoadState:
+    """Données partagées par les utilisateurs virtuels (workloads et programmations connus)."""
+
+    def __init__(self, workloads: List[tuple], schedules: List[dict], seed: int):
+        self.workloads = workloads
+        self.schedules = schedules
+        self.rng = random.Random(seed)
+        self.created = 0
+
+
+def _schedule_body(state: LoadState, uid: str, name: str) -> dict:
+    return {
+        "name": name,
+        "uid": uid,
+        "active": False,
+        "cron_start": state.rng.choice(CRONS),
+        "cron_stop": state.rng.choice(CRONS),
+    }
+
+
+def _request(kind: str, state: LoadState):
+    """(endpoint, méthode, chemin, corps JSON) de la prochaine requête d'un type donné."""
+    rng = state.rng
+    if kind == "index":
+        return "GET /", "GET", "/", None
+    if kind == "schedules":
+        return "GET /schedules", "GET", "/schedules", None
+    if kind == "schedule":
+        return "GET /schedule/{uid}", "GET", f"/schedule/{rng.choice(state.schedules)['uid']}", None
+    if kind == "create":
+        state.created += 1
+        body = _schedule_body(state, f"load-{state.created}-{rng.getrandbits(32):08x}", f"load-{state.created}")
+        return "POST /schedule", "POST", "/schedule", body
+    if kind == "update":
+        schedule = rng.choice(state.schedules)
+        body = {**schedule, **_schedule_body(state, schedule["uid"], schedule["name"])}
+        return "PUT /schedules/{id}", "PUT", f"/schedules/{schedule['id']}", body
+    kind_, uid = rng.choice(state.workloads)
+    return "GET /manage/{action}/{type}/{uid}", "GET", f"/manage/{rng.choice(['down', 'up'])}/{kind_}/{uid}", None
+
+
+class Recorder:
+    """Latences (secondes) et erreurs par endpoint."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def add(self, endpoint: str, elapsed: float, ok: bool):
+        self.latencies.setdefault(endpoint, []).append(elapsed)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def report(self, wall: float) -> Dict[str, dict]:
+        rows = {}
+        every = [value for values in self.latencies.values() for value in values]
+        for endpoint, values in sorted(self.latencies.items()) + [("total", every)]:
+            errors = sum(self.errors.values()) if endpoint == "total" else self.errors.get(endpoint, 0)
+            rows[endpoint] = {
+                "count": len(values),
+                "errors": errors,
+                "rps": len(values) / wall if wall else 0.0,
+                **{f"p{pct}_ms": (percentile(values, pct) or 0.0) * 1000 for pct in (50, 95, 99)},
+                "max_ms": max(values, default=0.0) * 1000,
+            }
+        return rows
+
+
+async def _call(client: httpx.AsyncClient, recorder: Recorder, endpoint: str, method: str, path: str, body):
+    start = time.perf_counter()
+    try:
+        response = await client.request(
+            method, path, content=dumps(body) if body is not None else None,
+            headers={"Content-Type": "application/json"} if body is not None else None,
+        )
+        ok = response.status_code < 400
+    except httpx.HTTPError:
+        ok = False
+    recorder.add(endpoint, time.perf_counter() - start, ok)
+
+
+async def _user(client, recorder, state, mix: Dict[str, int], deadline: float, think: float):
+    kinds, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        await _call(client, recorder, *_request(state.rng.choices(kinds, weights)[0], state))
+        if think:
+            await asyncio.sleep(think)
+
+
+async def _scheduler_replica(client, recorder, deadline: float, interval: float):
+    """Un réplica du moteur : GET /schedules à chaque tick."""
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await _call(client, recorder, "GET /schedules (scheduler)", "GET", "/schedules", None)
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - started)))
+
+
+async def _prepare(client: httpx.AsyncClient, schedules: int, seed: int) -> LoadState:
+    """Découvre les workloads via /inventory et crée les programmations initiales."""
+    inventory = (await client.get("/inventory")).json()
+    workloads = [("deploy", record["uid"]) for record in inventory["deploy"]] + \
+                [("sts", record["uid"]) for record in inventory["sts"]]
+    if not workloads:
+        raise RuntimeError("No workloads found in /inventory")
+    state = LoadState(workloads, [], seed)
+    existing = {s["uid"] for s in (await client.get("/schedules")).json()}
+    for _, uid in workloads[:schedules]:
+        if uid not in existing:
+            response = await client.post("/schedule", json=_schedule_body(state, uid, f"seed-{uid[-6:]}"))
+            response.raise_for_status()
+    state.schedules = [s for s in (await client.get("/schedules")).json() if s.get("id") is not None]
+    if not state.schedules:
+        raise RuntimeError("No schedules available")
+    return state
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    users: int = 10,
+    duration: float = 10.0,
+    mix: Optional[Dict[str, int]] = None,
+    schedules: int = 100,
+    scheduler_replicas: int = 0,
+    scheduler_interval: float = 1.0,
+    think: float = 0.0,
+    seed: int = 0,
+) -> Dict[str, dict]:
+    """
+    Lance la charge sur l'application derrière client et renvoie le rapport par endpoint.
+
+    Args:
+        users: Utilisateurs virtuels concurrents (chacun enchaîne ses requêtes)
+        duration: Durée de la charge (secondes)
+        mix: Poids par type de requête (voir DEFAULT_MIX)
+        schedules: Programmations créées avant la charge
+        scheduler_replicas: Réplicas du moteur interrogeant /schedules
+        scheduler_interval: Intervalle entre deux ticks d'un réplica (secondes)
+        think: Pause d'un utilisateur entre deux requêtes (secondes)
+    """
+    state = await _prepare(client, schedules, seed)
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(_user(client, recorder, state, mix or DEFAULT_MIX, deadline, think) for _ in range(users)),
+        *(_scheduler_replica(client, recorder, deadline, scheduler_interval) for _ in range(scheduler_replicas)),
+    )
+    return recorder.report(time.perf_counter() - start)
+
+
+def in_memory_app(stack: ExitStack, server: FakeApiServer, database_url: str):
+    """
+    Application de main.py branchée sur le faux apiserver et la base donnée.
+
+    Returns:
+        (app, db) : l'application ASGI et son DatabaseManager
+    """
+    import main
+    from api import scheduler as scheduler_api
+    from api import workload as workload_api
+
+    apps_v1 = instrument_kube_client(server.apps_v1())
+    core_v1 = instrument_kube_client(server.core_v1())
+    autoscaling_v2 = instrument_kube_client(server.autoscaling_v2())
+    db = DatabaseManager(database_url)
+    for module, name, value in (
+        (main, "apps_v1", apps_v1), (main, "core_v1", core_v1), (main, "db", db),
+        (workload_api, "apps_v1", apps_v1), (workload_api, "core_v1", core_v1),
+        (workload_api, "autoscaling_v2", autoscaling_v2), (scheduler_api, "db_manager", db),
+    ):
+        stack.enter_context(patch.object(module, name, value))
+    return main.app, db
+
+
+def format_report(rows: Dict[str, dict]) -> str:
+    lines = [f"{'endpoint':<38} {'count':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)"]
+    for endpoint, row in rows.items():
+        lines.append(
+            f"{endpoint:<38} {row['count']:>7} {row['errors']:>5} {row['rps']:>8.1f} {row['p50_ms']:>8.1f} "
+            f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for term in value.split(","):
+        kind, _, weight = term.partition("=")
+        if kind.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown request type {kind!r} (expected {', '.join(DEFAULT_MIX)})")
+        mix[kind.strip()] = int(weight)
+    return mix
+
+
+async def _main(args) -> Dict[str, dict]:
+    options = dict(users=args.users, duration=args.duration, mix=args.mix, schedules=args.schedules,
+                   scheduler_replicas=args.scheduler_replicas, scheduler_interval=args.scheduler_interval,
+                   think=args.think, seed=args.seed)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+            return await run_load(client, **options)
+
+    faults = Faults(latency=args.latency, jitter=args.latency / 2)
+    with tempfile.TemporaryDirectory() as tmp, ExitStack() as stack:
+        server = stack.enter_context(
+            FakeApiServer.from_spec(ClusterSpec(pods=args.pods, namespaces=args.namespaces), faults=faults)
+        )
+        app, db = in_memory_app(stack, server, args.database_url or f"sqlite+aiosqlite:///{tmp}/schedule.db")
+        await db.create_table()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=60) as client:
+            rows = await run_load(client, **options)
+        print(f"fake apiserver calls: {sum(server.requests.values())}")
+        await db.engine.dispose()
+        return rows
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=20.0, help="durée de la charge (s)")
+    parser.add_argument("--mix", type=_parse_mix, default=DEFAULT_MIX,
+                        help="poids par type, ex. schedules=50,update=20,index=1")
+    parser.add_argument("--schedules", type=int, default=100, help="programmations créées avant la charge")
+    parser.add_argument("--scheduler-replicas", type=int, default=1)
+    parser.add_argument("--scheduler-interval", type=float, default=1.0, help="tick d'un réplica du moteur (s)")
+    parser.add_argument("--think", type=float, default=0.0, help="pause entre deux requêtes d'un utilisateur (s)")
+    parser.add_argument("--pods", type=int, default=1000, help="taille du cluster synthétique")
+    parser.add_argument("--namespaces", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.005, help="latence du faux apiserver (s)")
+    parser.add_argument("--database-url", help="base SQLAlchemy async (défaut : SQLite temporaire)")
+    parser.add_argument("--url", help="cible une instance lancée au lieu de l'application en mémoire")
+    parser.add_argument("--output", help="écrit le rapport JSON (configuration et résultats)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logger.remove()
+
+    rows = asyncio.run(_main(args))
+    print(format_report(rows))
+    if args.output:
+        config = {key: value for key, value in vars(args).items() if key != "output"}
+        with open(args.output, "wb") as f:
+            f.write(dumps({"config": config, "results": rows}))
+        print(f"report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main_cli()
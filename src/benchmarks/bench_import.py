@@ -0,0 +1,101 @@
+"""
+Benchmark du temps d'import des points d'entrée (API et moteur de scheduling).
+
+Chaque mesure importe le module dans un interpréteur neuf, hors mode test et
+sans configuration Kubernetes joignable : l'import ne doit faire aucune I/O
+(kubeconfig, apiserver, ArgoCD, Unleash), seulement charger le code. Le
+rapport donne la médiane, les modules les plus coûteux (-X importtime) et
+vérifie que la configuration Kubernetes n'a pas été chargée.
+
+Usage (depuis src/):
+    python -m benchmarks.bench_import --runs 5 --budget 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+__import__({module!r})
+elapsed = time.perf_counter() - start
+helpers = sys.modules.get("utils.helpers")
+print(json.dumps({{"seconds": elapsed, "kube_config_loaded": getattr(helpers, "_kube_config_loaded", False)}}))
+"""
+
+
+def _import_env() -> Dict[str, str]:
+    """Environnement de production minimal : ni mode test, ni cluster, ni intégrations."""
+    env = {k: v for k, v in os.environ.items()
+           if k not in ("TESTING", "KUBERNETES_SERVICE_HOST", "ARGOCD_API_URL", "UNLEASH_API_URL")}
+    env.update(KUBE_ENV="production", KUBECONFIG=os.devnull, OTEL_EXPORTER_OTLP_ENDPOINT="")
+    return env
+
+
+def measure_import(module: str, runs: int = 3, importtime: bool = False) -> Dict:
+    """Importe module dans runs interpréteurs neufs ; échoue si l'import lève."""
+    seconds: List[float] = []
+    loaded = False
+    stderr = ""
+    for _ in range(runs):
+        command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", PROBE.format(module=module)]
+        result = subprocess.run(command, cwd=SRC_DIR, env=_import_env(), capture_output=True, text=True, timeout=120)
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+        probe = json.loads(result.stdout.strip().splitlines()[-1])
+        seconds.append(probe["seconds"])
+        loaded = loaded or probe["kube_config_loaded"]
+        stderr = result.stderr
+    return {"module": module, "median": statistics.median(seconds), "max": max(seconds),
+            "kube_config_loaded": loaded, "importtime": stderr if importtime else ""}
+
+
+def top_imports(importtime: str, module: str, limit: int = 10) -> List[tuple]:
+    """
+    Imports directs de module les plus coûteux (cumulé, µs), d'après une
+    sortie -X importtime (les enfants sont listés avant leur parent).
+    """
+    children: List[tuple] = []
+    for line in importtime.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            children.append((name.strip(), int(cumulative)))
+        elif depth == 0:
+            if name.strip() == module:
+                return sorted(children, key=lambda row: row[1], reverse=True)[:limit]
+            children = []
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", default="main,scheduler_engine", help="Modules to import (comma-separated)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Most expensive direct imports to show")
+    parser.add_argument("--budget", type=float, default=None, help="Fail if a median import exceeds this (seconds)")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules.split(","):
+        result = measure_import(module, runs=args.runs)
+        profile = measure_import(module, runs=1, importtime=True)
+        print(f"{module}: median {result['median'] * 1000:.0f} ms, max {result['max'] * 1000:.0f} ms, "
+              f"kube config loaded at import: {result['kube_config_loaded']}")
+        for name, cumulative in top_imports(profile["importtime"], module, args.top):
+            print(f"    {cumulative / 1000:>8.1f} ms  {name}")
+        if result["kube_config_loaded"] or (args.budget is not None and result["median"] > args.budget):
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark des builders d'inventaire sur des clusters synthétiques.
+
+Pour chaque taille de cluster, mesure le temps (wall et CPU) et le pic mémoire
+de list_all_deployments, list_all_sts, list_all_daemonsets et du rendu de la
+page / complète, en mode modèles du client et en mode LEAN_LISTING.
+
+Usage (depuis src/):
+    python -m benchmarks.bench_inventory --pods 1000 10000 50000
+"""
+import argparse
+import os
+import time
+import tracemalloc
+from unittest.mock import patch
+
+# Les clients Kubernetes sont remplacés par le cluster synthétique
+os.environ.setdefault("TESTING", "1")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from loguru import logger  # noqa: E402
+
+import main  # noqa: E402
+from benchmarks.synthetic_cluster import ClusterSpec, FakeCluster  # noqa: E402
+from core import kub_list  # noqa: E402
+from core.kub_list import list_all_daemonsets, list_all_deployments, list_all_sts  # noqa: E402
+
+PROTECTED_NAMESPACES = ["kube-system"]
+PROTECTED_LABELS = {"workload-scheduler/protected": "true"}
+
+
+def measure(fn) -> dict:
+    """Mesure le temps sans tracemalloc (qui ralentit l'allocation), puis le pic mémoire dans un second passage."""
+    cpu, wall = time.process_time(), time.perf_counter()
+    fn()
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"cpu_s": cpu, "wall_s": wall, "peak_mib": peak / 2**20}
+
+
+def builders(cluster: FakeCluster, lean: bool) -> dict:
+    """Cas mesurés : chaque builder, puis la page / (les trois listes et le template)."""
+    args = (cluster.apps_v1, cluster.core_v1, PROTECTED_NAMESPACES, PROTECTED_LABELS)
+    client = TestClient(main.app)
+
+    def render_index():
+        with patch.object(main, "apps_v1", cluster.apps_v1), patch.object(main, "core_v1", cluster.core_v1), \
+                patch.object(kub_list, "lean_listing", lean):
+            response = client.get("/")
+        assert response.status_code == 200, response.text[:200]
+        return response
+
+    return {
+        "list_all_deployments": lambda: list_all_deployments(*args, lean=lean),
+        "list_all_sts": lambda: list_all_sts(*args, lean=lean),
+        "list_all_daemonsets": lambda: list_all_daemonsets(*args, lean=lean),
+        "GET /": render_index,
+    }
+
+
+def run(pods: int, namespaces: int, modes: list) -> list:
+    cluster = FakeCluster(ClusterSpec(pods=pods, namespaces=namespaces))
+    print(f"\n{pods} pods: {cluster.summary()}")
+    rows = []
+    for mode in modes:
+        for name, fn in builders(cluster, lean=mode == "lean").items():
+            stats = measure(fn)
+            rows.append({"pods": pods, "mode": mode, "case": name, **stats})
+            print(
+                f"  {mode:>5} {name:<22} wall {stats['wall_s']:7.2f}s  cpu {stats['cpu_s']:7.2f}s  "
+                f"peak {stats['peak_mib']:8.1f} MiB"
+            )
+    return rows
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pods", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--namespaces", type=int, default=20)
+    parser.add_argument("--mode", choices=["model", "lean", "both"], default="both")
+    args = parser.parse_args()
+    logger.remove()
+
+    modes = ["model", "lean"] if args.mode == "both" else [args.mode]
+    for pods in args.pods:
+        run(pods, args.namespaces, modes)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,127 @@
+"""
+Benchmark de sérialisation JSON : backend orjson vs bibliothèque standard.
+
+Couvre GET /schedules (réponse FastAPI complète), la sérialisation d'un
+inventaire complet (GET /inventory) et le sink de logs JSON.
+
+Usage (depuis src/):
+    python -m benchmarks.bench_json --schedules 500 --pods 10000
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, patch
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from loguru import logger
+
+from api.scheduler import scheduler
+from benchmarks.bench_listing import make_pod
+from core.inventory import WorkloadRecord, dumps_records
+from core.kub_list import get_raw_pod_details
+from core.models import WorkloadSchedule
+from utils import fastjson
+from utils.logging_config import configure_logger, get_writer
+
+
+@contextlib.contextmanager
+def stdlib_backend():
+    """Force le fallback stdlib du backend JSON."""
+    saved = fastjson.orjson
+    fastjson.orjson = None
+    try:
+        yield
+    finally:
+        fastjson.orjson = saved
+
+
+def timed(fn, repeat: int) -> float:
+    """Durée moyenne (ms) d'un appel."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def bench_schedules(count: int, repeat: int):
+    schedules = [
+        WorkloadSchedule(id=i, name=f"workload-{i}", uid=f"uid-{i}", cron_start="0 7 * * 1-5", cron_stop="0 20 * * 1-5")
+        for i in range(count)
+    ]
+    results = {}
+    for name, response_class in (("stdlib", JSONResponse), ("fastjson", fastjson.FastJSONResponse)):
+        app = FastAPI(default_response_class=response_class)
+        app.include_router(scheduler)
+        client = TestClient(app)
+        with patch("api.scheduler.db_manager.get_all_schedules", AsyncMock(return_value=schedules)):
+            client.get("/schedules")
+            results[name] = timed(lambda: client.get("/schedules"), repeat)
+    return results
+
+
+def make_inventory(pods: int):
+    """Inventaire synthétique : un Deployment pour 10 pods."""
+    deployments = []
+    for start in range(0, pods, 10):
+        pod_records = [get_raw_pod_details(make_pod(i), "ReplicaSet") for i in range(start, min(start + 10, pods))]
+        deployments.append(WorkloadRecord(
+            namespace=f"ns-{start % 50}", name=f"app-{start // 10}", uid=f"uid-{start}",
+            replicas=len(pod_records), available_replicas=len(pod_records), ready_replicas=len(pod_records),
+            labels={"app": f"app-{start // 10}", "team": "platform"}, pods=pod_records,
+        ))
+    return {"deploy": deployments, "sts": [], "ds": []}
+
+
+def bench_inventory(pods: int, repeat: int):
+    inventory = make_inventory(pods)
+    results = {}
+    with stdlib_backend():
+        results["stdlib"] = timed(lambda: dumps_records(inventory), repeat)
+    results["fastjson"] = timed(lambda: dumps_records(inventory), repeat)
+    return results
+
+
+def bench_log_sink(lines: int):
+    results = {}
+    # Même call site à chaque ligne : la limite par call site est désactivée, et
+    # l'écriture du writer est attendue pour mesurer la sérialisation, pas la mise en file
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull), \
+            patch.dict(os.environ, {"LOG_RATE_LIMIT": "0"}):
+        configure_logger(component="bench")
+        writer = get_writer()
+
+        def log_and_write():
+            logger.bind(namespace="shop").info("Processing Deployment api in namespace shop")
+            writer.flush()
+
+        for name, context in (("stdlib", stdlib_backend()), ("fastjson", contextlib.nullcontext())):
+            with context:
+                results[name] = timed(log_and_write, lines) * 1000  # µs par ligne
+    logger.remove()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--schedules", type=int, default=500)
+    parser.add_argument("--pods", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--log-lines", type=int, default=20000)
+    args = parser.parse_args()
+    logger.remove()
+
+    print(f"orjson: {'installed' if fastjson.orjson else 'not installed (fallback only)'}")
+    for label, unit, results in (
+        (f"GET /schedules ({args.schedules} schedules)", "ms", bench_schedules(args.schedules, args.repeat)),
+        (f"inventory JSON ({args.pods} pods)", "ms", bench_inventory(args.pods, args.repeat)),
+        ("log sink line", "µs", bench_log_sink(args.log_lines)),
+    ):
+        print(f"{label}: " + "  ".join(f"{name} {value:.2f}{unit}" for name, value in results.items()), file=sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
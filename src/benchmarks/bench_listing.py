@@ -0,0 +1,132 @@
+"""
+Benchmark du listing de l'inventaire : modèles OpenAPI du client vs JSON brut (LEAN_LISTING).
+
+Génère une liste de pods synthétique réaliste (env, volumes, probes, managedFields),
+puis mesure pour chaque mode le temps CPU, le pic mémoire (tracemalloc) et la
+mémoire retenue par l'index construit.
+
+Usage (depuis src/):
+    python -m benchmarks.bench_listing --pods 10000 --page-size 500
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from kubernetes.client import ApiClient
+
+from core.kub_list import index_pods_by_owner, index_raw_pods_by_owner
+
+
+def make_pod(index: int, namespaces: int = 50) -> dict:
+    """Crée un pod JSON proche de ce que renvoie l'apiserver."""
+    namespace = f"ns-{index % namespaces}"
+    rs_name = f"app-{index // 10}-7d9f8c6b5"
+    return {
+        "metadata": {
+            "name": f"{rs_name}-{index:05d}",
+            "namespace": namespace,
+            "uid": f"00000000-0000-0000-0000-{index:012d}",
+            "labels": {"app": f"app-{index // 10}", "pod-template-hash": "7d9f8c6b5", "team": "platform"},
+            "annotations": {"kubectl.kubernetes.io/restartedAt": "2025-01-01T00:00:00Z"},
+            "creationTimestamp": "2025-01-01T00:00:00Z",
+            "ownerReferences": [{
+                "apiVersion": "apps/v1", "kind": "ReplicaSet", "name": rs_name,
+                "uid": f"rs-{index // 10}", "controller": True, "blockOwnerDeletion": True,
+            }],
+            "managedFields": [{
+                "manager": "kube-controller-manager", "operation": "Update", "apiVersion": "v1",
+                "time": "2025-01-01T00:00:00Z", "fieldsType": "FieldsV1",
+                "fieldsV1": {"f:metadata": {"f:labels": {f"f:label-{i}": {} for i in range(10)}}},
+            }],
+        },
+        "spec": {
+            "nodeName": f"node-{index % 30}",
+            "serviceAccountName": "default",
+            "volumes": [
+                {"name": f"config-{v}", "configMap": {"name": f"config-{v}", "defaultMode": 420}}
+                for v in range(4)
+            ] + [{"name": "data", "persistentVolumeClaim": {"claimName": f"data-{index}"}}],
+            "containers": [
+                {
+                    "name": f"container-{c}",
+                    "image": "registry.example.com/app:1.2.3",
+                    "env": [{"name": f"ENV_{e}", "value": f"value-{e}"} for e in range(20)],
+                    "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+                    "resources": {"requests": {"cpu": "100m", "memory": "128Mi"}, "limits": {"memory": "256Mi"}},
+                    "readinessProbe": {"httpGet": {"path": "/ready", "port": 8080}, "periodSeconds": 10},
+                    "volumeMounts": [{"name": f"config-{v}", "mountPath": f"/etc/config-{v}"} for v in range(4)],
+                }
+                for c in range(2)
+            ],
+        },
+        "status": {
+            "phase": "Running",
+            "podIP": "10.0.0.1",
+            "startTime": "2025-01-01T00:00:00Z",
+            "conditions": [{"type": t, "status": "True"} for t in ("Initialized", "Ready", "ContainersReady", "PodScheduled")],
+        },
+    }
+
+
+def make_pages(pods: int, page_size: int) -> list:
+    """Sérialise des pages de PodList comme les corps de réponse de l'apiserver (limit/continue)."""
+    return [
+        json.dumps({
+            "kind": "PodList", "apiVersion": "v1", "metadata": {},
+            "items": [make_pod(i) for i in range(start, min(start + page_size, pods))],
+        }).encode()
+        for start in range(0, pods, page_size)
+    ]
+
+
+def model_listing(pages: list):
+    """Chemin par défaut : désérialisation en V1PodList (ce que fait le client) puis indexation."""
+    api_client = ApiClient()
+    items = (
+        pod
+        for body in pages
+        for pod in api_client._ApiClient__deserialize(json.loads(body), "V1PodList").items
+    )
+    return index_pods_by_owner(items, "ReplicaSet")
+
+
+def lean_listing(pages: list):
+    """Chemin LEAN_LISTING : JSON brut réduit aux champs utiles."""
+    items = (pod for body in pages for pod in json.loads(body)["items"])
+    return index_raw_pods_by_owner(items, "ReplicaSet")
+
+
+def measure(fn, pages: list) -> dict:
+    """Mesure le temps sans tracemalloc (qui ralentit l'allocation), puis la mémoire dans un second passage."""
+    cpu, wall = time.process_time(), time.perf_counter()
+    fn(pages)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+
+    tracemalloc.start()
+    result = fn(pages)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"cpu_s": cpu, "wall_s": wall, "peak_mib": peak / 2**20, "retained_mib": retained / 2**20}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pods", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=500)
+    args = parser.parse_args()
+
+    pages = make_pages(args.pods, args.page_size)
+    size = sum(len(body) for body in pages)
+    print(f"{args.pods} pods in {len(pages)} pages, {size / 2**20:.1f} MiB of JSON")
+    for name, fn in (("model", model_listing), ("lean", lean_listing)):
+        stats = measure(fn, pages)
+        print(
+            f"{name:>6}: cpu {stats['cpu_s']:.2f}s  wall {stats['wall_s']:.2f}s  "
+            f"peak {stats['peak_mib']:.1f} MiB  retained {stats['retained_mib']:.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,640 @@
+"""
+Faux apiserver Kubernetes en mémoire, avec injection de latence et d'erreurs.
+
+Sert en HTTP (dans un thread) les endpoints utilisés par core/kub_list.py,
+api/workload.py et core/waves.py : listes paginées avec sélecteurs, watch,
+lecture, PATCH (merge patch et JSON patch), sous-ressources status et scale,
+et suppression. Les vrais clients du SDK s'y connectent : sérialisation,
+ApiException (429, 500...), jetons continue et instrumentation sont ceux de
+la production, contrairement aux MagicMock des tests.
+
+Le scale d'un Deployment ou d'un StatefulSet crée ou supprime ses pods et met
+à jour son status (readyReplicas après ready_delay) ; chaque modification
+produit un événement de watch avec un resourceVersion croissant.
+
+Usage (depuis src/), pour lancer l'API contre le faux apiserver :
+    python -m benchmarks.fake_kube --pods 10000 --latency 0.02 --throttle-rate 0.05 \\
+        --kubeconfig /tmp/fake-kubeconfig
+    KUBE_ENV=development KUBECONFIG=/tmp/fake-kubeconfig uvicorn main:app
+"""
+import argparse
+import copy
+import itertools
+import random
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from kubernetes import client
+
+from benchmarks.synthetic_cluster import ClusterSpec, _matches, _pod, _uid, make_cluster
+from utils.fastjson import dumps, loads
+
+# Ressources servies et leur kind
+KINDS = {
+    "pods": "Pod",
+    "nodes": "Node",
+    "namespaces": "Namespace",
+    "deployments": "Deployment",
+    "replicasets": "ReplicaSet",
+    "statefulsets": "StatefulSet",
+    "daemonsets": "DaemonSet",
+    "horizontalpodautoscalers": "HorizontalPodAutoscaler",
+}
+REASONS = {
+    404: "NotFound", 409: "Conflict", 410: "Expired", 422: "Invalid",
+    429: "TooManyRequests", 500: "InternalError", 503: "ServiceUnavailable", 504: "Timeout",
+}
+# Jetons continue conservés (au-delà, 410 comme un jeton expiré)
+MAX_SNAPSHOTS = 64
+
+
+@dataclass
+class Faults:
+    """
+    Comportement injecté pour un type d'appel.
+
+    Attributes:
+        latency: Latence ajoutée à chaque appel (secondes)
+        jitter: Latence aléatoire supplémentaire, uniforme dans [0, jitter]
+        throttle_rate: Probabilité d'une réponse 429
+        error_rate: Probabilité d'une erreur serveur
+        error_status: Code HTTP de l'erreur injectée
+        qps: Débit accepté, au-delà réponse 429 comme l'API Priority and Fairness (0 = illimité)
+        burst: Capacité du seau de jetons associé à qps
+        retry_after: En-tête Retry-After des réponses 429 (secondes) ; urllib3 le
+            respecte et réessaie, comme face à un vrai apiserver
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    throttle_rate: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    qps: float = 0.0
+    burst: int = 10
+    retry_after: int = 1
+
+
+class _TokenBucket:
+    def __init__(self, qps: float, burst: int):
+        self.rate = qps
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+def _status(code: int, message: str) -> dict:
+    return {
+        "kind": "Status", "apiVersion": "v1", "metadata": {}, "status": "Failure",
+        "message": message, "reason": REASONS.get(code, "Unknown"), "code": code,
+    }
+
+
+class ApiError(Exception):
+    """Réponse d'erreur de l'apiserver (corps Status)."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.body = _status(code, message)
+
+
+def _key(obj: dict) -> tuple:
+    return obj["metadata"].get("namespace"), obj["metadata"]["name"]
+
+
+def _merge_patch(target, patch):
+    """JSON merge patch (RFC 7386) ; suffisant pour les champs scalaires et maps patchés par l'application."""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    target = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        else:
+            target[key] = _merge_patch(target.get(key), value)
+    return target
+
+
+def _json_patch(target: dict, operations: list) -> dict:
+    """JSON patch (RFC 6902) : opérations add, replace et remove."""
+    for operation in operations:
+        parts = [p.replace("~1", "/").replace("~0", "~") for p in operation["path"].split("/")[1:]]
+        parent = target
+        for part in parts[:-1]:
+            parent = parent[int(part)] if isinstance(parent, list) else parent.setdefault(part, {})
+        last = parts[-1]
+        if operation["op"] in ("add", "replace"):
+            if isinstance(parent, list):
+                index = len(parent) if last == "-" else int(last)
+                parent.insert(index, operation["value"]) if operation["op"] == "add" else parent.__setitem__(
+                    index, operation["value"])
+            else:
+                parent[last] = operation["value"]
+        elif operation["op"] == "remove":
+            del parent[int(last) if isinstance(parent, list) else last]
+        else:
+            raise ApiError(422, f"unsupported patch operation {operation['op']}")
+    return target
+
+
+def _route(path: str):
+    """
+    Découpe un chemin de l'API : /api/v1/... ou /apis/<groupe>/<version>/...
+
+    Returns:
+        (api_version, resource, namespace, name, subresource) ou None
+    """
+    parts = [part for part in path.split("/") if part]
+    if parts[:2] == ["api", "v1"]:
+        api_version, rest = "v1", parts[2:]
+    elif len(parts) >= 3 and parts[0] == "apis":
+        api_version, rest = f"{parts[1]}/{parts[2]}", parts[3:]
+    else:
+        return None
+    namespace = None
+    if len(rest) >= 3 and rest[0] == "namespaces":
+        namespace, rest = rest[1], rest[2:]
+    if not rest or rest[0] not in KINDS or len(rest) > 3:
+        return None
+    return api_version, rest[0], namespace, rest[1] if len(rest) > 1 else None, rest[2] if len(rest) > 2 else None
+
+
+class FakeApiServer:
+    """
+    Faux apiserver servant des objets JSON (par ressource, voir make_cluster).
+
+    Attributes:
+        faults: Comportement injecté par défaut
+        verb_faults: Comportement par verbe (list, watch, get, patch, update, delete)
+        ready_delay: Délai avant que les réplicas ajoutés par un scale soient Ready (secondes)
+        requests: Nombre d'appels par (verbe, ressource)
+        injected: Nombre de réponses d'erreur injectées par code HTTP
+    """
+
+    def __init__(
+        self,
+        objects: Optional[Dict[str, list]] = None,
+        faults: Optional[Faults] = None,
+        verb_faults: Optional[Dict[str, Faults]] = None,
+        ready_delay: float = 0.0,
+        history: int = 10000,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            objects: Objets initiaux par ressource (ex. make_cluster(ClusterSpec(...)))
+            history: Nombre d'événements de watch conservés (au-delà, 410 Expired)
+            port: Port d'écoute (0 = port libre)
+            seed: Graine du tirage des fautes injectées
+        """
+        self.faults = faults or Faults()
+        self.verb_faults = dict(verb_faults or {})
+        self.ready_delay = ready_delay
+        self.requests: Counter = Counter()
+        self.injected: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._lock = threading.Condition()
+        self._store: Dict[str, Dict[tuple, dict]] = {resource: {} for resource in KINDS}
+        for resource, items in (objects or {}).items():
+            for item in items:
+                self._store[resource][_key(item)] = item
+        self._rv = 1
+        self._events: deque = deque(maxlen=history)
+        self._compacted_rv = 0
+        self._snapshots: OrderedDict = OrderedDict()
+        self._ids = itertools.count(1)
+        self._closed = False
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_spec(cls, spec: ClusterSpec, **kwargs) -> "FakeApiServer":
+        """Faux apiserver servant un cluster synthétique."""
+        return cls(make_cluster(spec), **kwargs)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeApiServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-apiserver", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Clients
+
+    def api_client(self) -> client.ApiClient:
+        """Client du SDK Kubernetes pointant sur le faux apiserver."""
+        return client.ApiClient(client.Configuration(host=self.url))
+
+    def apps_v1(self) -> client.AppsV1Api:
+        return client.AppsV1Api(self.api_client())
+
+    def core_v1(self) -> client.CoreV1Api:
+        return client.CoreV1Api(self.api_client())
+
+    def autoscaling_v2(self) -> client.AutoscalingV2Api:
+        return client.AutoscalingV2Api(self.api_client())
+
+    def write_kubeconfig(self, path: str):
+        """Écrit un kubeconfig (JSON, accepté par le parseur YAML) pointant sur le faux apiserver."""
+        config = {
+            "apiVersion": "v1", "kind": "Config", "current-context": "fake",
+            "clusters": [{"name": "fake", "cluster": {"server": self.url}}],
+            "users": [{"name": "fake", "user": {"token": "fake"}}],
+            "contexts": [{"name": "fake", "context": {"cluster": "fake", "user": "fake"}}],
+        }
+        with open(path, "wb") as f:
+            f.write(dumps(config))
+
+    def objects(self, resource: str) -> list:
+        """État courant d'une ressource."""
+        with self._lock:
+            return list(self._store[resource].values())
+
+    # --- Injection des fautes
+
+    def inject(self, verb: str) -> Optional[int]:
+        """Applique la latence du verbe ; renvoie le code d'erreur à répondre, ou None."""
+        faults = self.verb_faults.get(verb, self.faults)
+        delay = faults.latency + (self._rng.uniform(0, faults.jitter) if faults.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        code = None
+        if faults.qps:
+            bucket = self._buckets.get(verb)
+            if bucket is None:
+                bucket = self._buckets.setdefault(verb, _TokenBucket(faults.qps, faults.burst))
+            if not bucket.take():
+                code = 429
+        if code is None and faults.throttle_rate and self._rng.random() < faults.throttle_rate:
+            code = 429
+        if code is None and faults.error_rate and self._rng.random() < faults.error_rate:
+            code = faults.error_status
+        if code is not None:
+            self.injected[code] += 1
+        return code
+
+    # --- Lecture
+
+    def _selected(self, resource, namespace, query):
+        label_selector, field_selector = query.get("labelSelector"), query.get("fieldSelector")
+        return [
+            obj for obj in self._store[resource].values()
+            if (namespace is None or obj["metadata"].get("namespace") == namespace)
+            and _matches(obj, label_selector, field_selector)
+        ]
+
+    def list(self, api_version, resource, namespace, query) -> dict:
+        """
+        Liste paginée. Comme l'apiserver, toutes les pages d'une liste viennent
+        du même instantané, référencé par le jeton continue.
+        """
+        token = query.get("continue")
+        with self._lock:
+            if token:
+                snapshot_id, _, offset = token.partition(":")
+                if snapshot_id not in self._snapshots:
+                    raise ApiError(410, "The provided continue parameter is too old")
+                items, rv = self._snapshots[snapshot_id]
+                offset = int(offset)
+            else:
+                snapshot_id, items, rv, offset = None, self._selected(resource, namespace, query), self._rv, 0
+            limit = int(query.get("limit") or 0)
+            end = offset + limit if limit else len(items)
+            metadata = {"resourceVersion": str(rv)}
+            if end < len(items):
+                if snapshot_id is None:
+                    snapshot_id = str(next(self._ids))
+                    self._snapshots[snapshot_id] = (items, rv)
+                    while len(self._snapshots) > MAX_SNAPSHOTS:
+                        self._snapshots.popitem(last=False)
+                metadata["continue"] = f"{snapshot_id}:{end}"
+            elif snapshot_id is not None:
+                self._snapshots.pop(snapshot_id, None)
+        return {"kind": f"{KINDS[resource]}List", "apiVersion": api_version, "metadata": metadata,
+                "items": items[offset:end]}
+
+    def get(self, resource, namespace, name, subresource=None) -> dict:
+        with self._lock:
+            obj = self._store[resource].get((namespace, name))
+        if obj is None:
+            raise ApiError(404, f'{resource} "{name}" not found')
+        return self._scale_view(obj) if subresource == "scale" else obj
+
+    @staticmethod
+    def _scale_view(obj: dict) -> dict:
+        metadata = obj["metadata"]
+        return {
+            "kind": "Scale", "apiVersion": "autoscaling/v1",
+            "metadata": {key: metadata.get(key) for key in ("name", "namespace", "uid", "resourceVersion")},
+            "spec": {"replicas": obj["spec"].get("replicas", 0)},
+            "status": {"replicas": (obj.get("status") or {}).get("replicas", 0)},
+        }
+
+    def watch(self, resource, namespace, query, write: Callable[[bytes], None]):
+        """
+        Envoie les événements (ADDED, MODIFIED, DELETED) postérieurs à
+        resourceVersion jusqu'à timeoutSeconds. Sans resourceVersion, les objets
+        existants sont d'abord envoyés en ADDED ; un resourceVersion trop ancien
+        produit un événement ERROR 410, comme l'apiserver. Avec
+        allowWatchBookmarks, un BOOKMARK au resourceVersion courant suit le
+        rattrapage de l'historique.
+        """
+        rv = query.get("resourceVersion")
+        deadline = time.monotonic() + float(query.get("timeoutSeconds") or 300)
+        label_selector, field_selector = query.get("labelSelector"), query.get("fieldSelector")
+        with self._lock:
+            if not rv or rv == "0":
+                initial, last = self._selected(resource, namespace, query), self._rv
+            else:
+                initial, last = [], int(rv)
+                if last < self._compacted_rv:
+                    write(dumps({"type": "ERROR", "object": _status(
+                        410, f"too old resource version: {rv} ({self._compacted_rv})")}) + b"\n")
+                    return
+        for obj in initial:
+            write(dumps({"type": "ADDED", "object": obj}) + b"\n")
+
+        bookmark = query.get("allowWatchBookmarks") in ("true", "1")
+        while True:
+            with self._lock:
+                pending = [event for event in self._events if event[0] > last]
+                if not pending and not bookmark:
+                    remaining = deadline - time.monotonic()
+                    if self._closed or remaining <= 0:
+                        return
+                    self._lock.wait(remaining)
+                    continue
+            if not pending:
+                bookmark = False
+                write(dumps({"type": "BOOKMARK", "object": {"metadata": {"resourceVersion": str(last)}}}) + b"\n")
+                continue
+            for event_rv, event_resource, event_type, obj in pending:
+                last = event_rv
+                if event_resource == resource \
+                        and (namespace is None or obj["metadata"].get("namespace") == namespace) \
+                        and _matches(obj, label_selector, field_selector):
+                    write(dumps({"type": event_type, "object": obj}) + b"\n")
+
+    # --- Écriture
+
+    def _commit(self, resource: str, obj: dict, event_type: str):
+        """Enregistre une modification (sous verrou) : nouveau resourceVersion et événement de watch."""
+        self._rv += 1
+        obj["metadata"]["resourceVersion"] = str(self._rv)
+        if event_type == "DELETED":
+            self._store[resource].pop(_key(obj), None)
+        else:
+            self._store[resource][_key(obj)] = obj
+        if len(self._events) == self._events.maxlen:
+            self._compacted_rv = self._events[0][0]
+        self._events.append((self._rv, resource, event_type, obj))
+        self._lock.notify_all()
+
+    def patch(self, resource, namespace, name, subresource, body, replace=False) -> dict:
+        """PATCH (merge patch si body est un dict, JSON patch si c'est une liste) ou PUT (replace)."""
+        with self._lock:
+            current = self._store[resource].get((namespace, name))
+            if current is None:
+                raise ApiError(404, f'{resource} "{name}" not found')
+            if subresource == "scale":
+                replicas = body["spec"]["replicas"] if isinstance(body, dict) else \
+                    _json_patch(self._scale_view(current), body)["spec"]["replicas"]
+                updated = _merge_patch(current, {"spec": {"replicas": replicas}})
+            elif replace:
+                updated = copy.deepcopy(body)
+            elif isinstance(body, list):
+                updated = _json_patch(copy.deepcopy(current), body)
+            else:
+                updated = _merge_patch(current, body)
+            # Les objets stockés ne sont jamais modifiés en place (instantanés des listes)
+            updated["metadata"] = {**updated["metadata"], "uid": current["metadata"]["uid"]}
+
+            replicas = (updated.get("spec") or {}).get("replicas")
+            scaled = resource in ("deployments", "statefulsets") and replicas != current["spec"].get("replicas")
+            if scaled:
+                status = dict(updated.get("status") or {})
+                ready = replicas if not self.ready_delay else min(status.get("readyReplicas") or 0, replicas)
+                status.update(replicas=replicas, readyReplicas=ready, availableReplicas=ready,
+                              updatedReplicas=replicas)
+                updated["status"] = status
+            self._commit(resource, updated, "MODIFIED")
+            if scaled:
+                self._reconcile_pods(resource, updated, replicas)
+        if scaled and self.ready_delay and replicas:
+            timer = threading.Timer(self.ready_delay, self._mark_ready, (resource, (namespace, name), replicas))
+            timer.daemon = True
+            timer.start()
+        return self._scale_view(updated) if subresource == "scale" else updated
+
+    def delete(self, resource, namespace, name, body=None) -> dict:
+        """DELETE, avec les préconditions optionnelles (uid, resourceVersion) de DeleteOptions."""
+        with self._lock:
+            current = self._store[resource].get((namespace, name))
+            if current is None:
+                raise ApiError(404, f'{resource} "{name}" not found')
+            preconditions = (body or {}).get("preconditions") or {}
+            for field_name in ("uid", "resourceVersion"):
+                if preconditions.get(field_name) not in (None, current["metadata"].get(field_name)):
+                    raise ApiError(409, f"Precondition failed: {field_name} in precondition does not match")
+            self._commit(resource, {**current, "metadata": dict(current["metadata"])}, "DELETED")
+        return {"kind": "Status", "apiVersion": "v1", "metadata": {}, "status": "Success",
+                "details": {"name": name, "kind": resource}}
+
+    def _reconcile_pods(self, resource: str, workload: dict, replicas: int):
+        """Ajuste les pods d'un workload scalé (sous verrou), comme ses contrôleurs."""
+        namespace, name = _key(workload)
+        if resource == "deployments":
+            owned = [rs for rs in self._store["replicasets"].values()
+                     if any(ref["uid"] == workload["metadata"]["uid"]
+                            for ref in rs["metadata"].get("ownerReferences") or [])]
+            if not owned:
+                return
+            rs = max(owned, key=lambda r: r["metadata"].get("creationTimestamp") or "")
+            rs = {**rs, "metadata": dict(rs["metadata"]),
+                  "spec": {**rs["spec"], "replicas": replicas}, "status": {**rs.get("status", {}), "replicas": replicas}}
+            self._commit("replicasets", rs, "MODIFIED")
+            owner = ("ReplicaSet", rs["metadata"]["name"], rs["metadata"]["uid"])
+        else:
+            owner = ("StatefulSet", name, workload["metadata"]["uid"])
+
+        pods = sorted(
+            (pod for pod in self._store["pods"].values()
+             if any(ref["uid"] == owner[2] for ref in pod["metadata"].get("ownerReferences") or [])),
+            key=lambda pod: pod["metadata"]["name"],
+        )
+        for pod in pods[replicas:]:
+            self._commit("pods", {**pod, "metadata": dict(pod["metadata"])}, "DELETED")
+        nodes = [node["metadata"]["name"] for node in self._store["nodes"].values()] or ["node-0"]
+        labels = workload["spec"]["template"]["metadata"]["labels"]
+        for index in range(len(pods), replicas):
+            pod_id = next(self._ids)
+            if resource == "statefulsets":
+                pod_name, pvc = f"{name}-{index}", f"data-{name}-{index}"
+            else:
+                # Suffixe distinct des pods générés par make_cluster (chiffres seulement)
+                pod_name, pvc = f"{owner[1]}-f{pod_id:04x}", None
+            pod = _pod(pod_name, namespace, _uid("fakepod", pod_id), labels, owner, nodes[pod_id % len(nodes)], pvc)
+            self._commit("pods", pod, "ADDED")
+
+    def _mark_ready(self, resource: str, key: tuple, replicas: int):
+        with self._lock:
+            current = self._store[resource].get(key)
+            if current is None or current["spec"].get("replicas") != replicas:
+                return
+            status = {**current.get("status", {}), "readyReplicas": replicas, "availableReplicas": replicas}
+            self._commit(resource, {**current, "metadata": dict(current["metadata"]), "status": status}, "MODIFIED")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routage HTTP vers FakeApiServer (une connexion keep-alive par thread)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _send(self, code: int, payload: dict, headers: Optional[dict] = None):
+        data = dumps(payload)
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, method: str):
+        fake: FakeApiServer = self.server.fake
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = loads(self.rfile.read(length)) if length else None
+        route = _route(url.path)
+        if route is None:
+            self._send(404, _status(404, f"the server could not find the requested resource {url.path}"))
+            return
+        api_version, resource, namespace, name, subresource = route
+
+        if method == "GET":
+            verb = "get" if name else "watch" if query.get("watch") in ("true", "1") else "list"
+        else:
+            verb = {"PATCH": "patch", "PUT": "update", "DELETE": "delete"}[method]
+        fake.requests[(verb, resource)] += 1
+
+        code = fake.inject(verb)
+        if code is not None:
+            headers = {"Retry-After": str(fake.verb_faults.get(verb, fake.faults).retry_after)} if code == 429 else None
+            self._send(code, _status(code, "injected by the fake apiserver"), headers)
+            return
+
+        try:
+            if verb == "watch":
+                self._stream(fake, resource, namespace, query)
+            elif verb == "list":
+                self._send(200, fake.list(api_version, resource, namespace, query))
+            elif verb == "get":
+                self._send(200, fake.get(resource, namespace, name, subresource))
+            elif verb == "delete":
+                self._send(200, fake.delete(resource, namespace, name, body))
+            else:
+                self._send(200, fake.patch(resource, namespace, name, subresource, body, replace=verb == "update"))
+        except ApiError as e:
+            self._send(e.code, e.body)
+
+    def _stream(self, fake: FakeApiServer, resource, namespace, query):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def write(data: bytes):
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+        try:
+            fake.watch(resource, namespace, query, write)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pods", type=int, default=10000)
+    parser.add_argument("--namespaces", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.0, help="latence par appel (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latence aléatoire supplémentaire (s)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="probabilité d'un 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probabilité d'un 500")
+    parser.add_argument("--qps", type=float, default=0.0, help="débit accepté avant 429 (0 = illimité)")
+    parser.add_argument("--ready-delay", type=float, default=5.0, help="délai avant Ready après un scale (s)")
+    parser.add_argument("--kubeconfig", help="écrit un kubeconfig pointant sur le faux apiserver")
+    args = parser.parse_args()
+
+    faults = Faults(latency=args.latency, jitter=args.jitter, throttle_rate=args.throttle_rate,
+                    error_rate=args.error_rate, qps=args.qps, burst=max(int(args.qps), 10))
+    server = FakeApiServer.from_spec(ClusterSpec(pods=args.pods, namespaces=args.namespaces), faults=faults,
+                                     ready_delay=args.ready_delay, port=args.port)
+    if args.kubeconfig:
+        server.write_kubeconfig(args.kubeconfig)
+    print(f"Fake apiserver on {server.url}: {', '.join(f'{len(server.objects(r))} {r}' for r in KINDS)}")
+    with server:
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Simulation du SchedulerEngine sur horloge virtuelle.
+
+Rejoue des jours de programmations (des milliers de paires cron) en quelques
+secondes : le moteur est piloté tick par tick avec une horloge injectée, et ses
+actions sont enregistrées par un faux action sink au lieu d'appeler l'API. Les
+déclenchements sont comparés à une référence calculée en temps continu pour
+mesurer la précision, les déclenchements manqués ou en double, et le coût CPU
+par tick.
+
+Usage (depuis src/):
+    python -m benchmarks.scheduler_sim --schedules 1000 --days 2 --drift 2
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+# Aucun cluster n'est nécessaire : les actions passent par le faux action sink
+os.environ.setdefault("TESTING", "1")
+
+import pytz  # noqa: E402
+from croniter import croniter  # noqa: E402
+from loguru import logger  # noqa: E402
+
+from core.models import ScheduleStatus  # noqa: E402
+from scheduler_engine import SchedulerEngine  # noqa: E402
+
+
+class VirtualClock:
+    """Horloge injectée dans le moteur, avancée par la simulation."""
+
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+class RecordingSink:
+    """
+    Faux action sink : enregistre les actions et applique à la programmation la
+    mise à jour que ferait l'API (PUT active/status après un démarrage ou un arrêt).
+    """
+
+    def __init__(self):
+        self.fires: Dict[Tuple[str, str], List[datetime]] = {}
+
+    async def __call__(self, action: str, schedule, now: datetime):
+        self.fires.setdefault((schedule.uid, action), []).append(now)
+        schedule.active = action == "start"
+        schedule.status = ScheduleStatus.SCHEDULED
+
+
+def make_schedules(count: int, seed: int = 0) -> list:
+    """
+    Génère des paires cron variées : heures de bureau en semaine, week-end,
+    cycles de quelques heures et démarrages dans l'heure du changement d'heure.
+    """
+    rng = random.Random(seed)
+    schedules = []
+    for index in range(count):
+        kind = index % 4
+        if kind == 0:
+            cron_start = f"{rng.randrange(60)} {rng.randint(6, 9)} * * 1-5"
+            cron_stop = f"{rng.randrange(60)} {rng.randint(18, 21)} * * 1-5"
+        elif kind == 1:
+            cron_start = f"{rng.randrange(0, 60, 5)} 8 * * 6,0"
+            cron_stop = f"{rng.randrange(0, 60, 5)} 12 * * 6,0"
+        elif kind == 2:
+            minute = rng.randrange(60)
+            cron_start = f"{minute} */2 * * *"
+            cron_stop = f"{minute} 1-23/2 * * *"
+        else:
+            cron_start = f"{rng.randrange(0, 60, 15)} 2 * * *"
+            cron_stop = f"{rng.randrange(0, 60, 15)} 5 * * *"
+        schedules.append(SimpleNamespace(
+            id=index,
+            name=f"workload-{index}",
+            uid=f"uid-{index}",
+            active=False,
+            status=ScheduleStatus.NOT_SCHEDULED,
+            cron_start=cron_start,
+            cron_stop=cron_stop,
+            lead_time=None,
+            auto_lead_time=False,
+            target_namespace=None,
+            label_selector=None,
+        ))
+    return schedules
+
+
+def _occurrences(expression: str, start: datetime, end: datetime) -> List[datetime]:
+    """Occurrences dans [start, end), sans rejouer une heure locale répétée au passage à l'heure d'hiver."""
+    cron = croniter(expression, start - timedelta(microseconds=1))
+    occurrences = []
+    while True:
+        occurrence = cron.get_next(datetime)
+        if occurrence >= end:
+            return occurrences
+        if not SchedulerEngine._repeated_wall_time(occurrence):
+            occurrences.append(occurrence)
+
+
+def expected_fires(schedules, start: datetime, end: datetime) -> Dict[Tuple[str, str], List[datetime]]:
+    """
+    Référence en temps continu : un démarrage n'a lieu que si le workload est
+    arrêté, un arrêt que s'il est démarré (mêmes règles que _process_schedule).
+    Un démarrage et un arrêt au même instant (ex. 02:00 inexistant reporté à
+    03:00 au passage à l'heure d'été) : le démarrage est prioritaire.
+    """
+    expected: Dict[Tuple[str, str], List[datetime]] = {}
+    for schedule in schedules:
+        starts = _occurrences(schedule.cron_start, start, end)
+        start_times = set(starts)
+        events = sorted(
+            [(t, "start") for t in starts]
+            + [(t, "stop") for t in _occurrences(schedule.cron_stop, start, end) if t not in start_times]
+        )
+        active = False
+        for occurrence, action in events:
+            if (action == "start") != active:
+                expected.setdefault((schedule.uid, action), []).append(occurrence)
+                active = action == "start"
+    return expected
+
+
+@dataclass
+class SimulationReport:
+    schedules: int
+    ticks: int
+    simulated: timedelta
+    wall_s: float
+    expected: int = 0
+    fired: int = 0
+    missed: int = 0
+    unexpected: int = 0
+    offsets: List[float] = field(default_factory=list)
+    tick_cpu: List[float] = field(default_factory=list)
+
+    @staticmethod
+    def _pct(values: List[float], pct: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    def format(self) -> str:
+        cpu_ms = [c * 1000 for c in self.tick_cpu]
+        return "\n".join([
+            f"{self.schedules} schedules, {self.simulated} simulated in {self.wall_s:.1f}s wall ({self.ticks} ticks)",
+            f"fires: expected {self.expected}, fired {self.fired}, missed {self.missed}, unexpected {self.unexpected}",
+            "offset vs cron (s, <0 = tick before): "
+            f"min {min(self.offsets, default=0):.1f}  p50 {self._pct(self.offsets, 50):.1f}  "
+            f"p95 {self._pct(self.offsets, 95):.1f}  max {max(self.offsets, default=0):.1f}",
+            f"tick CPU (ms): mean {sum(cpu_ms) / max(len(cpu_ms), 1):.2f}  p95 {self._pct(cpu_ms, 95):.2f}  "
+            f"max {max(cpu_ms, default=0):.2f}  "
+            f"({sum(self.tick_cpu) / max(len(self.tick_cpu), 1) / max(self.schedules, 1) * 1e6:.1f} µs/schedule)",
+        ])
+
+
+def compare(expected, fires, interval: float, max_late: float, report: SimulationReport):
+    """Associe chaque occurrence attendue au premier déclenchement dans (T - intervalle, T + max_late]."""
+    for key in set(expected) | set(fires):
+        actual = sorted(fires.get(key, []))
+        used = 0
+        for occurrence in expected.get(key, []):
+            while used < len(actual) and (actual[used] - occurrence).total_seconds() <= -interval:
+                used += 1
+                report.unexpected += 1
+            if used < len(actual) and (actual[used] - occurrence).total_seconds() <= max_late:
+                report.offsets.append((actual[used] - occurrence).total_seconds())
+                used += 1
+            else:
+                report.missed += 1
+        report.unexpected += len(actual) - used
+        report.expected += len(expected.get(key, []))
+        report.fired += len(actual)
+
+
+async def simulate(
+    schedules,
+    start: datetime,
+    days: float,
+    interval: int = 60,
+    drift: float = 0.0,
+    stall_probability: float = 0.0,
+    stall: float = 0.0,
+    seed: int = 0,
+) -> SimulationReport:
+    """
+    Rejoue les programmations sur `days` jours.
+
+    Args:
+        schedules: Programmations (voir make_schedules) ; leur état est modifié
+        start: Début de la simulation (datetime localisé avec un fuseau pytz)
+        interval: check_interval du moteur (secondes)
+        drift: Retard aléatoire maximal ajouté à chaque tick (temps de traitement)
+        stall_probability: Probabilité qu'un tick soit bloqué (GC, API lente...)
+        stall: Durée maximale d'un blocage (secondes)
+    """
+    rng = random.Random(seed)
+    clock = VirtualClock(start)
+    sink = RecordingSink()
+    engine = SchedulerEngine(check_interval=interval, clock=clock, action_sink=sink)
+    end = start + timedelta(days=days)
+    report = SimulationReport(schedules=len(schedules), ticks=0, simulated=end - start, wall_s=0.0)
+
+    wall = time.perf_counter()
+    while clock.now < end:
+        cpu = time.process_time()
+        await engine.evaluate_schedules(schedules, clock.now)
+        report.tick_cpu.append(time.process_time() - cpu)
+        report.ticks += 1
+        delay = interval + rng.uniform(0, drift)
+        if stall and rng.random() < stall_probability:
+            delay += rng.uniform(0, stall)
+        clock.now = start.tzinfo.normalize(clock.now + timedelta(seconds=delay))
+    report.wall_s = time.perf_counter() - wall
+
+    # Les occurrences de la dernière fenêtre (déclenchées en avance) font partie de la référence
+    expected = expected_fires(schedules, start, end + timedelta(seconds=interval))
+    compare(expected, sink.fires, interval, engine.max_catch_up, report)
+    await engine.client.aclose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--schedules", type=int, default=1000)
+    parser.add_argument("--days", type=float, default=2)
+    parser.add_argument("--interval", type=int, default=60)
+    parser.add_argument("--drift", type=float, default=2.0, help="retard max par tick (s)")
+    parser.add_argument("--stall-probability", type=float, default=0.001)
+    parser.add_argument("--stall", type=float, default=120.0, help="blocage max d'un tick (s)")
+    parser.add_argument("--start", default="2025-10-20T00:00:00", help="début (heure locale, TIMEZONE)")
+    parser.add_argument("--timezone", default="Europe/Paris")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logger.remove()
+
+    start = pytz.timezone(args.timezone).localize(datetime.fromisoformat(args.start))
+    report = asyncio.run(simulate(
+        make_schedules(args.schedules, args.seed), start, args.days, args.interval,
+        args.drift, args.stall_probability, args.stall, args.seed,
+    ))
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
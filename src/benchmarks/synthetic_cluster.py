@@ -0,0 +1,333 @@
+"""
+Cluster Kubernetes synthétique pour les benchmarks de l'inventaire.
+
+Génère des namespaces, Deployments (avec leurs ReplicaSets actifs et anciens),
+StatefulSets, DaemonSets, nœuds et pods au format JSON de l'apiserver, avec des
+ownerReferences et des labels cohérents, et les sert par de faux clients
+apps_v1/core_v1 qui respectent limit/_continue, les sélecteurs et
+_preload_content=False comme le client officiel.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from kubernetes.client import ApiClient
+
+from utils.fastjson import dumps, loads
+
+CREATED = "2025-01-01T00:00:00Z"
+
+
+@dataclass
+class ClusterSpec:
+    """
+    Taille et composition du cluster synthétique.
+
+    Attributes:
+        pods: Nombre de pods visé (réparti entre Deployments, StatefulSets et DaemonSets)
+        namespaces: Nombre de namespaces applicatifs
+        deploy_share: Part des pods gérés par des Deployments
+        sts_share: Part des pods gérés par des StatefulSets (le reste pour les DaemonSets)
+        deployment_replicas: Réplicas par Deployment
+        old_replicasets: ReplicaSets inactifs (0 réplica) conservés par Deployment
+        sts_replicas: Réplicas par StatefulSet
+        pods_per_node: Densité de pods, qui fixe le nombre de nœuds
+    """
+    pods: int = 10000
+    namespaces: int = 20
+    deploy_share: float = 0.7
+    sts_share: float = 0.2
+    deployment_replicas: int = 3
+    old_replicasets: int = 2
+    sts_replicas: int = 2
+    pods_per_node: int = 30
+
+    @property
+    def nodes(self) -> int:
+        return max(1, self.pods // self.pods_per_node)
+
+    @property
+    def deployments(self) -> int:
+        return max(1, round(self.pods * self.deploy_share / self.deployment_replicas))
+
+    @property
+    def statefulsets(self) -> int:
+        return max(1, round(self.pods * self.sts_share / self.sts_replicas))
+
+    @property
+    def daemonsets(self) -> int:
+        return max(1, round(self.pods * (1 - self.deploy_share - self.sts_share) / self.nodes))
+
+
+def _uid(kind: str, index: int) -> str:
+    return f"{kind[:8]:0>8}-0000-0000-0000-{index:012d}"
+
+
+def _metadata(name, namespace, uid, labels, owner=None, **extra) -> dict:
+    metadata = {
+        "name": name,
+        "namespace": namespace,
+        "uid": uid,
+        "resourceVersion": "1",
+        "generation": 1,
+        "creationTimestamp": CREATED,
+        "labels": labels,
+        "annotations": {"meta.helm.sh/release-name": labels.get("app.kubernetes.io/instance", name)},
+        **extra,
+    }
+    if owner:
+        metadata["ownerReferences"] = [{
+            "apiVersion": "apps/v1", "kind": owner[0], "name": owner[1], "uid": owner[2],
+            "controller": True, "blockOwnerDeletion": True,
+        }]
+    return metadata
+
+
+def _containers(app: str) -> list:
+    return [
+        {
+            "name": f"{app}-{c}",
+            "image": f"registry.example.com/{app}:1.2.3",
+            "env": [{"name": f"ENV_{e}", "value": f"value-{e}"} for e in range(5)],
+            "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+            "resources": {"requests": {"cpu": "100m", "memory": "128Mi"}, "limits": {"memory": "256Mi"}},
+            "readinessProbe": {"httpGet": {"path": "/ready", "port": 8080}, "periodSeconds": 10},
+        }
+        for c in range(2)
+    ]
+
+
+def _workload_labels(app: str, team: str) -> dict:
+    return {
+        "app": app,
+        "app.kubernetes.io/name": app,
+        "app.kubernetes.io/instance": app,
+        "app.kubernetes.io/managed-by": "Helm",
+        "team": team,
+    }
+
+
+def _pod(name, namespace, uid, labels, owner, node, pvc=None) -> dict:
+    volumes = [{"name": "config", "configMap": {"name": f"{labels['app']}-config", "defaultMode": 420}}]
+    if pvc:
+        volumes.append({"name": "data", "persistentVolumeClaim": {"claimName": pvc}})
+    return {
+        "metadata": _metadata(name, namespace, uid, labels, owner),
+        "spec": {
+            "nodeName": node,
+            "serviceAccountName": "default",
+            "volumes": volumes,
+            "containers": _containers(labels["app"]),
+        },
+        "status": {
+            "phase": "Running",
+            "podIP": "10.0.0.1",
+            "startTime": CREATED,
+            "conditions": [
+                {"type": t, "status": "True"} for t in ("Initialized", "Ready", "ContainersReady", "PodScheduled")
+            ],
+        },
+    }
+
+
+def _workload_spec(labels: dict, replicas: Optional[int] = None) -> dict:
+    spec = {
+        "selector": {"matchLabels": {"app": labels["app"]}},
+        "template": {"metadata": {"labels": labels}, "spec": {"containers": _containers(labels["app"])}},
+    }
+    if replicas is not None:
+        spec["replicas"] = replicas
+    return spec
+
+
+def make_cluster(spec: ClusterSpec) -> Dict[str, List[dict]]:
+    """
+    Génère les objets du cluster, par ressource (deployments, replicasets,
+    statefulsets, daemonsets, pods, nodes, namespaces).
+    """
+    namespaces = [f"team-{n}" for n in range(spec.namespaces)]
+    nodes = [f"node-{n}" for n in range(spec.nodes)]
+    cluster = {
+        "namespaces": [{"metadata": {"name": ns, "uid": _uid("ns", n), "labels": {"team": ns}}}
+                       for n, ns in enumerate(["kube-system", "monitoring", *namespaces])],
+        "nodes": [{"metadata": {"name": node, "uid": _uid("node", n), "labels": {"pool": "workers"}},
+                   "status": {"conditions": [{"type": "Ready", "status": "True"}]}}
+                  for n, node in enumerate(nodes)],
+        "deployments": [], "replicasets": [], "statefulsets": [], "daemonsets": [], "pods": [],
+    }
+    pod_index = 0
+
+    def next_pod_uid():
+        nonlocal pod_index
+        pod_index += 1
+        return _uid("pod", pod_index), nodes[pod_index % len(nodes)]
+
+    for d in range(spec.deployments):
+        namespace = namespaces[d % len(namespaces)]
+        app = f"api-{d}"
+        labels = _workload_labels(app, namespace)
+        uid = _uid("deploy", d)
+        status = {"replicas": spec.deployment_replicas, "readyReplicas": spec.deployment_replicas,
+                  "availableReplicas": spec.deployment_replicas, "observedGeneration": 1}
+        cluster["deployments"].append({
+            "metadata": _metadata(app, namespace, uid, labels),
+            "spec": _workload_spec(labels, spec.deployment_replicas),
+            "status": status,
+        })
+        # Le ReplicaSet le plus récent est actif, les anciens sont à 0 réplica
+        for r in range(spec.old_replicasets + 1):
+            active = r == spec.old_replicasets
+            rs_name = f"{app}-{r:x}5d9f8c6b"
+            rs_uid = _uid("rs", d * (spec.old_replicasets + 1) + r)
+            replicas = spec.deployment_replicas if active else 0
+            cluster["replicasets"].append({
+                "metadata": _metadata(rs_name, namespace, rs_uid, {**labels, "pod-template-hash": f"{r:x}5d9f8c6b"},
+                                      ("Deployment", app, uid), creationTimestamp=f"2025-01-0{r + 1}T00:00:00Z"),
+                "spec": _workload_spec(labels, replicas),
+                "status": {"replicas": replicas, "readyReplicas": replicas, "availableReplicas": replicas},
+            })
+            if active:
+                for p in range(spec.deployment_replicas):
+                    pod_uid, node = next_pod_uid()
+                    cluster["pods"].append(_pod(f"{rs_name}-{p:05d}", namespace, pod_uid,
+                                                {**labels, "pod-template-hash": f"{r:x}5d9f8c6b"},
+                                                ("ReplicaSet", rs_name, rs_uid), node))
+
+    for s in range(spec.statefulsets):
+        namespace = namespaces[s % len(namespaces)]
+        app = f"db-{s}"
+        labels = _workload_labels(app, namespace)
+        uid = _uid("sts", s)
+        cluster["statefulsets"].append({
+            "metadata": _metadata(app, namespace, uid, labels),
+            "spec": {**_workload_spec(labels, spec.sts_replicas), "serviceName": app},
+            "status": {"replicas": spec.sts_replicas, "readyReplicas": spec.sts_replicas,
+                       "availableReplicas": spec.sts_replicas, "observedGeneration": 1},
+        })
+        for p in range(spec.sts_replicas):
+            pod_uid, node = next_pod_uid()
+            cluster["pods"].append(_pod(f"{app}-{p}", namespace, pod_uid, labels,
+                                        ("StatefulSet", app, uid), node, pvc=f"data-{app}-{p}"))
+
+    for n in range(spec.daemonsets):
+        app = f"agent-{n}"
+        labels = _workload_labels(app, "monitoring")
+        uid = _uid("ds", n)
+        cluster["daemonsets"].append({
+            "metadata": _metadata(app, "monitoring", uid, labels),
+            "spec": {**_workload_spec(labels), "updateStrategy": {"type": "RollingUpdate"}},
+            "status": {"desiredNumberScheduled": len(nodes), "currentNumberScheduled": len(nodes),
+                       "numberReady": len(nodes), "updatedNumberScheduled": len(nodes),
+                       "numberAvailable": len(nodes), "numberMisscheduled": 0},
+        })
+        for node_index, node in enumerate(nodes):
+            pod_uid, _ = next_pod_uid()
+            cluster["pods"].append(_pod(f"{app}-{node_index:05x}", "monitoring", pod_uid, labels,
+                                        ("DaemonSet", app, uid), node))
+    return cluster
+
+
+def _field(obj: dict, path: str):
+    """Valeur d'un champ sous sa forme texte de field selector (status.replicas=0, spec.unschedulable=true)."""
+    for part in path.split("."):
+        obj = (obj or {}).get(part)
+    if isinstance(obj, bool):
+        return "true" if obj else "false"
+    return obj if obj is None or isinstance(obj, str) else str(obj)
+
+
+def _matches(obj: dict, label_selector: Optional[str], field_selector: Optional[str]) -> bool:
+    """Sélecteurs d'égalité (=, ==, !=) et d'existence (key, !key) sur les labels et les champs, comme l'apiserver."""
+    for selector, lookup in (
+        (label_selector, lambda key: (obj["metadata"].get("labels") or {}).get(key)),
+        (field_selector, lambda key: _field(obj, key)),
+    ):
+        for term in filter(None, (selector or "").split(",")):
+            if "=" not in term:
+                key = term.strip()
+                if (lookup(key.lstrip("!")) is None) != key.startswith("!"):
+                    return False
+            elif "!=" in term:
+                key, value = term.split("!=", 1)
+                if lookup(key.strip()) == value.strip():
+                    return False
+            else:
+                key, value = term.replace("==", "=").split("=", 1)
+                if lookup(key.strip()) != value.strip():
+                    return False
+    return True
+
+
+class RawResponse:
+    """Réponse HTTP brute renvoyée avec _preload_content=False."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def release_conn(self):
+        pass
+
+
+class ListCall:
+    """
+    Méthode de liste d'un faux client : filtre, pagine (limit/_continue) et renvoie
+    le corps JSON brut ou les modèles du client (désérialisés comme le fait ApiClient).
+    """
+
+    def __init__(self, cluster: "FakeCluster", resource: str, klass: str, namespaced: bool):
+        self.cluster = cluster
+        self.resource = resource
+        self.klass = klass
+        self.namespaced = namespaced
+        self.calls = 0
+
+    def __call__(self, namespace=None, limit=None, _continue=None, label_selector=None, field_selector=None,
+                 _preload_content=True, **kwargs):
+        self.calls += 1
+        items = [
+            item for item in self.cluster.objects[self.resource]
+            if (not self.namespaced or item["metadata"].get("namespace") == namespace)
+            and _matches(item, label_selector, field_selector)
+        ]
+        start = int(_continue or 0)
+        end = start + limit if limit else len(items)
+        metadata = {"continue": str(end)} if end < len(items) else {}
+        body = dumps({"kind": self.klass[2:], "apiVersion": "v1", "metadata": metadata, "items": items[start:end]})
+        if not _preload_content:
+            return RawResponse(body)
+        return self.cluster.api_client._ApiClient__deserialize(loads(body), self.klass)
+
+
+class FakeCluster:
+    """
+    Sert un cluster synthétique via de faux apps_v1 et core_v1.
+
+    Attributes:
+        objects: Objets JSON par ressource (voir make_cluster)
+        apps_v1: Faux AppsV1Api (listes de deployments, replicasets, statefulsets, daemonsets)
+        core_v1: Faux CoreV1Api (listes de pods, nodes, namespaces)
+    """
+
+    def __init__(self, spec: ClusterSpec):
+        self.spec = spec
+        self.objects = make_cluster(spec)
+        self.api_client = ApiClient()
+        self.apps_v1 = _FakeApi()
+        self.core_v1 = _FakeApi()
+        for api, kind, resource, klass in (
+            (self.apps_v1, "deployment", "deployments", "V1DeploymentList"),
+            (self.apps_v1, "replica_set", "replicasets", "V1ReplicaSetList"),
+            (self.apps_v1, "stateful_set", "statefulsets", "V1StatefulSetList"),
+            (self.apps_v1, "daemon_set", "daemonsets", "V1DaemonSetList"),
+            (self.core_v1, "pod", "pods", "V1PodList"),
+        ):
+            setattr(api, f"list_{kind}_for_all_namespaces", ListCall(self, resource, klass, namespaced=False))
+            setattr(api, f"list_namespaced_{kind}", ListCall(self, resource, klass, namespaced=True))
+        self.core_v1.list_node = ListCall(self, "nodes", "V1NodeList", namespaced=False)
+        self.core_v1.list_namespace = ListCall(self, "namespaces", "V1NamespaceList", namespaced=False)
+
+    def summary(self) -> str:
+        return ", ".join(f"{len(items)} {resource}" for resource, items in self.objects.items())
+
+
+class _FakeApi:
+    """Conteneur des méthodes de liste d'un faux client."""
@@ -1,20 +1,35 @@
-from datetime import datetime, timezone
-from typing import Any, Dict
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
 
 from cron_validator import CronValidator
 from icecream import ic  # noqa: F401
 from loguru import logger
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event, inspect
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlmodel import select, text
 
-from core.models import WorkloadSchedule
+from core.models import WorkloadSchedule, WorkloadStartup
 from utils.clean_cron import clean_cron_expression
+from utils.metrics import DB_QUERY_SECONDS
+from utils.tracing import tracer
 
 Base = declarative_base()
 DATABASE_URL = "sqlite+aiosqlite:///data/schedule.db"
 
 
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Percentile par la méthode du rang le plus proche (nearest-rank)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
 class DatabaseManager:
     def __init__(self, database_url: str = ""):
         """🗄️ Initialise la connexion à la base de données"""
@@ -23,6 +38,36 @@ class DatabaseManager:
         self.async_session = async_sessionmaker(
             self.engine, class_=AsyncSession, expire_on_commit=False
         )
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(self.engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(self.engine.sync_engine, "handle_error", self._handle_error)
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+        span = tracer.start_span(
+            f"db {verb}", kind=SpanKind.CLIENT, attributes={"db.system": "sqlite", "db.statement": statement}
+        )
+        conn.info.setdefault("query_start", []).append((verb, time.perf_counter(), span))
+
+    @staticmethod
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        """Latence et span de chaque requête SQL, par type d'instruction (SELECT, INSERT...)"""
+        verb, start, span = conn.info["query_start"].pop()
+        DB_QUERY_SECONDS.labels(statement=verb).observe(time.perf_counter() - start)
+        span.end()
+
+    @staticmethod
+    def _handle_error(exception_context):
+        """Termine la mesure d'une requête en erreur (after_cursor_execute n'est pas appelé)"""
+        conn = exception_context.connection
+        pending = conn.info.get("query_start") if conn is not None else None
+        if not pending:
+            return
+        verb, start, span = pending.pop()
+        DB_QUERY_SECONDS.labels(statement=verb).observe(time.perf_counter() - start)
+        span.set_status(Status(StatusCode.ERROR, str(exception_context.original_exception)))
+        span.end()
 
     async def create_table(self):
         """Crée les tables de manière asynchrone"""
@@ -31,9 +76,35 @@ class DatabaseManager:
         async with self.engine.begin() as conn:
             # Utilise run_sync pour exécuter le code synchrone dans un contexte asynchrone
             await conn.run_sync(WorkloadSchedule.metadata.create_all)
+            await conn.run_sync(self._add_missing_columns)
 
         logger.success("All tables created")
 
+    @staticmethod
+    def _add_missing_columns(sync_conn):
+        """
+        Ajoute aux tables existantes les colonnes nullables ou avec défaut
+        apparues dans les modèles (create_all ne modifie pas les tables existantes).
+        """
+        inspector = inspect(sync_conn)
+        for table in WorkloadSchedule.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=sync_conn.dialect)
+                default = ""
+                if column.default is not None and column.default.is_scalar:
+                    value = column.default.arg
+                    value = getattr(value, "value", value)
+                    if isinstance(value, bool):
+                        value = int(value)
+                    elif isinstance(value, str):
+                        value = "'" + value.replace("'", "''") + "'"
+                    default = f" DEFAULT {value}"
+                logger.info(f"Adding column {table.name}.{column.name}")
+                sync_conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}{default}"))
+
     async def check_table_exists(self):
         async with self.engine.connect() as conn:
             result = await conn.execute(
@@ -144,13 +215,17 @@ class DatabaseManager:
                 raise e
 
     async def update_schedule(self, schedule_id: int, updated_schedule: WorkloadSchedule):
+        """
+        Met à jour une programmation avec les seuls champs renseignés de updated_schedule
+        (model_fields_set) : les champs absents (lead_time, cible de groupe...) sont conservés.
+        """
         async with self.async_session() as session:
             schedule = await session.get(WorkloadSchedule, schedule_id)
             if not schedule:
                 logger.error(f"Schedule with ID {schedule_id} not found") # TODO Gérer l'erreur coté front
                 return False
 
-            schedule_data = updated_schedule.model_dump(exclude={"id"})
+            schedule_data = updated_schedule.model_dump(exclude={"id"}, exclude_unset=True)
 
             if "last_update" in schedule_data:
                 if isinstance(schedule_data["last_update"], str):
@@ -191,4 +266,64 @@ class DatabaseManager:
             await session.delete(schedule)
             await session.commit()
             logger.info(f"Schedule {schedule_id} deleted successfully")
-            return True
\ No newline at end of file
+            return True
+
+    async def store_startup_metric(self, metric: WorkloadStartup):
+        """⏱️ Enregistre le temps de démarrage d'un workload"""
+        async with self.async_session() as session:
+            try:
+                session.add(metric)
+                await session.commit()
+                logger.success(f"✅ Temps de démarrage stocké pour {metric.name}: {metric.duration_seconds}s")
+                return metric
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"❌ Erreur lors du stockage: {e}")
+                raise
+
+    async def get_startup_metrics(self, uid: str, limit: int = 50):
+        """📋 Récupère les derniers temps de démarrage d'un workload"""
+        async with self.async_session() as session:
+            statement = (
+                select(WorkloadStartup)
+                .where(WorkloadStartup.uid == uid)
+                .order_by(WorkloadStartup.started_at.desc())
+                .limit(limit)
+            )
+            results = await session.execute(statement)
+            return results.scalars().all()
+
+    async def get_startup_summary(self, samples: int = 20, days: int = 30) -> Dict[str, Dict[str, Any]]:
+        """
+        📊 Résume les temps de démarrage récents par workload (p50/p95 glissants).
+
+        Args:
+            samples: Nombre de mesures les plus récentes prises en compte par workload
+            days: Ancienneté maximale des mesures
+        """
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        async with self.async_session() as session:
+            statement = (
+                select(WorkloadStartup.uid, WorkloadStartup.duration_seconds)
+                .where(WorkloadStartup.timed_out == False)  # noqa: E712
+                .where(WorkloadStartup.duration_seconds.is_not(None))
+                .where(WorkloadStartup.started_at >= since)
+                .order_by(WorkloadStartup.started_at.desc())
+            )
+            results = await session.execute(statement)
+
+            durations: Dict[str, List[float]] = {}
+            for uid, duration in results.all():
+                bucket = durations.setdefault(uid, [])
+                if len(bucket) < samples:
+                    bucket.append(duration)
+
+        return {
+            uid: {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+            }
+            for uid, values in durations.items()
+        }
+
@@ -0,0 +1,91 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from utils.fastjson import dumps
+
+# Les maps de labels et de ressources se répètent d'un pod à l'autre (tous les pods
+# d'un workload ont les mêmes) : elles sont internées pour être partagées entre records.
+# Les maps partagées ne doivent pas être modifiées.
+MAX_INTERNED_MAPPINGS = 50_000
+_interned_mappings: Dict[tuple, Dict[str, str]] = {}
+
+
+def intern_mapping(mapping: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+    """
+    Renvoie une map partagée égale à mapping (clés et valeurs internées).
+
+    Args:
+        mapping: Labels, requests ou limits d'un objet Kubernetes
+    Returns:
+        La map partagée, ou mapping tel quel s'il est None ou vide
+    """
+    if not mapping:
+        return mapping
+    key = tuple(sorted(mapping.items()))
+    shared = _interned_mappings.get(key)
+    if shared is None:
+        if len(_interned_mappings) >= MAX_INTERNED_MAPPINGS:
+            _interned_mappings.clear()
+        shared = {sys.intern(str(k)): sys.intern(str(v)) for k, v in key}
+        _interned_mappings[key] = shared
+    return shared
+
+
+@dataclass(slots=True)
+class PodRecord:
+    """Informations d'un pod affichées dans l'inventaire."""
+    name: str
+    node: Optional[str]
+    status: Optional[str]
+    has_pvc: bool
+    resource_requests: Dict[str, str]
+    resource_limits: Dict[str, str]
+    # DaemonSet uniquement
+    start_time: Optional[str] = None
+    node_conditions: Optional[str] = None
+    # Deployment uniquement
+    uid: Optional[str] = None
+    replicaset: Optional[str] = None
+
+
+@dataclass(slots=True)
+class WorkloadRecord:
+    """Deployment ou StatefulSet de l'inventaire."""
+    namespace: str
+    name: str
+    uid: str
+    replicas: Optional[int]
+    available_replicas: Optional[int]
+    ready_replicas: Optional[int]
+    labels: Optional[Dict[str, str]]
+    pods: List[PodRecord] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class DaemonSetStatus:
+    """Statut d'un DaemonSet."""
+    desired_number_scheduled: Optional[int]
+    current_number_scheduled: Optional[int]
+    number_ready: Optional[int]
+    updated_number_scheduled: Optional[int]
+    number_available: Optional[int]
+    number_misscheduled: Optional[int]
+
+
+@dataclass(slots=True)
+class DaemonSetRecord:
+    """DaemonSet de l'inventaire."""
+    namespace: str
+    name: str
+    uid: str
+    labels: Optional[Dict[str, str]]
+    status: DaemonSetStatus
+    pods: List[PodRecord]
+    update_strategy: Optional[str]
+    selector: Optional[Dict[str, str]]
+
+
+def dumps_records(records) -> bytes:
+    """Sérialise des records (et les structures qui les contiennent) directement en JSON."""
+    return dumps(records)
@@ -0,0 +1,458 @@
+"""
+Cache d'inventaire alimenté par des watches, avec instantané sur disque.
+
+Chaque ressource de l'inventaire (Deployments, StatefulSets, DaemonSets,
+ReplicaSets, pods) est suivie par un réflecteur : une liste paginée en JSON
+brut, puis un watch repris depuis le dernier resourceVersion. Seuls les champs
+utiles aux records sont gardés (voir _compact) et les records sont construits
+par les mêmes builders que LEAN_LISTING, recalculés seulement quand le cache a
+changé.
+
+L'état (objets compacts et resourceVersion de chaque réflecteur) est écrit
+périodiquement en JSON dans INVENTORY_SNAPSHOT_PATH. Au redémarrage, l'instantané
+est relu et servi immédiatement (marqué stale jusqu'au premier événement ou
+bookmark de chaque watch), pendant que les watches reprennent depuis les
+resourceVersions stockés au lieu de tout relister ; si l'apiserver a compacté
+son historique (410 Gone), le réflecteur reliste.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from kubernetes.client.rest import ApiException
+from kubernetes.watch.watch import iter_resp_lines
+from loguru import logger
+
+from core.inventory import intern_mapping
+from core.kub_list import (
+    build_label_selector,
+    build_lean_daemonsets,
+    build_lean_deployments,
+    build_lean_sts,
+    build_namespace_field_selector,
+)
+from utils.config import list_page_size
+from utils.fastjson import dumps, loads
+
+SNAPSHOT_MAGIC = b"WSINV2\n"
+WATCH_RETRY_MIN = 1.0
+WATCH_RETRY_MAX = 30.0
+
+# ressource: (client, liste cluster-wide, liste par namespace, filtrée par labels protégés)
+RESOURCES = {
+    "deployments": ("apps_v1", "list_deployment_for_all_namespaces", "list_namespaced_deployment", True),
+    "statefulsets": ("apps_v1", "list_stateful_set_for_all_namespaces", "list_namespaced_stateful_set", True),
+    "daemonsets": ("apps_v1", "list_daemon_set_for_all_namespaces", "list_namespaced_daemon_set", True),
+    "replicasets": ("apps_v1", "list_replica_set_for_all_namespaces", "list_namespaced_replica_set", False),
+    "pods": ("core_v1", "list_pod_for_all_namespaces", "list_namespaced_pod", False),
+}
+
+# Champs de spec/status lus par les builders lean, par ressource
+_SPEC_FIELDS = {"daemonsets": ("updateStrategy", "selector")}
+_STATUS_FIELDS = {
+    "deployments": ("replicas", "availableReplicas", "readyReplicas"),
+    "statefulsets": ("replicas", "availableReplicas", "readyReplicas"),
+    "daemonsets": ("desiredNumberScheduled", "currentNumberScheduled", "numberReady",
+                   "updatedNumberScheduled", "numberAvailable", "numberMisscheduled"),
+    "pods": ("phase", "startTime"),
+}
+
+
+def _intern_resources(resources: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    resources = resources or {}
+    return {key: intern_mapping(resources[key]) for key in ("requests", "limits") if resources.get(key)}
+
+
+def _compact(resource: str, obj: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Réduit un objet brut aux champs utilisés par les builders d'inventaire.
+    Labels et ressources sont internés : une seule copie en mémoire par valeur.
+    """
+    metadata = obj.get("metadata") or {}
+    compact: Dict[str, Any] = {"metadata": {
+        "name": metadata.get("name"),
+        "namespace": metadata.get("namespace"),
+        "uid": metadata.get("uid"),
+        "labels": intern_mapping(metadata.get("labels")),
+        "creationTimestamp": metadata.get("creationTimestamp"),
+        "ownerReferences": [
+            {"kind": owner.get("kind"), "name": owner.get("name"), "uid": owner.get("uid")}
+            for owner in metadata.get("ownerReferences") or []
+        ],
+    }}
+    spec = obj.get("spec") or {}
+    if resource == "pods":
+        containers = spec.get("containers") or []
+        compact["spec"] = {
+            "nodeName": spec.get("nodeName"),
+            "containers": [{"resources": _intern_resources(containers[0].get("resources"))}] if containers else [],
+            "volumes": [{"persistentVolumeClaim": True} for volume in spec.get("volumes") or []
+                        if volume.get("persistentVolumeClaim")],
+        }
+    else:
+        compact["spec"] = {key: spec[key] for key in _SPEC_FIELDS.get(resource, ()) if key in spec}
+    status = obj.get("status") or {}
+    compact["status"] = {key: status[key] for key in _STATUS_FIELDS.get(resource, ()) if key in status}
+    return compact
+
+
+def _reintern(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Rétablit le partage des labels et ressources d'un objet compact relu depuis l'instantané."""
+    metadata = obj["metadata"]
+    metadata["labels"] = intern_mapping(metadata.get("labels"))
+    for container in (obj.get("spec") or {}).get("containers") or []:
+        container["resources"] = _intern_resources(container.get("resources"))
+    return obj
+
+
+class _Reflector:
+    """
+    Liste puis watch d'une ressource (cluster-wide ou d'un namespace), dans
+    un thread dédié. objects (UID -> objet compact) est remplacé ou modifié
+    sous le verrou du cache.
+    """
+
+    def __init__(self, cache: "InventoryCache", key: str, resource: str, list_fn, namespace: Optional[str],
+                 selectors: Dict[str, str]):
+        self.cache = cache
+        self.key = key
+        self.resource = resource
+        self.list_fn = list_fn
+        self.args = (namespace,) if namespace else ()
+        self.selectors = selectors
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        self.resource_version: Optional[str] = None
+        self.synced = False
+        self.relists = 0
+        self._response = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"inventory-{self.key}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Interrompt le watch en cours : shutdown() débloque la lecture depuis un autre thread."""
+        response = self._response
+        if response is not None:
+            try:
+                response.shutdown()
+            except Exception:
+                pass
+
+    def join(self, timeout: Optional[float] = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        delay = WATCH_RETRY_MIN
+        while not self.cache._stopped.is_set():
+            try:
+                if self.resource_version is None:
+                    self._relist()
+                self._watch()
+                delay = WATCH_RETRY_MIN
+            except ApiException as e:
+                if e.status == 410:
+                    logger.info(f"Inventory watch {self.key} expired (410 Gone), relisting")
+                    self.resource_version = None
+                    continue
+                logger.warning(f"Inventory watch {self.key} failed ({e.status}), retrying in {delay:.0f}s")
+            except Exception as e:
+                if self.cache._stopped.is_set():
+                    return
+                logger.warning(f"Inventory watch {self.key} failed, retrying in {delay:.0f}s: {e}")
+            self.cache._stopped.wait(delay)
+            delay = min(delay * 2, WATCH_RETRY_MAX)
+
+    def _relist(self):
+        """Liste complète (paginée, même instantané) qui remplace l'état du réflecteur."""
+        objects: Dict[str, Dict[str, Any]] = {}
+        token, resource_version = None, None
+        while True:
+            response = self.list_fn(*self.args, limit=list_page_size, _continue=token,
+                                    _preload_content=False, **self.selectors)
+            try:
+                body = loads(response.data)
+            finally:
+                response.release_conn()
+            metadata = body.get("metadata") or {}
+            resource_version = resource_version or metadata.get("resourceVersion")
+            for item in body.get("items") or []:
+                objects[item["metadata"]["uid"]] = _compact(self.resource, item)
+            token = metadata.get("continue")
+            if not token:
+                break
+        with self.cache._lock:
+            self.objects = objects
+            self.resource_version = resource_version
+            self.relists += 1
+            self.cache._changed()
+        self.synced = True
+        logger.info(f"Inventory {self.key}: listed {len(objects)} objects at resourceVersion {resource_version}")
+
+    def _watch(self):
+        """Watch depuis resource_version jusqu'à son expiration (timeout_seconds)."""
+        response = self.list_fn(
+            *self.args, watch=True, resource_version=self.resource_version, allow_watch_bookmarks=True,
+            timeout_seconds=self.cache.watch_timeout, _request_timeout=self.cache.watch_timeout + 30,
+            _preload_content=False, **self.selectors,
+        )
+        self._response = response
+        try:
+            for line in iter_resp_lines(response):
+                if not line or line.isspace():
+                    continue
+                event = loads(line)
+                kind, obj = event.get("type"), event.get("object") or {}
+                if kind == "ERROR":
+                    raise ApiException(status=obj.get("code"), reason=obj.get("message"))
+                resource_version = (obj.get("metadata") or {}).get("resourceVersion")
+                with self.cache._lock:
+                    if kind in ("ADDED", "MODIFIED"):
+                        self.objects[obj["metadata"]["uid"]] = _compact(self.resource, obj)
+                    elif kind == "DELETED":
+                        self.objects.pop(obj["metadata"]["uid"], None)
+                    if resource_version:
+                        self.resource_version = resource_version
+                    self.cache._changed(bookmark=kind == "BOOKMARK")
+                # Premier événement ou bookmark : l'apiserver a rejoué ce qui a été manqué depuis l'instantané
+                self.synced = True
+        finally:
+            self._response = None
+            response.close()
+            response.release_conn()
+
+
+class InventoryCache:
+    """
+    Inventaire servi depuis des watches, avec reprise à chaud depuis un
+    instantané disque.
+
+    Attributes:
+        snapshot_path: Fichier de l'instantané (vide = pas de persistance)
+        snapshot_interval: Intervalle d'écriture de l'instantané quand le cache a changé (secondes)
+        watch_timeout: Durée d'un watch avant reconnexion (secondes)
+        loaded_from_snapshot: Vrai si l'état initial vient de l'instantané
+    """
+
+    def __init__(self, apps_v1, core_v1, protected_namespaces, protected_labels, allowed_namespaces=None,
+                 snapshot_path: str = "", snapshot_interval: float = 60, watch_timeout: int = 300,
+                 namespaced_threshold: int = 5):
+        self.clients = {"apps_v1": apps_v1, "core_v1": core_v1}
+        self.protected_namespaces = list(protected_namespaces)
+        self.protected_labels = dict(protected_labels or {})
+        self.allowed_namespaces = list(allowed_namespaces or [])
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.watch_timeout = watch_timeout
+        self.namespaced_threshold = namespaced_threshold
+        self.loaded_from_snapshot = False
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._available = threading.Event()
+        self._saved_generation = 0
+        self._built: Dict[str, tuple] = {}
+        self._reflectors: Dict[str, List[_Reflector]] = {}
+        self._persister: Optional[threading.Thread] = None
+
+    # --- Cycle de vie
+
+    def _fingerprint(self) -> Dict[str, Any]:
+        """Les filtres de l'inventaire : un instantané pris avec d'autres filtres est ignoré."""
+        return {
+            "protected_namespaces": sorted(self.protected_namespaces),
+            "protected_labels": self.protected_labels,
+            "allowed_namespaces": sorted(self.allowed_namespaces),
+        }
+
+    def _build_reflectors(self):
+        namespaced = self.allowed_namespaces and len(self.allowed_namespaces) <= self.namespaced_threshold
+        for resource, (client_name, list_all, list_namespaced, by_labels) in RESOURCES.items():
+            client = self.clients[client_name]
+            selectors = {}
+            label_selector = build_label_selector(self.protected_labels) if by_labels else ""
+            if label_selector:
+                selectors["label_selector"] = label_selector
+            if namespaced:
+                self._reflectors[resource] = [
+                    _Reflector(self, f"{resource}/{ns}", resource, getattr(client, list_namespaced), ns, selectors)
+                    for ns in self.allowed_namespaces if ns not in self.protected_namespaces
+                ]
+            else:
+                field_selector = build_namespace_field_selector(self.protected_namespaces)
+                if field_selector:
+                    selectors["field_selector"] = field_selector
+                self._reflectors[resource] = [
+                    _Reflector(self, resource, resource, getattr(client, list_all), None, selectors)
+                ]
+
+    def start(self):
+        """Charge l'instantané (s'il existe) puis lance les réflecteurs et la persistance. Idempotent."""
+        with self._lock:
+            if self._reflectors:
+                return
+            self._build_reflectors()
+        self.load_snapshot()
+        for reflector in self._iter_reflectors():
+            reflector.start()
+        if self.snapshot_path and self.snapshot_interval > 0:
+            self._persister = threading.Thread(target=self._persist_loop, name="inventory-snapshot", daemon=True)
+            self._persister.start()
+
+    def stop(self, timeout: float = 5):
+        """Arrête les watches et écrit un dernier instantané."""
+        self._stopped.set()
+        for reflector in self._iter_reflectors():
+            reflector.stop()
+        for reflector in self._iter_reflectors():
+            reflector.join(timeout)
+        if self._persister is not None:
+            self._persister.join(timeout)
+        if self.snapshot_path:
+            self.save_snapshot()
+
+    def _iter_reflectors(self) -> Iterator[_Reflector]:
+        for reflectors in self._reflectors.values():
+            yield from reflectors
+
+    def _changed(self, bookmark: bool = False):
+        """Appelé sous verrou après une modification (ou un simple bookmark) d'un réflecteur."""
+        if not bookmark:
+            self.generation += 1
+            self._built.clear()
+        if all(reflector.resource_version is not None for reflector in self._iter_reflectors()):
+            self._available.set()
+
+    @property
+    def available(self) -> bool:
+        """Vrai dès qu'un état complet est servable (instantané chargé ou première liste faite)."""
+        return self._available.is_set()
+
+    @property
+    def stale(self) -> bool:
+        """Vrai tant qu'une partie de l'état vient de l'instantané sans watch repris."""
+        return not all(reflector.synced for reflector in self._iter_reflectors())
+
+    def wait_available(self, timeout: Optional[float] = None) -> bool:
+        return self._available.wait(timeout)
+
+    # --- Instantané
+
+    def save_snapshot(self) -> bool:
+        """Écrit l'état des réflecteurs (écriture atomique via fichier temporaire)."""
+        with self._lock:
+            if not self.available or (self.generation == self._saved_generation and os.path.exists(self.snapshot_path)):
+                return False
+            generation = self.generation
+            state = {
+                reflector.key: {"resource_version": reflector.resource_version, "objects": dict(reflector.objects)}
+                for reflector in self._iter_reflectors()
+            }
+        payload = {"saved_at": time.time(), "fingerprint": self._fingerprint(), "reflectors": state}
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.snapshot_path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(dumps(payload))
+        os.replace(temporary, self.snapshot_path)
+        self._saved_generation = generation
+        logger.debug(f"Inventory snapshot written to {self.snapshot_path} (generation {generation})")
+        return True
+
+    def load_snapshot(self) -> bool:
+        """
+        Recharge l'état depuis l'instantané ; les réflecteurs repartent alors
+        de leur resourceVersion au lieu de relister. L'instantané est du JSON
+        (jamais de pickle : le volume data/ est modifiable).
+        """
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                data = f.read()
+            if not data.startswith(SNAPSHOT_MAGIC):
+                raise ValueError("unknown snapshot format")
+            payload = loads(memoryview(data)[len(SNAPSHOT_MAGIC):])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable inventory snapshot {self.snapshot_path}: {e}")
+            return False
+        if payload.get("fingerprint") != self._fingerprint():
+            logger.info("Ignoring inventory snapshot taken with other namespace/label filters")
+            return False
+        state = payload.get("reflectors") or {}
+        reflectors = list(self._iter_reflectors())
+        if any(reflector.key not in state for reflector in reflectors):
+            return False
+        with self._lock:
+            for reflector in reflectors:
+                reflector.objects = {uid: _reintern(obj) for uid, obj in state[reflector.key]["objects"].items()}
+                reflector.resource_version = state[reflector.key]["resource_version"]
+            self._changed()
+            self._saved_generation = self.generation
+        self.loaded_from_snapshot = True
+        age = time.time() - payload.get("saved_at", time.time())
+        logger.info(f"Inventory snapshot loaded from {self.snapshot_path} ({age:.0f}s old), resuming watches")
+        return True
+
+    def _persist_loop(self):
+        while not self._stopped.wait(self.snapshot_interval):
+            try:
+                self.save_snapshot()
+            except Exception as e:
+                logger.error(f"Error writing inventory snapshot: {e}")
+
+    # --- Records
+
+    def _objects(self, resource: str) -> List[Dict[str, Any]]:
+        objects = []
+        for reflector in self._reflectors.get(resource, []):
+            objects.extend(reflector.objects.values())
+        if self.allowed_namespaces:
+            objects = [obj for obj in objects if obj["metadata"].get("namespace") in self.allowed_namespaces]
+        return objects
+
+    def _records(self, kind: str, resources: tuple, build):
+        """
+        Records mémorisés jusqu'au prochain changement. Seule la copie des listes
+        d'objets se fait sous verrou (les objets compacts sont remplacés, jamais
+        modifiés) : la construction ne bloque pas les réflecteurs.
+        """
+        with self._lock:
+            built = self._built.get(kind)
+            if built is not None:
+                return built
+            generation = self.generation
+            objects = [self._objects(resource) for resource in resources]
+        records = build(*objects, self.protected_namespaces, self.protected_labels)
+        with self._lock:
+            if self.generation == generation:
+                self._built[kind] = records
+        return records
+
+    def deployments(self):
+        return self._records("deploy", ("deployments", "replicasets", "pods"), build_lean_deployments)
+
+    def statefulsets(self):
+        return self._records("sts", ("statefulsets", "pods"), build_lean_sts)
+
+    def daemonsets(self):
+        return self._records("ds", ("daemonsets", "pods"), build_lean_daemonsets)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "available": self.available,
+                "stale": self.stale,
+                "loaded_from_snapshot": self.loaded_from_snapshot,
+                "generation": self.generation,
+                "reflectors": {
+                    reflector.key: {"objects": len(reflector.objects), "resource_version": reflector.resource_version,
+                                    "synced": reflector.synced, "relists": reflector.relists}
+                    for reflector in self._iter_reflectors()
+                },
+            }
@@ -0,0 +1,117 @@
+"""
+Jobs d'arrière-plan de l'API (opérations trop longues pour une requête HTTP).
+
+Un job exécute une fonction bloquante dans un thread, ou une coroutine dans
+l'event loop, et publie sa progression dans un dict mis à jour au fil de l'eau ; il est suivi par son identifiant
+(GET /jobs/{job_id}). Un seul job d'un même type tourne à la fois : une
+nouvelle demande renvoie le job en cours. Les derniers jobs terminés sont
+conservés en mémoire, par processus.
+"""
+import asyncio
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+MAX_JOBS = 100
+
+
+@dataclass
+class Job:
+    """Job d'arrière-plan et son état."""
+    id: str
+    kind: str
+    trigger: str
+    status: str = "pending"
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    progress: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("success", "error")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "trigger": self.trigger,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "progress": dict(self.progress),
+            "error": self.error,
+        }
+
+
+class JobRegistry:
+    """Registre des jobs, borné aux max_jobs plus récents."""
+
+    def __init__(self, max_jobs: int = MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def running(self, kind: str) -> Optional[Job]:
+        return next((job for job in self._jobs.values() if job.kind == kind and not job.done), None)
+
+    def submit(self, kind: str, func: Callable[[Dict[str, Any]], Any], trigger: str = "api") -> Job:
+        """
+        Lance func(progress), sauf si un job du même type tourne déjà. Une fonction
+        async (ou un functools.partial d'une fonction async) tourne dans l'event loop,
+        une fonction bloquante dans un thread.
+
+        Returns:
+            Le nouveau job, ou celui déjà en cours
+        """
+        job = self.running(kind)
+        if job is not None:
+            return job
+        job = Job(id=uuid.uuid4().hex, kind=kind, trigger=trigger)
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_jobs:
+            oldest = next((job_id for job_id, old in self._jobs.items() if old.done), None)
+            if oldest is None:
+                break
+            del self._jobs[oldest]
+        self._tasks[job.id] = asyncio.create_task(self._run(job, func), name=f"job:{kind}:{job.id}")
+        return job
+
+    async def _run(self, job: Job, func: Callable[[Dict[str, Any]], Any]):
+        job.status = "running"
+        job.started_at = datetime.now(timezone.utc)
+        logger.info(f"Job {job.kind} {job.id} started ({job.trigger})")
+        try:
+            if asyncio.iscoroutinefunction(func):
+                await func(job.progress)
+            else:
+                await asyncio.to_thread(func, job.progress)
+            job.status = "success"
+        except Exception as e:
+            job.status = "error"
+            job.error = str(e)
+            logger.error(f"Job {job.kind} {job.id} failed: {e}")
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            self._tasks.pop(job.id, None)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        return list(reversed(self._jobs.values()))
+
+    async def wait(self, job: Job, timeout: Optional[float] = None) -> Job:
+        task = self._tasks.get(job.id)
+        if task is not None:
+            await asyncio.wait({task}, timeout=timeout)
+        return job
+
+
+job_registry = JobRegistry()
@@ -1,6 +1,171 @@
 from kubernetes.client.rest import ApiException
 from loguru import logger
 
+from core.inventory import (
+    DaemonSetRecord,
+    DaemonSetStatus,
+    PodRecord,
+    WorkloadRecord,
+    intern_mapping,
+)
+from utils.config import lean_listing, list_page_size, namespaced_list_threshold
+from utils.fastjson import loads
+from utils.metrics import timed_inventory
+from utils.tracing import traced
+
+# Nombre de redémarrages d'une liste après expiration du jeton continue (410 Gone)
+MAX_LIST_RESTARTS = 3
+
+
+def _fetch_raw_page(list_fn, *args, **kwargs):
+    """
+    Récupère une page en JSON brut (_preload_content=False), sans passer par
+    la désérialisation des modèles OpenAPI du client.
+
+    Returns:
+        (items, continue_token) où items est une liste de dicts
+    """
+    response = list_fn(*args, _preload_content=False, **kwargs)
+    try:
+        body = loads(response.data)
+    finally:
+        response.release_conn()
+    return body.get("items") or [], (body.get("metadata") or {}).get("continue")
+
+def iter_list(list_fn, *args, limit=None, raw=False, **kwargs):
+    """
+    Parcourt une liste Kubernetes page par page (limit/_continue).
+
+    Seule la page courante est gardée en mémoire. Si le jeton continue expire
+    (410 Gone), la liste est reprise depuis le début en ignorant les objets
+    déjà renvoyés.
+
+    Args:
+        list_fn: Méthode de liste du client (ex. core_v1.list_pod_for_all_namespaces)
+        *args: Arguments positionnels (ex. namespace)
+        limit: Taille de page (par défaut LIST_PAGE_SIZE)
+        raw: Renvoie les objets en dicts JSON bruts au lieu des modèles du client
+        **kwargs: Paramètres de la liste (label_selector, field_selector...)
+    Yields:
+        Les objets, page par page
+    """
+    limit = limit or list_page_size
+    token = None
+    seen = set()
+    restarts = 0
+    while True:
+        try:
+            if raw:
+                items, token = _fetch_raw_page(list_fn, *args, limit=limit, _continue=token, **kwargs)
+            else:
+                page = list_fn(*args, limit=limit, _continue=token, **kwargs)
+                items, token = page.items, getattr(page.metadata, "_continue", None)
+        except ApiException as e:
+            if e.status == 410 and token and restarts < MAX_LIST_RESTARTS:
+                restarts += 1
+                logger.warning(f"Continue token expired while listing, restarting ({restarts}/{MAX_LIST_RESTARTS})")
+                token = None
+                continue
+            raise
+
+        for item in items:
+            uid = item["metadata"]["uid"] if raw else item.metadata.uid
+            if uid in seen:
+                continue
+            seen.add(uid)
+            yield item
+
+        if not isinstance(token, str) or not token:
+            return
+
+@traced("kube.find_by_uid")
+def find_by_uid(list_fn, uid):
+    """Cherche un objet par UID en s'arrêtant à la première page qui le contient."""
+    return next((item for item in iter_list(list_fn) if item.metadata.uid == uid), None)
+
+
+def build_label_selector(protected_labels):
+    """
+    Construit un sélecteur de labels excluant les labels protégés côté apiserver.
+
+    "key!=value" conserve aussi les objets sans ce label, comme le filtre Python.
+    """
+    return ",".join(f"{key}!={value}" for key, value in (protected_labels or {}).items())
+
+def build_namespace_field_selector(protected_namespaces):
+    """Construit un field selector excluant les namespaces protégés côté apiserver."""
+    return ",".join(f"metadata.namespace!={ns}" for ns in protected_namespaces or [])
+
+def iter_filtered(list_all, list_namespaced, protected_namespaces, protected_labels=None,
+                  allowed_namespaces=None, raw=False, **kwargs):
+    """
+    Liste des objets page par page en déléguant le filtrage à l'apiserver.
+
+    Args:
+        list_all: Méthode de liste cluster-wide (ex. apps_v1.list_deployment_for_all_namespaces)
+        list_namespaced: Méthode de liste par namespace (ex. apps_v1.list_namespaced_deployment)
+        protected_namespaces: Namespaces exclus (field selector)
+        protected_labels: Labels exclus (label selector "!="), optionnel
+        allowed_namespaces: Allow-list optionnelle ; une liste par namespace si elle est courte
+        raw: Renvoie les objets en dicts JSON bruts (voir iter_list)
+        **kwargs: Paramètres supplémentaires (ex. field_selector="spec.nodeName=node-1")
+    Yields:
+        Les objets (items)
+    """
+    label_selector = build_label_selector(protected_labels)
+    if label_selector:
+        kwargs["label_selector"] = label_selector
+
+    if allowed_namespaces and len(allowed_namespaces) <= namespaced_list_threshold:
+        for ns in allowed_namespaces:
+            if ns not in protected_namespaces:
+                yield from iter_list(list_namespaced, ns, watch=False, raw=raw, **kwargs)
+        return
+
+    field_selector = ",".join(
+        s for s in (kwargs.pop("field_selector", None), build_namespace_field_selector(protected_namespaces)) if s
+    )
+    if field_selector:
+        kwargs["field_selector"] = field_selector
+    for item in iter_list(list_all, watch=False, raw=raw, **kwargs):
+        namespace = item["metadata"].get("namespace") if raw else item.metadata.namespace
+        if not allowed_namespaces or namespace in allowed_namespaces:
+            yield item
+
+def list_filtered(*args, **kwargs):
+    """Version liste de iter_filtered, pour les appelants qui ont besoin de tous les objets."""
+    return list(iter_filtered(*args, **kwargs))
+
+def index_pods_by_owner(pods, owner_kind):
+    """
+    Indexe les détails compacts des pods par UID de leur propriétaire.
+
+    Les pods sont consommés au fil des pages : seuls les détails extraits
+    sont conservés, pas les objets V1Pod complets.
+    """
+    index = {}
+    for pod in pods:
+        for owner in pod.metadata.owner_references or []:
+            if owner.kind == owner_kind:
+                index.setdefault(owner.uid, []).append(get_pod_details(pod, owner_kind))
+                break
+    return index
+
+def index_replicasets_by_deployment(replicasets):
+    """
+    Indexe les ReplicaSets (UID, date de création) par Deployment propriétaire,
+    du plus récent au plus ancien.
+    """
+    index = {}
+    for rs in replicasets:
+        for owner in rs.metadata.owner_references or []:
+            if owner.kind == "Deployment":
+                key = (rs.metadata.namespace, owner.name)
+                index.setdefault(key, []).append((rs.metadata.creation_timestamp, rs.metadata.uid))
+                break
+    for entries in index.values():
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+    return index
 
 def get_pod_details(pod, owner_type="DaemonSet", owner_name=None, owner_uid=None):
     """
@@ -18,21 +183,21 @@ def get_pod_details(pod, owner_type="DaemonSet", owner_name=None, owner_uid=None
     requests = resources.requests if resources and resources.requests else {}
     limits = resources.limits if resources and resources.limits else {}
 
-    pod_info = {
-        "name": pod.metadata.name,
-        "node": pod.spec.node_name,
-        "status": pod.status.phase,
-        "has_pvc": has_pvc,
-        "resource_requests": requests,
-        "resource_limits": limits,
-    }
+    pod_info = PodRecord(
+        name=pod.metadata.name,
+        node=pod.spec.node_name,
+        status=pod.status.phase,
+        has_pvc=has_pvc,
+        resource_requests=intern_mapping(requests),
+        resource_limits=intern_mapping(limits),
+    )
     
     if owner_type == "DaemonSet":
-        pod_info["start_time"] = pod.status.start_time.isoformat() if pod.status.start_time else None
-        pod_info["node_conditions"] = ""
+        pod_info.start_time = pod.status.start_time.isoformat() if pod.status.start_time else None
+        pod_info.node_conditions = ""
     elif owner_type == "Deployment":
-        pod_info["uid"] = pod.metadata.uid
-        pod_info["replicaset"] = owner_name
+        pod_info.uid = pod.metadata.uid
+        pod_info.replicaset = owner_name
         
     return pod_info
 
@@ -76,38 +241,31 @@ def find_active_replicasets(replicasets, deployment_name):
     active_rs.sort(key=lambda x: x.metadata.creation_timestamp, reverse=True)
     return active_rs
 
-def find_active_replicasets_from_list(replicasets_list, deployment_name):
-    """
-    Trouve les ReplicaSets actifs pour un déploiement spécifique depuis une liste.
-    """
-    active_rs = []
-    for rs in replicasets_list:
-        if rs.metadata.owner_references:
-            for owner in rs.metadata.owner_references:
-                if owner.kind == "Deployment" and owner.name == deployment_name:
-                    active_rs.append(rs)
-                    break
-
-    active_rs.sort(key=lambda x: x.metadata.creation_timestamp, reverse=True)
-    return active_rs
-
-def list_all_daemonsets(apps_v1, core_v1, protected_namespaces, protected_labels):
+@timed_inventory("ds")
+@traced("inventory.list_all_daemonsets")
+def list_all_daemonsets(apps_v1, core_v1, protected_namespaces, protected_labels, allowed_namespaces=None, lean=None):
     """
     Returns the status of all DaemonSets in all namespaces, including pod information.
     """
     try:
         logger.info("Fetching all DaemonSets across namespaces")
-        daemonsets = apps_v1.list_daemon_set_for_all_namespaces(watch=False)
-        logger.debug(f"{len(daemonsets.items)} DaemonSets found in total")
+        if lean_listing if lean is None else lean:
+            return list_lean_daemonsets(apps_v1, core_v1, protected_namespaces, protected_labels, allowed_namespaces)
 
-        # Fetch all pods once to avoid N API calls
+        # Index pods once (page by page) to avoid N API calls
         logger.debug("Fetching all pods for DaemonSets")
-        all_pods = core_v1.list_pod_for_all_namespaces(watch=False).items
-        logger.debug(f"Fetched {len(all_pods)} pods")
+        pods_by_owner = index_pods_by_owner(iter_filtered(
+            core_v1.list_pod_for_all_namespaces, core_v1.list_namespaced_pod,
+            protected_namespaces, allowed_namespaces=allowed_namespaces,
+        ), "DaemonSet")
+        logger.debug(f"Indexed pods of {len(pods_by_owner)} DaemonSets")
 
         daemonset_list = []
 
-        for ds in daemonsets.items:
+        for ds in iter_filtered(
+            apps_v1.list_daemon_set_for_all_namespaces, apps_v1.list_namespaced_daemon_set,
+            protected_namespaces, protected_labels, allowed_namespaces,
+        ):
             should_skip = ds.metadata.labels is None or ds.metadata.namespace in protected_namespaces
             
             if not should_skip and ds.metadata.labels:
@@ -121,9 +279,7 @@ def list_all_daemonsets(apps_v1, core_v1, protected_namespaces, protected_labels
                 continue
 
             logger.debug(f"Processing DaemonSet {ds.metadata.name} in namespace {ds.metadata.namespace}")
-            # Filter pods for this DaemonSet's namespace from pre-fetched data
-            pods = [p for p in all_pods if p.metadata.namespace == ds.metadata.namespace]
-            pod_info = filter_pods_by_owner(pods, "DaemonSet", owner_name=ds.metadata.name)
+            pod_info = pods_by_owner.get(ds.metadata.uid, [])
             
             # Get DaemonSet-specific status
             status = get_daemonset_status(ds)
@@ -141,45 +297,56 @@ def list_all_daemonsets(apps_v1, core_v1, protected_namespaces, protected_labels
 
 def get_daemonset_status(ds):
     """Extrait les informations de statut d'un DaemonSet."""
-    return {
-        "desired_number_scheduled": ds.status.desired_number_scheduled,
-        "current_number_scheduled": ds.status.current_number_scheduled,
-        "number_ready": ds.status.number_ready,
-        "updated_number_scheduled": ds.status.updated_number_scheduled,
-        "number_available": ds.status.number_available if hasattr(ds.status, "number_available") else None,
-        "number_misscheduled": ds.status.number_misscheduled,
-    }
+    return DaemonSetStatus(
+        desired_number_scheduled=ds.status.desired_number_scheduled,
+        current_number_scheduled=ds.status.current_number_scheduled,
+        number_ready=ds.status.number_ready,
+        updated_number_scheduled=ds.status.updated_number_scheduled,
+        number_available=ds.status.number_available if hasattr(ds.status, "number_available") else None,
+        number_misscheduled=ds.status.number_misscheduled,
+    )
 
 def create_daemonset_info(ds, status, pod_info):
-    """Crée un dictionnaire d'information pour un DaemonSet."""
-    return {
-        "namespace": ds.metadata.namespace,
-        "name": ds.metadata.name,
-        "uid": ds.metadata.uid,
-        "labels": ds.metadata.labels,
-        "status": status,
-        "pods": pod_info,
-        "update_strategy": ds.spec.update_strategy.type if ds.spec.update_strategy else None,
-        "selector": ds.spec.selector.match_labels,
-    }
-
-def list_all_deployments(apps_v1, core_v1, protected_namespaces, protected_labels):
+    """Crée le record d'inventaire d'un DaemonSet."""
+    return DaemonSetRecord(
+        namespace=ds.metadata.namespace,
+        name=ds.metadata.name,
+        uid=ds.metadata.uid,
+        labels=intern_mapping(ds.metadata.labels),
+        status=status,
+        pods=pod_info,
+        update_strategy=ds.spec.update_strategy.type if ds.spec.update_strategy else None,
+        selector=intern_mapping(ds.spec.selector.match_labels),
+    )
+
+@timed_inventory("deploy")
+@traced("inventory.list_all_deployments")
+def list_all_deployments(apps_v1, core_v1, protected_namespaces, protected_labels, allowed_namespaces=None, lean=None):
     """
     Returns the status of all Deployments in all namespaces, including pod information.
     """
     try:
         logger.info("Fetching all Deployments across namespaces")
-        deployments = apps_v1.list_deployment_for_all_namespaces(watch=False)
-        logger.debug(f"{len(deployments.items)} deployments found")
+        if lean_listing if lean is None else lean:
+            return list_lean_deployments(apps_v1, core_v1, protected_namespaces, protected_labels, allowed_namespaces)
 
-        # Fetch all pods and ReplicaSets once to avoid N API calls
+        # Index pods and ReplicaSets once (page by page) to avoid N API calls
         logger.debug("Fetching all pods and ReplicaSets for deployments")
-        all_pods = core_v1.list_pod_for_all_namespaces(watch=False).items
-        all_replicasets = apps_v1.list_replica_set_for_all_namespaces(watch=False).items
-        logger.debug(f"Fetched {len(all_pods)} pods and {len(all_replicasets)} ReplicaSets")
+        pods_by_owner = index_pods_by_owner(iter_filtered(
+            core_v1.list_pod_for_all_namespaces, core_v1.list_namespaced_pod,
+            protected_namespaces, allowed_namespaces=allowed_namespaces,
+        ), "ReplicaSet")
+        replicasets_by_deployment = index_replicasets_by_deployment(iter_filtered(
+            apps_v1.list_replica_set_for_all_namespaces, apps_v1.list_namespaced_replica_set,
+            protected_namespaces, allowed_namespaces=allowed_namespaces,
+        ))
+        logger.debug(f"Indexed pods of {len(pods_by_owner)} ReplicaSets and ReplicaSets of {len(replicasets_by_deployment)} Deployments")
 
         deployment_list = []
-        for d in deployments.items:
+        for d in iter_filtered(
+            apps_v1.list_deployment_for_all_namespaces, apps_v1.list_namespaced_deployment,
+            protected_namespaces, protected_labels, allowed_namespaces,
+        ):
             # Skip if not matching our criteria
             # ic(d.metadata.labels)
             
@@ -197,7 +364,7 @@ def list_all_deployments(apps_v1, core_v1, protected_namespaces, protected_label
                 continue
                 
             logger.debug(f"Processing Deployment {d.metadata.name} in namespace {d.metadata.namespace}")
-            deployment_info = process_deployment(d, all_replicasets, all_pods)
+            deployment_info = process_deployment(d, replicasets_by_deployment, pods_by_owner)
             deployment_list.append(deployment_info)
         
         logger.info(f"Processed {len(deployment_list)} Deployments after filtering")
@@ -206,67 +373,62 @@ def list_all_deployments(apps_v1, core_v1, protected_namespaces, protected_label
         logger.error("Error fetching deployments: %s", e)
         return {"status": "error", "message": str(e)}
 
-def process_deployment(deployment, all_replicasets, all_pods):
+def process_deployment(deployment, replicasets_by_deployment, pods_by_owner):
     """
     Traite un déploiement pour extraire ses informations et celles de ses pods.
-    Uses pre-fetched ReplicaSets and Pods to avoid N API calls.
-    """
-    # Filter ReplicaSets for this deployment from pre-fetched data
-    match_labels = deployment.spec.selector.match_labels
-    deployment_replicasets = [
-        rs for rs in all_replicasets
-        if rs.metadata.namespace == deployment.metadata.namespace
-        and rs.metadata.labels
-        and all(rs.metadata.labels.get(k) == v for k, v in match_labels.items())
-    ]
-    logger.debug(f"Found {len(deployment_replicasets)} ReplicaSets for Deployment {deployment.metadata.name}")
-
-    active_rs = find_active_replicasets_from_list(deployment_replicasets, deployment.metadata.name)
+    Uses the ReplicaSet and pod indexes built while listing to avoid N API calls.
+    """
+    replicasets = replicasets_by_deployment.get((deployment.metadata.namespace, deployment.metadata.name), [])
+    logger.debug(f"Found {len(replicasets)} ReplicaSets for Deployment {deployment.metadata.name}")
 
-    # Filter pods for this deployment's namespace from pre-fetched data
-    pods = [p for p in all_pods if p.metadata.namespace == deployment.metadata.namespace]
-    
     pod_info = []
-    for rs in active_rs:
-        rs_pods = filter_pods_by_owner(pods, "ReplicaSet", owner_name=rs.metadata.name)
-        pod_info.extend(rs_pods)
+    for _, rs_uid in replicasets:
+        pod_info.extend(pods_by_owner.get(rs_uid, []))
     
     logger.debug(f"Deployment {deployment.metadata.name} has {len(pod_info)} pods")
     
-    return {
-        "namespace": deployment.metadata.namespace,
-        "name": deployment.metadata.name,
-        "uid": deployment.metadata.uid,
-        "replicas": deployment.status.replicas,
-        "available_replicas": deployment.status.available_replicas,
-        "ready_replicas": deployment.status.ready_replicas,
-        "labels": deployment.metadata.labels,
-        "pods": pod_info,
-    }
-
-def list_all_sts(apps_v1, core_v1, protected_namespaces, protected_labels):
+    return WorkloadRecord(
+        namespace=deployment.metadata.namespace,
+        name=deployment.metadata.name,
+        uid=deployment.metadata.uid,
+        replicas=deployment.status.replicas,
+        available_replicas=deployment.status.available_replicas,
+        ready_replicas=deployment.status.ready_replicas,
+        labels=intern_mapping(deployment.metadata.labels),
+        pods=pod_info,
+    )
+
+@timed_inventory("sts")
+@traced("inventory.list_all_sts")
+def list_all_sts(apps_v1, core_v1, protected_namespaces, protected_labels, allowed_namespaces=None, lean=None):
     """
     Returns the status of all StatefulSets in all namespaces.
     """
     try:
         logger.info("Fetching all StatefulSets across namespaces")
-        statfull_sts = apps_v1.list_stateful_set_for_all_namespaces(watch=False)
-        logger.debug(f"{len(statfull_sts.items)} StatefulSets found")
+        if lean_listing if lean is None else lean:
+            return list_lean_sts(apps_v1, core_v1, protected_namespaces, protected_labels, allowed_namespaces)
 
-        # Fetch all pods once to avoid N API calls
+        # Index pods once (page by page) to avoid N API calls
         logger.debug("Fetching all pods for StatefulSets")
-        all_pods = core_v1.list_pod_for_all_namespaces(watch=False).items
-        logger.debug(f"Fetched {len(all_pods)} pods")
+        pods_by_owner = index_pods_by_owner(iter_filtered(
+            core_v1.list_pod_for_all_namespaces, core_v1.list_namespaced_pod,
+            protected_namespaces, allowed_namespaces=allowed_namespaces,
+        ), "StatefulSet")
+        logger.debug(f"Indexed pods of {len(pods_by_owner)} StatefulSets")
 
         sts_list = []
 
-        for s in statfull_sts.items:
+        for s in iter_filtered(
+            apps_v1.list_stateful_set_for_all_namespaces, apps_v1.list_namespaced_stateful_set,
+            protected_namespaces, protected_labels, allowed_namespaces,
+        ):
             if not meets_sts_criteria(s, protected_namespaces, protected_labels):
                 logger.debug(f"Skipping StatefulSet {s.metadata.name} in namespace {s.metadata.namespace}")
                 continue
 
             logger.debug(f"Processing StatefulSet {s.metadata.name} in namespace {s.metadata.namespace}")
-            sts_info = process_statefulset(s, all_pods)
+            sts_info = process_statefulset(s, pods_by_owner)
             sts_list.append(sts_info)
 
         logger.info(f"Processed {len(sts_list)} StatefulSets after filtering")
@@ -294,24 +456,229 @@ def meets_sts_criteria(statefulset, protected_namespaces, protected_labels):
     return True
 
 
-def process_statefulset(statefulset, all_pods):
+def process_statefulset(statefulset, pods_by_owner):
     """
     Traite un StatefulSet pour extraire ses informations et celles de ses pods.
-    Uses pre-fetched pods to avoid N API calls.
+    Uses the pod index built while listing to avoid N API calls.
     """
-    # Filter pods for this StatefulSet's namespace from pre-fetched data
-    pods = [p for p in all_pods if p.metadata.namespace == statefulset.metadata.namespace]
-    pod_info = filter_pods_by_owner(pods, "StatefulSet", owner_uid=statefulset.metadata.uid)
+    pod_info = pods_by_owner.get(statefulset.metadata.uid, [])
     
     logger.debug(f"StatefulSet {statefulset.metadata.name} has {len(pod_info)} pods")
     
-    return {
-        "namespace": statefulset.metadata.namespace,
-        "name": statefulset.metadata.name,
-        "uid": statefulset.metadata.uid,
-        "replicas": statefulset.status.replicas,
-        "available_replicas": statefulset.status.available_replicas,
-        "ready_replicas": statefulset.status.ready_replicas,
-        "labels": statefulset.metadata.labels,
-        "pods": pod_info,
-    }
\ No newline at end of file
+    return WorkloadRecord(
+        namespace=statefulset.metadata.namespace,
+        name=statefulset.metadata.name,
+        uid=statefulset.metadata.uid,
+        replicas=statefulset.status.replicas,
+        available_replicas=statefulset.status.available_replicas,
+        ready_replicas=statefulset.status.ready_replicas,
+        labels=intern_mapping(statefulset.metadata.labels),
+        pods=pod_info,
+    )
+
+# Lean listing (LEAN_LISTING=true): the inventory only needs a handful of fields, so
+# objects are read as raw JSON and reduced to the same records as above, skipping the
+# OpenAPI model layer (env vars, volumes, managedFields...).
+
+def _raw_is_protected(obj, protected_namespaces, protected_labels):
+    metadata = obj["metadata"]
+    if metadata.get("namespace") in protected_namespaces:
+        return True
+    labels = metadata.get("labels") or {}
+    return any(labels.get(key) == value for key, value in protected_labels.items())
+
+def get_raw_pod_details(pod, owner_type="DaemonSet"):
+    """Équivalent de get_pod_details pour un pod en JSON brut."""
+    spec = pod.get("spec") or {}
+    status = pod.get("status") or {}
+    containers = spec.get("containers") or []
+    resources = (containers[0].get("resources") or {}) if containers else {}
+
+    pod_info = PodRecord(
+        name=pod["metadata"]["name"],
+        node=spec.get("nodeName"),
+        status=status.get("phase"),
+        has_pvc=any(volume.get("persistentVolumeClaim") for volume in spec.get("volumes") or []),
+        resource_requests=intern_mapping(resources.get("requests") or {}),
+        resource_limits=intern_mapping(resources.get("limits") or {}),
+    )
+
+    if owner_type == "DaemonSet":
+        start_time = status.get("startTime")
+        pod_info.start_time = start_time.replace("Z", "+00:00") if start_time else None
+        pod_info.node_conditions = ""
+    return pod_info
+
+def index_raw_pods_by_owner(pods, owner_kind):
+    """Équivalent de index_pods_by_owner pour des pods en JSON brut."""
+    index = {}
+    for pod in pods:
+        for owner in pod["metadata"].get("ownerReferences") or []:
+            if owner.get("kind") == owner_kind:
+                index.setdefault(owner["uid"], []).append(get_raw_pod_details(pod, owner_kind))
+                break
+    return index
+
+def index_raw_replicasets_by_deployment(replicasets):
+    """Équivalent de index_replicasets_by_deployment pour des ReplicaSets en JSON brut."""
+    index = {}
+    for rs in replicasets:
+        metadata = rs["metadata"]
+        for owner in metadata.get("ownerReferences") or []:
+            if owner.get("kind") == "Deployment":
+                key = (metadata.get("namespace"), owner["name"])
+                index.setdefault(key, []).append((metadata.get("creationTimestamp") or "", metadata["uid"]))
+                break
+    for entries in index.values():
+        # RFC 3339 timestamps sort chronologically as strings
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+    return index
+
+def index_raw_replicaset_owners(replicasets):
+    """UID de ReplicaSet -> UID du Deployment propriétaire, pour des ReplicaSets en JSON brut."""
+    index = {}
+    for rs in replicasets:
+        for owner in rs["metadata"].get("ownerReferences") or []:
+            if owner.get("kind") == "Deployment":
+                index[rs["metadata"]["uid"]] = owner["uid"]
+                break
+    return index
+
+def resolve_raw_pod_workloads(pods, replicaset_owners):
+    """
+    Workloads propriétaires de pods en JSON brut, en une passe sur les pods :
+    Pod -> ReplicaSet -> Deployment (via index_raw_replicaset_owners) et Pod -> StatefulSet.
+
+    Returns:
+        {"Deployment": {uid, ...}, "StatefulSet": {uid, ...}}
+    """
+    owners = {"Deployment": set(), "StatefulSet": set()}
+    for pod in pods:
+        for owner in pod["metadata"].get("ownerReferences") or []:
+            kind = owner.get("kind")
+            if kind == "ReplicaSet" and owner["uid"] in replicaset_owners:
+                owners["Deployment"].add(replicaset_owners[owner["uid"]])
+            elif kind == "StatefulSet":
+                owners["StatefulSet"].add(owner["uid"])
+    return owners
+
+def _raw_workload_info(obj, pod_info):
+    metadata = obj["metadata"]
+    status = obj.get("status") or {}
+    return WorkloadRecord(
+        namespace=metadata.get("namespace"),
+        name=metadata["name"],
+        uid=metadata["uid"],
+        replicas=status.get("replicas"),
+        available_replicas=status.get("availableReplicas"),
+        ready_replicas=status.get("readyReplicas"),
+        labels=intern_mapping(metadata.get("labels")),
+        pods=pod_info,
+    )
+
+def build_lean_deployments(deployments, replicasets, pods, protected_namespaces, protected_labels):
+    """Records des Deployments à partir d'objets en JSON brut (listes ou cache d'inventaire)."""
+    pods_by_owner = index_raw_pods_by_owner(pods, "ReplicaSet")
+    replicasets_by_deployment = index_raw_replicasets_by_deployment(replicasets)
+
+    deployment_list = []
+    for d in deployments:
+        if d["metadata"]["name"] == "workload-scheduler" or _raw_is_protected(d, protected_namespaces, protected_labels):
+            continue
+        key = (d["metadata"].get("namespace"), d["metadata"]["name"])
+        pod_info = []
+        for _, rs_uid in replicasets_by_deployment.get(key, []):
+            pod_info.extend(pods_by_owner.get(rs_uid, []))
+        deployment_list.append(_raw_workload_info(d, pod_info))
+    return deployment_list
+
+def build_lean_sts(statefulsets, pods, protected_namespaces, protected_labels):
+    """Records des StatefulSets à partir d'objets en JSON brut."""
+    pods_by_owner = index_raw_pods_by_owner(pods, "StatefulSet")
+    return [
+        _raw_workload_info(s, pods_by_owner.get(s["metadata"]["uid"], []))
+        for s in statefulsets
+        if not _raw_is_protected(s, protected_namespaces, protected_labels)
+    ]
+
+def build_lean_daemonsets(daemonsets, pods, protected_namespaces, protected_labels):
+    """Records des DaemonSets à partir d'objets en JSON brut."""
+    pods_by_owner = index_raw_pods_by_owner(pods, "DaemonSet")
+
+    daemonset_list = []
+    for ds in daemonsets:
+        metadata = ds["metadata"]
+        if metadata.get("labels") is None or _raw_is_protected(ds, protected_namespaces, protected_labels):
+            continue
+        spec = ds.get("spec") or {}
+        status = ds.get("status") or {}
+        daemonset_list.append(DaemonSetRecord(
+            namespace=metadata.get("namespace"),
+            name=metadata["name"],
+            uid=metadata["uid"],
+            labels=intern_mapping(metadata.get("labels")),
+            status=DaemonSetStatus(
+                desired_number_scheduled=status.get("desiredNumberScheduled"),
+                current_number_scheduled=status.get("currentNumberScheduled"),
+                number_ready=status.get("numberReady"),
+                updated_number_scheduled=status.get("updatedNumberScheduled"),
+                number_available=status.get("numberAvailable"),
+                number_misscheduled=status.get("numberMisscheduled"),
+            ),
+            pods=pods_by_owner.get(metadata["uid"], []),
+            update_strategy=(spec.get("updateStrategy") or {}).get("type"),
+            selector=intern_mapping((spec.get("selector") or {}).get("matchLabels")),
+        ))
+    return daemonset_list
+
+def list_lean_deployments(apps_v1, core_v1, protected_namespaces, protected_labels, allowed_namespaces=None):
+    """Variante JSON brut de list_all_deployments."""
+    deployment_list = build_lean_deployments(
+        iter_filtered(
+            apps_v1.list_deployment_for_all_namespaces, apps_v1.list_namespaced_deployment,
+            protected_namespaces, protected_labels, allowed_namespaces, raw=True,
+        ),
+        iter_filtered(
+            apps_v1.list_replica_set_for_all_namespaces, apps_v1.list_namespaced_replica_set,
+            protected_namespaces, allowed_namespaces=allowed_namespaces, raw=True,
+        ),
+        iter_filtered(
+            core_v1.list_pod_for_all_namespaces, core_v1.list_namespaced_pod,
+            protected_namespaces, allowed_namespaces=allowed_namespaces, raw=True,
+        ),
+        protected_namespaces, protected_labels,
+    )
+    logger.info(f"Processed {len(deployment_list)} Deployments after filtering (lean)")
+    return deployment_list
+
+def list_lean_sts(apps_v1, core_v1, protected_namespaces, protected_labels, allowed_namespaces=None):
+    """Variante JSON brut de list_all_sts."""
+    sts_list = build_lean_sts(
+        iter_filtered(
+            apps_v1.list_stateful_set_for_all_namespaces, apps_v1.list_namespaced_stateful_set,
+            protected_namespaces, protected_labels, allowed_namespaces, raw=True,
+        ),
+        iter_filtered(
+            core_v1.list_pod_for_all_namespaces, core_v1.list_namespaced_pod,
+            protected_namespaces, allowed_namespaces=allowed_namespaces, raw=True,
+        ),
+        protected_namespaces, protected_labels,
+    )
+    logger.info(f"Processed {len(sts_list)} StatefulSets after filtering (lean)")
+    return sts_list
+
+def list_lean_daemonsets(apps_v1, core_v1, protected_namespaces, protected_labels, allowed_namespaces=None):
+    """Variante JSON brut de list_all_daemonsets."""
+    daemonset_list = build_lean_daemonsets(
+        iter_filtered(
+            apps_v1.list_daemon_set_for_all_namespaces, apps_v1.list_namespaced_daemon_set,
+            protected_namespaces, protected_labels, allowed_namespaces, raw=True,
+        ),
+        iter_filtered(
+            core_v1.list_pod_for_all_namespaces, core_v1.list_namespaced_pod,
+            protected_namespaces, allowed_namespaces=allowed_namespaces, raw=True,
+        ),
+        protected_namespaces, protected_labels,
+    )
+    logger.info(f"Processed {len(daemonset_list)} DaemonSets after filtering (lean)")
+    return daemonset_list
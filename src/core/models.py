@@ -28,6 +28,14 @@ class WorkloadSchedule(SQLModel, table=True):
         active: Indique si la programmation est active
         cron_start: Expression cron pour le démarrage
         cron_stop: Expression cron pour l'arrêt
+        lead_time: Avance (en secondes) du démarrage sur cron_start, fixée explicitement
+        auto_lead_time: Apprend l'avance à partir du p95 des temps de démarrage mesurés
+        target_namespace: Namespace ciblé par une programmation de groupe
+        label_selector: Sélecteur de labels ciblé par une programmation de groupe
+
+    Une programmation de groupe (target_namespace et/ou label_selector renseignés)
+    est résolue contre l'inventaire au moment du déclenchement ; uid sert alors
+    uniquement d'identifiant de la programmation.
     """
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
@@ -37,6 +45,10 @@ class WorkloadSchedule(SQLModel, table=True):
     active: bool = True
     cron_start: Optional[str] = Field(default=None, nullable=True)
     cron_stop: Optional[str] = Field(default=None, nullable=True)
+    lead_time: Optional[int] = Field(default=None, nullable=True, ge=0)
+    auto_lead_time: bool = False
+    target_namespace: Optional[str] = Field(default=None, nullable=True)
+    label_selector: Optional[str] = Field(default=None, nullable=True)
 
     @field_validator("cron_start", "cron_stop")
     @classmethod
@@ -98,4 +110,34 @@ class WorkloadSchedule(SQLModel, table=True):
             last_update=last_update,
             cron_start=cron_start,
             cron_stop=cron_stop,
-        )
\ No newline at end of file
+            lead_time=schedule.get("lead_time"),
+            auto_lead_time=schedule.get("auto_lead_time", False),
+            target_namespace=schedule.get("target_namespace"),
+            label_selector=schedule.get("label_selector"),
+        )
+
+class WorkloadStartup(SQLModel, table=True):
+    """
+    Mesure du temps de démarrage d'un workload, de la demande de scale-up
+    jusqu'à ce que tous les réplicas soient Ready.
+
+    Attributes:
+        id: Identifiant unique de la mesure
+        schedule_id: Programmation ayant déclenché le démarrage
+        uid: Identifiant unique du workload
+        name: Nom du workload
+        started_at: Date et heure de la demande de scale-up
+        ready_at: Date et heure à laquelle le workload est devenu Ready
+        duration_seconds: Temps de démarrage en secondes (time-to-ready)
+        desired_replicas: Nombre de réplicas attendus
+        timed_out: Indique si le délai d'attente a été dépassé
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    schedule_id: Optional[int] = Field(default=None, nullable=True)
+    uid: str = Field(index=True)
+    name: str
+    started_at: datetime
+    ready_at: Optional[datetime] = Field(default=None, nullable=True)
+    duration_seconds: Optional[float] = Field(default=None, nullable=True)
+    desired_replicas: Optional[int] = Field(default=None, nullable=True)
+    timed_out: bool = False
@@ -0,0 +1,128 @@
+"""
+Suppression des ReplicaSets à zéro réplica (anciennes révisions des Deployments).
+
+Une seule liste paginée cluster-wide, filtrée côté apiserver
+(status.replicas=0 et namespaces protégés exclus), alimente au fil des pages
+un pool de suppressions concurrentes limité en débit. Chaque suppression porte
+des préconditions (UID et resourceVersion) : un ReplicaSet remis à l'échelle
+entre la liste et la suppression n'est pas supprimé (409), un ReplicaSet déjà
+supprimé est ignoré (404). Le nombre de suppressions par passe peut être
+borné, pour un ramasse-miettes incrémental.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Optional
+
+from kubernetes.client import V1DeleteOptions, V1Preconditions
+from kubernetes.client.rest import ApiException
+from loguru import logger
+
+from core.kub_list import iter_filtered
+
+ZERO_REPLICAS_SELECTOR = "status.replicas=0"
+MAX_REPORTED_ERRORS = 20
+
+
+class RateLimiter:
+    """Seau à jetons partagé entre threads : qps suppressions par seconde, rafales de burst."""
+
+    def __init__(self, qps: float, burst: int = 1):
+        self.qps = qps
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.qps <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.qps)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.qps
+            time.sleep(delay)
+
+
+def _delete(apps_v1, limiter: RateLimiter, rs) -> str:
+    metadata = rs["metadata"]
+    limiter.acquire()
+    try:
+        apps_v1.delete_namespaced_replica_set(
+            name=metadata["name"], namespace=metadata["namespace"],
+            body=V1DeleteOptions(preconditions=V1Preconditions(
+                uid=metadata["uid"], resource_version=metadata.get("resourceVersion"),
+            )),
+        )
+        return "deleted"
+    except ApiException as e:
+        if e.status == 404:
+            return "gone"
+        if e.status == 409:
+            return "changed"
+        raise
+
+
+def delete_zero_replicasets(apps_v1, protected_namespaces, allowed_namespaces=None, limit: Optional[int] = None,
+                            concurrency: int = 8, qps: float = 20.0,
+                            progress: Optional[Dict] = None) -> Dict:
+    """
+    Supprime les ReplicaSets dont spec.replicas et status.replicas valent 0.
+
+    Args:
+        apps_v1: Client AppsV1Api
+        protected_namespaces: Namespaces exclus (field selector)
+        allowed_namespaces: Allow-list optionnelle (voir iter_filtered)
+        limit: Nombre maximal de suppressions de la passe (None = toutes)
+        concurrency: Suppressions en parallèle
+        qps: Débit maximal de suppressions (0 = illimité)
+        progress: Dict mis à jour au fil de l'eau (suivi d'un job)
+    Returns:
+        Compteurs : matched, deleted, gone (déjà supprimés), changed (remis à l'échelle), failed, errors
+    """
+    progress = progress if progress is not None else {}
+    progress.update(matched=0, deleted=0, gone=0, changed=0, failed=0, errors=[])
+    limiter = RateLimiter(qps, burst=concurrency)
+    futures_rs = {}
+
+    def collect(done):
+        for future in done:
+            try:
+                progress[future.result()] += 1
+            except Exception as e:
+                progress["failed"] += 1
+                if len(progress["errors"]) < MAX_REPORTED_ERRORS:
+                    progress["errors"].append(f"{futures_rs[future]}: {e}")
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="rs-delete") as pool:
+        pending = set()
+        for rs in iter_filtered(
+            apps_v1.list_replica_set_for_all_namespaces, apps_v1.list_namespaced_replica_set,
+            protected_namespaces, allowed_namespaces=allowed_namespaces, raw=True,
+            field_selector=ZERO_REPLICAS_SELECTOR,
+        ):
+            if (rs.get("spec") or {}).get("replicas", 1) != 0:
+                continue
+            if limit is not None and progress["matched"] >= limit:
+                break
+            progress["matched"] += 1
+            future = pool.submit(_delete, apps_v1, limiter, rs)
+            futures_rs[future] = f"{rs['metadata']['namespace']}/{rs['metadata']['name']}"
+            pending.add(future)
+            # Contre-pression : la liste n'avance pas plus vite que les suppressions
+            if len(pending) >= concurrency * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        done, _ = wait(pending)
+        collect(done)
+
+    logger.info(
+        f"Deleted {progress['deleted']} ReplicaSets with 0 desired replicas "
+        f"({progress['gone']} already gone, {progress['changed']} scaled meanwhile, {progress['failed']} failed)"
+    )
+    return progress
@@ -0,0 +1,126 @@
+import json
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from utils.config import scale_state_annotation
+
+# Nombre de réplicas utilisé au scale-up d'un workload arrêté sans capacité mémorisée
+DEFAULT_UP_REPLICAS = 1
+
+HPA_KINDS = {"deploy": "Deployment", "sts": "StatefulSet"}
+
+
+def index_hpas(hpas) -> Dict[tuple, Any]:
+    """
+    Indexe des HorizontalPodAutoscalers par cible (namespace, kind, name).
+    """
+    index = {}
+    for hpa in hpas:
+        ref = hpa.spec.scale_target_ref
+        index[(hpa.metadata.namespace, ref.kind, ref.name)] = hpa
+    return index
+
+
+def find_hpa(autoscaling_v2, resource_type: str, resource, hpa_index: Optional[Dict[tuple, Any]] = None):
+    """
+    Retourne le HPA ciblant un workload, ou None.
+
+    Args:
+        autoscaling_v2: Client AutoscalingV2Api (None si indisponible)
+        resource_type: "deploy" ou "sts"
+        resource: Objet Kubernetes du workload
+        hpa_index: Index pré-calculé par index_hpas pour les opérations groupées
+    """
+    key = (resource.metadata.namespace, HPA_KINDS.get(resource_type), resource.metadata.name)
+    if hpa_index is not None:
+        return hpa_index.get(key)
+    if autoscaling_v2 is None:
+        return None
+    try:
+        hpas = autoscaling_v2.list_namespaced_horizontal_pod_autoscaler(resource.metadata.namespace)
+        return index_hpas(hpas.items).get(key)
+    except Exception as e:
+        logger.warning(f"Could not list HPAs in namespace {resource.metadata.namespace}: {e}")
+        return None
+
+
+def read_scale_state(resource) -> Optional[Dict[str, Any]]:
+    """Lit la capacité mémorisée dans l'annotation du workload."""
+    annotations = resource.metadata.annotations or {}
+    raw = annotations.get(scale_state_annotation)
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        logger.warning(f"Invalid {scale_state_annotation} annotation on {resource.metadata.name}: {raw}")
+        return None
+
+
+def build_scale_down_patch(resource, hpa=None) -> Dict[str, Any]:
+    """
+    Construit le PATCH de scale-down qui mémorise la capacité courante.
+
+    La capacité n'est enregistrée que si le workload tourne : un second
+    scale-down ne doit pas écraser la valeur d'origine par 0.
+    """
+    body: Dict[str, Any] = {"spec": {"replicas": 0}}
+    current = resource.spec.replicas or 0
+    if current > 0:
+        state: Dict[str, Any] = {"replicas": current}
+        if hpa is not None:
+            state["hpa"] = {
+                "name": hpa.metadata.name,
+                "min": hpa.spec.min_replicas,
+                "max": hpa.spec.max_replicas,
+            }
+        body["metadata"] = {"annotations": {scale_state_annotation: json.dumps(state)}}
+    return body
+
+
+def restore_replicas(resource) -> int:
+    """
+    Calcule le nombre de réplicas à restaurer au scale-up.
+
+    Sans capacité mémorisée, un workload qui tourne garde son nombre de
+    réplicas : seul un workload arrêté repart à DEFAULT_UP_REPLICAS.
+    """
+    state = read_scale_state(resource)
+    if not state:
+        return (resource.spec.replicas or 0) or DEFAULT_UP_REPLICAS
+
+    replicas = int(state.get("replicas") or DEFAULT_UP_REPLICAS)
+    hpa = state.get("hpa")
+    if hpa:
+        if hpa.get("min") is not None:
+            replicas = max(replicas, int(hpa["min"]))
+        if hpa.get("max") is not None:
+            replicas = min(replicas, int(hpa["max"]))
+    return replicas
+
+
+def build_scale_up_patch(resource) -> Dict[str, Any]:
+    """Construit le PATCH de scale-up qui restaure la capacité mémorisée."""
+    body: Dict[str, Any] = {"spec": {"replicas": restore_replicas(resource)}}
+    if read_scale_state(resource) is not None:
+        body["metadata"] = {"annotations": {scale_state_annotation: None}}
+    return body
+
+
+def workload_readiness(resource) -> Dict[str, Any]:
+    """
+    Indique si un Deployment/StatefulSet a tous ses réplicas Ready.
+
+    Le statut n'est pris en compte que s'il reflète la dernière génération
+    de la spec, pour ne pas conclure à tort juste après un PATCH.
+    """
+    desired = resource.spec.replicas or 0
+    ready_replicas = resource.status.ready_replicas or 0
+    observed = (resource.status.observed_generation or 0) >= (resource.metadata.generation or 0)
+    return {
+        "desired_replicas": desired,
+        "ready_replicas": ready_replicas,
+        "ready": observed and ready_replicas >= desired,
+    }
+
@@ -0,0 +1,119 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+from loguru import logger
+
+from core.scale_state import workload_readiness
+from utils.config import default_wave_tiers, depends_on_annotation, wave_label
+
+# (resource_type, objet Kubernetes) avec resource_type "deploy" ou "sts"
+Workload = Tuple[str, Any]
+
+WAVE_READY_TIMEOUT = float(os.getenv("WAVE_READY_TIMEOUT", "300"))
+WAVE_POLL_INTERVAL = float(os.getenv("WAVE_POLL_INTERVAL", "5"))
+
+
+def workload_key(resource) -> str:
+    return f"{resource.metadata.namespace}/{resource.metadata.name}"
+
+
+def _base_tier(resource_type: str, resource) -> int:
+    labels = resource.metadata.labels or {}
+    value = labels.get(wave_label)
+    if value is not None:
+        try:
+            return int(value)
+        except ValueError:
+            logger.warning(f"Invalid {wave_label} label '{value}' on {workload_key(resource)}")
+    return default_wave_tiers.get(resource_type, 0)
+
+
+def _dependencies(resource) -> List[str]:
+    annotations = resource.metadata.annotations or {}
+    raw = annotations.get(depends_on_annotation) or ""
+    deps = []
+    for dep in raw.split(","):
+        dep = dep.strip()
+        if dep:
+            deps.append(dep if "/" in dep else f"{resource.metadata.namespace}/{dep}")
+    return deps
+
+
+def build_scale_waves(workloads: List[Workload]) -> List[List[Workload]]:
+    """
+    Ordonne des workloads en vagues de démarrage à partir d'un graphe de dépendances.
+
+    Le niveau d'un workload est le maximum entre son tier (label wave, sinon
+    StatefulSets avant Deployments) et 1 + le niveau de ses dépendances
+    présentes dans l'opération. Les dépendances cycliques sont ignorées.
+
+    Returns:
+        Les vagues dans l'ordre de démarrage ; chaque vague peut être exécutée en parallèle
+    """
+    by_key: Dict[str, Workload] = {workload_key(resource): (kind, resource) for kind, resource in workloads}
+    levels: Dict[str, int] = {}
+    visiting: set = set()
+
+    def level_of(key: str) -> int:
+        if key in levels:
+            return levels[key]
+        kind, resource = by_key[key]
+        visiting.add(key)
+        level = _base_tier(kind, resource)
+        for dep in _dependencies(resource):
+            if dep not in by_key:
+                continue
+            if dep in visiting:
+                logger.warning(f"Dependency cycle between {key} and {dep}, ignoring this edge")
+                continue
+            level = max(level, level_of(dep) + 1)
+        visiting.discard(key)
+        levels[key] = level
+        return level
+
+    grouped: Dict[int, List[Workload]] = {}
+    for key, workload in by_key.items():
+        grouped.setdefault(level_of(key), []).append(workload)
+    return [grouped[level] for level in sorted(grouped)]
+
+
+def describe_waves(waves: List[List[Workload]]) -> List[List[str]]:
+    """Représentation lisible des vagues pour les réponses API."""
+    return [[f"{kind}:{workload_key(resource)}" for kind, resource in wave] for wave in waves]
+
+
+async def wait_for_wave_ready(apps_v1, wave: List[Workload], timeout: float = WAVE_READY_TIMEOUT,
+                              poll_interval: float = WAVE_POLL_INTERVAL) -> bool:
+    """
+    Attend que tous les workloads d'une vague aient leurs réplicas Ready.
+
+    Returns:
+        True si la vague est Ready, False si le délai est dépassé
+    """
+    pending = {workload_key(resource): (kind, resource) for kind, resource in wave}
+    deadline = time.monotonic() + timeout
+
+    while pending:
+        for key, (kind, resource) in list(pending.items()):
+            read = (
+                apps_v1.read_namespaced_deployment_status if kind == "deploy"
+                else apps_v1.read_namespaced_stateful_set_status
+            )
+            try:
+                current = await asyncio.to_thread(
+                    read, name=resource.metadata.name, namespace=resource.metadata.namespace
+                )
+                if workload_readiness(current)["ready"]:
+                    del pending[key]
+            except Exception as e:
+                logger.warning(f"Could not read status of {key}: {e}")
+
+        if not pending:
+            break
+        if time.monotonic() >= deadline:
+            logger.warning(f"Wave not Ready after {timeout}s, still waiting on {sorted(pending)}. Moving on.")
+            return False
+        await asyncio.sleep(poll_interval)
+    return True
@@ -2,45 +2,95 @@ import asyncio
 import os
 import platform
 import warnings
+from contextlib import asynccontextmanager
 from typing import List
 
 import uvicorn
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
-from icecream import ic
 from loguru import logger
 from pydantic import BaseModel
 from starlette.templating import Jinja2Templates
 
+from api.debug import debug
+from api.jobs import jobs
 from api.scheduler import scheduler
-from api.workload import health_route, workload
+from api.workload import health_route, replicaset_gc_loop, workload
 from core.dbManager import DatabaseManager
+from core.inventory import dumps_records
+from core.inventory_cache import InventoryCache
 from core.kub_list import list_all_daemonsets, list_all_deployments, list_all_sts
 from scheduler_engine import SchedulerEngine
 from utils.argocd import ArgoTokenManager
-from utils.config import protected_labels, protected_namespaces
-from utils.helpers import apps_v1, core_v1
+from utils.config import (
+    allowed_namespaces,
+    inventory_cache_enabled,
+    inventory_snapshot_interval,
+    inventory_snapshot_path,
+    inventory_watch_timeout,
+    namespaced_list_threshold,
+    protected_labels,
+    protected_namespaces,
+    replicaset_gc_batch,
+    replicaset_gc_interval,
+)
+from utils.fastjson import FastJSONResponse
+from utils.helpers import apps_v1, core_v1, initialize_kubernetes
 from utils.logging_config import configure_logger
+from utils.metrics import render_metrics
+from utils.startup import startup_tasks
+from utils.tracing import TracingMiddleware, configure_tracing
 
 os.environ["TZ"] = "Europe/Paris"
 
 # Configure logger with JSON format for Datadog
 configure_logger(service_name="workload-scheduler", component="api")
+configure_tracing(service_name="workload-scheduler", component="api")
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Le port est ouvert tout de suite ; l'initialisation lourde tourne en arrière-plan (voir /ready)."""
+    logger.info("🚀 Application starting.")
+    start_background_init()
+    # Ramasse-miettes des ReplicaSets à zéro réplica, désactivé par défaut (REPLICASET_GC_INTERVAL)
+    gc_task = None
+    if replicaset_gc_interval > 0:
+        gc_task = asyncio.create_task(replicaset_gc_loop(replicaset_gc_interval, replicaset_gc_batch))
+    yield
+    if gc_task is not None:
+        gc_task.cancel()
+    await startup_tasks.shutdown()
+    if inventory_cache is not None:
+        await asyncio.to_thread(inventory_cache.stop)
+
 # Configure FastAPI app
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse, lifespan=lifespan)
+app.add_middleware(TracingMiddleware)
 static_dir = os.path.join(BASE_DIR, "static")
 app.mount("/static", StaticFiles(directory=static_dir), name="static")
 app.include_router(router=scheduler)
 app.include_router(router=workload)
 app.include_router(router=health_route)
+app.include_router(router=jobs)
+app.include_router(router=debug, include_in_schema=False)
 
 # Création d'une instance de DatabaseManager
 db = DatabaseManager()
 
+# Cache d'inventaire (watches + instantané disque), démarré en arrière-plan par le lifespan
+inventory_cache = InventoryCache(
+    apps_v1, core_v1, protected_namespaces, protected_labels, allowed_namespaces,
+    snapshot_path=inventory_snapshot_path,
+    snapshot_interval=inventory_snapshot_interval,
+    watch_timeout=inventory_watch_timeout,
+    namespaced_threshold=namespaced_list_threshold,
+) if inventory_cache_enabled else None
+INVENTORY_SYNC_TIMEOUT = 120
+
 # Initialiser le scheduler avec un intervalle personnalisé (en secondes)
 scheduler_engine = SchedulerEngine(check_interval=60)
 
@@ -51,18 +101,23 @@ def custom_fallback(feature_name: str, context: dict) -> bool:
     return False
 
 unleash_api_url = os.getenv("UNLEASH_API_URL")
-if unleash_api_url:
+unleashClient = None
+
+def init_unleash():
+    """Initialise le client Unleash (appel réseau bloquant, lancé en arrière-plan)"""
+    global unleashClient
     from UnleashClient import UnleashClient
-    logger.info("Unleash client initialized.")
-    unleashClient = UnleashClient(
+    client = UnleashClient(
         url=unleash_api_url,
         app_name="workload-scheduler",
         custom_headers={"Authorization": os.getenv("UNLEASH_API_TOKEN", "")},
     )
     warnings.filterwarnings("ignore", category=UserWarning, module="unleash")
 
-    unleashClient.initialize_client()
-    unleashClient.is_enabled("debug", fallback_function=custom_fallback)
+    client.initialize_client()
+    client.is_enabled("debug", fallback_function=custom_fallback)
+    unleashClient = client
+    logger.info("Unleash client initialized.")
 
 
 
@@ -79,19 +134,24 @@ class Workloads(BaseModel):
 token_manager = ArgoTokenManager()
 
 async def init_argocd_token():
-    """Initialise le token ArgoCD global avec gestion d'erreur"""
+    """
+    Initialise le token ArgoCD global. Un échec est propagé : la tâche de
+    démarrage "argocd" (non requise) passe en erreur sans bloquer la readiness.
+    """
     if os.getenv("ARGOCD_API_URL"):
         try:
             logger.info("Initializing ArgoCD session token...")
-            token = token_manager.get_token()
-            
-            if not token:
-                logger.error("Failed to obtain ArgoCD token. Check credentials or ArgoCD server availability.")
-
-            logger.success("ArgoCD session token initialized.")
+            token = await token_manager.aget_token()
         except Exception as e:
             logger.error(f"Error initializing ArgoCD token: {str(e)}")
             logger.warning("ArgoCD integration will not be available.")
+            raise
+
+        if not token:
+            logger.error("Failed to obtain ArgoCD token. Check credentials or ArgoCD server availability.")
+            raise RuntimeError("Failed to obtain ArgoCD token")
+
+        logger.success("ArgoCD session token initialized.")
     else:
         logger.warning("ARGOCD_API_URL not set, skipping token initialization")
 
@@ -106,40 +166,47 @@ async def init_database():
         await db.create_table()
         logger.success("Database created and tables initialized.")
         
-        deployment_list = list_all_deployments(apps_v1, core_v1, protected_namespaces, protected_labels)
-        sts_list = list_all_sts(apps_v1, core_v1, protected_namespaces, protected_labels)
-        ds_list = list_all_daemonsets(apps_v1, core_v1, protected_namespaces, protected_labels)
+        # Le cache d'inventaire démarré en parallèle évite une seconde liste complète du cluster
+        if "inventory" in startup_tasks.states \
+                and await asyncio.to_thread(inventory_cache.wait_available, INVENTORY_SYNC_TIMEOUT):
+            deployment_list, sts_list, ds_list = await asyncio.to_thread(list_inventory)
+        else:
+            args = (apps_v1, core_v1, protected_namespaces, protected_labels, allowed_namespaces)
+            deployment_list, sts_list, ds_list = await asyncio.gather(
+                asyncio.to_thread(list_all_deployments, *args),
+                asyncio.to_thread(list_all_sts, *args),
+                asyncio.to_thread(list_all_daemonsets, *args),
+            )
 
         # Vérifier que les listes sont bien des listes et non des dicts d'erreur
         if isinstance(deployment_list, dict) or isinstance(sts_list, dict) or isinstance(ds_list, dict):
-            logger.error("Error fetching workloads from Kubernetes API")
-            return
+            raise RuntimeError("Error fetching workloads from Kubernetes API")
 
         logger.success(
             f"Deployments: {len(deployment_list)}, StatFulSets: {len(sts_list)}, DaemonSets: {len(ds_list)}"
         )
 
-        for dep in deployment_list:
-            uid = dep.get("uid")
-            name = dep.get("name")
-            if uid and name and isinstance(uid, str) and isinstance(name, str):
-                await db.store_uid(uid, name)
-        for sts in sts_list:
-            uid = sts.get("uid")
-            name = sts.get("name")
-            if uid and name and isinstance(uid, str) and isinstance(name, str):
-                await db.store_uid(uid, name)
-        for ds in ds_list:
-            uid = ds.get("uid")
-            name = ds.get("name")
-            if uid and name and isinstance(uid, str) and isinstance(name, str):
-                await db.store_uid(uid, name)
+        for record in [*deployment_list, *sts_list, *ds_list]:
+            if record.uid and record.name:
+                await db.store_uid(record.uid, record.name)
         logger.success("UIDs stored in database.")
     except Exception as e:
         logger.error(f"Error initializing database: {str(e)}")
         raise
 
 
+def list_inventory():
+    """
+    Deployments, StatefulSets et DaemonSets : depuis le cache d'inventaire dès
+    qu'il a un état complet (éventuellement celui de l'instantané), sinon par
+    listes directes.
+    """
+    if inventory_cache is not None and inventory_cache.available:
+        return inventory_cache.deployments(), inventory_cache.statefulsets(), inventory_cache.daemonsets()
+    args = (apps_v1, core_v1, protected_namespaces, protected_labels, allowed_namespaces)
+    return list_all_deployments(*args), list_all_sts(*args), list_all_daemonsets(*args)
+
+
 @app.get("/", response_class=HTMLResponse)
 def status(request: Request):
     """
@@ -147,10 +214,8 @@ def status(request: Request):
     """
     try:
         logger.info("Fetching Deployments, Daemonets and StatefulSets...")
-        deployment_list = list_all_deployments(apps_v1, core_v1, protected_namespaces, protected_labels)
-        sts_list = list_all_sts(apps_v1, core_v1, protected_namespaces, protected_labels)
-        ds_list = list_all_daemonsets(apps_v1, core_v1, protected_namespaces, protected_labels)
-        
+        deployment_list, sts_list, ds_list = list_inventory()
+
         logger.success(
             f"Deployments: {len(deployment_list)}, StatFulSets: {len(sts_list)}, DaemonSets: {len(ds_list)},  "
         )
@@ -172,20 +237,54 @@ def status(request: Request):
         )
 
 
-# Run the application
-async def main():
-    logger.info("🚀 Application starting.")
-    await init_database()
-    await init_argocd_token()
+@app.get("/inventory", summary="Workload inventory as JSON")
+def inventory():
+    """
+    Inventaire des Deployments, StatefulSets et DaemonSets, sérialisé directement depuis les records.
+    X-Inventory-Stale signale un état encore issu de l'instantané disque, le temps que les watches reprennent.
+    """
+    deployment_list, sts_list, ds_list = list_inventory()
+    content = dumps_records({"deploy": deployment_list, "sts": sts_list, "ds": ds_list})
+    headers = {}
+    if inventory_cache is not None and inventory_cache.available:
+        headers["X-Inventory-Stale"] = "true" if inventory_cache.stale else "false"
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Métriques Prometheus (scheduler, scale, appels Kubernetes/ArgoCD, base, inventaire)."""
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
+
+
+async def init_inventory_cache():
+    """Démarre le cache d'inventaire ; prêt dès l'instantané chargé ou la première liste faite"""
+    await asyncio.to_thread(inventory_cache.start)
+    if not await asyncio.to_thread(inventory_cache.wait_available, INVENTORY_SYNC_TIMEOUT):
+        raise TimeoutError(f"Inventory cache not synced after {INVENTORY_SYNC_TIMEOUT}s")
+
+
+def start_background_init():
+    """Lance l'initialisation lourde en tâches suivies par /ready (voir utils/startup.py)"""
+    startup_tasks.start("kubernetes", lambda: asyncio.to_thread(initialize_kubernetes))
+    if inventory_cache is not None:
+        startup_tasks.start("inventory", init_inventory_cache)
+    startup_tasks.start("database", init_database)
+    startup_tasks.start("argocd", init_argocd_token, required=False)
+    if unleash_api_url:
+        startup_tasks.start("unleash", lambda: asyncio.to_thread(init_unleash), required=False)
+
 
 if __name__ == "__main__":
+    from icecream import ic
+
     if platform.system() == "Darwin":
         ic.enable()
     else:
         ic.disable()
     logger.info("🚀 Démarrage du script")
     try:
-        asyncio.run(main())
         logger.info("Starting Workload Scheduler...")
 
         uvicorn_config = uvicorn.Config(
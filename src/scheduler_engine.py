@@ -1,19 +1,34 @@
 import asyncio
+import math
 import os
-from datetime import datetime
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlencode
 
 import pytz
 from croniter import croniter
-from icecream import ic  # noqa: F401
 from loguru import logger
 
 from core.models import ScheduleStatus, WorkloadSchedule
 from utils.helpers import RetryableAsyncClient
 from utils.logging_config import configure_logger
+from utils.metrics import (
+    ACTION_DELAY_SECONDS,
+    ACTION_SECONDS,
+    ACTIONS_TOTAL,
+    SCHEDULER_TICK_SECONDS,
+    SCHEDULES_EVALUATED,
+    record_cache,
+)
+from utils.tracing import configure_tracing, traced, tracer
 
 # Configure logger with JSON format for Datadog
 configure_logger(service_name="workload-scheduler", component="scheduler")
 
+# Réponses d'action acceptées : "accepted" pour les opérations groupées lancées en job (/manage-group)
+ACCEPTED_STATUSES = ("success", "accepted")
+
 
 class SchedulerEngine:
     """
@@ -24,14 +39,35 @@ class SchedulerEngine:
         running: Indicateur si le scheduleur est en cours d'exécution
         _task: Tâche asyncio pour le processus en arrière-plan
         api_url: URL de l'API workload-scheduler
+        wait_for_ready: Attend que les workloads démarrés soient Ready et mesure leur temps de démarrage
+        ready_timeout: Délai maximal (en secondes) d'attente de la disponibilité
+        ready_poll_interval: Intervalle (en secondes) entre deux vérifications de disponibilité
+        max_lead_time: Avance maximale (en secondes) du démarrage sur cron_start
+        lead_time_refresh: Durée (en secondes) de validité des percentiles de démarrage en cache
+        max_catch_up: Fenêtre maximale (en secondes) rattrapée après un tick en retard
+        clock: Horloge du moteur (heure courante, avec fuseau) ; injectable pour la simulation
+        action_sink: Si défini, reçoit les actions (action, schedule, now) au lieu de l'appel à l'API
     """
 
-    def __init__(self, check_interval: int = 60):
+    def __init__(
+        self,
+        check_interval: int = 60,
+        wait_for_ready: bool | None = None,
+        ready_timeout: float | None = None,
+        ready_poll_interval: float | None = None,
+        clock: Callable[[], datetime] | None = None,
+        action_sink: Callable[[str, Any, datetime], Awaitable[None]] | None = None,
+    ):
         """
         Initialise le moteur de scheduling.
 
         Args:
             check_interval: Intervalle de vérification en secondes (par défaut: 60)
+            wait_for_ready: Active le suivi de disponibilité (par défaut: variable WAIT_FOR_READY)
+            ready_timeout: Délai d'attente de disponibilité (par défaut: READY_TIMEOUT ou 600s)
+            ready_poll_interval: Intervalle de vérification (par défaut: READY_POLL_INTERVAL ou 5s)
+            clock: Horloge (par défaut: heure courante dans TIMEZONE)
+            action_sink: Destination des actions à la place de l'API (simulation)
         """
         self.check_interval = check_interval
         self.running = False
@@ -39,6 +75,26 @@ class SchedulerEngine:
         self.timezone = pytz.timezone(os.getenv("TIMEZONE", "Europe/Paris"))
         self.api_url = os.getenv("API_URL", "http://localhost:8000")
         self.client = RetryableAsyncClient()
+        if wait_for_ready is None:
+            wait_for_ready = os.getenv("WAIT_FOR_READY", "false").lower() == "true"
+        self.wait_for_ready = wait_for_ready
+        self.ready_timeout = ready_timeout if ready_timeout is not None else float(os.getenv("READY_TIMEOUT", "600"))
+        self.ready_poll_interval = (
+            ready_poll_interval if ready_poll_interval is not None else float(os.getenv("READY_POLL_INTERVAL", "5"))
+        )
+        self._readiness_tasks: set[asyncio.Task] = set()
+        self.max_lead_time = float(os.getenv("MAX_LEAD_TIME", "3600"))
+        self.lead_time_refresh = float(os.getenv("LEAD_TIME_REFRESH", "600"))
+        self._startup_summary: dict = {}
+        self._startup_summary_at: float | None = None
+        self.max_catch_up = float(os.getenv("SCHEDULER_MAX_CATCH_UP", "600"))
+        self.clock = clock or (lambda: datetime.now(self.timezone))
+        self.action_sink = action_sink
+        # Les ticks couvrent des fenêtres contiguës [fin de la précédente, now + check_interval)
+        self._window_end: datetime | None = None
+        self._window_start_offset = timedelta(0)
+        # Occurrences encadrant le dernier instant vérifié, par expression cron
+        self._cron_brackets: dict = {}
 
     async def start(self):
         """
@@ -69,6 +125,8 @@ class SchedulerEngine:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        for task in list(self._readiness_tasks):
+            task.cancel()
         logger.info("🛑 Arrêt du moteur de scheduling")
 
     async def _run(self):
@@ -78,7 +136,8 @@ class SchedulerEngine:
         try:
             while self.running:
                 try:
-                    await self._check_schedules()
+                    with SCHEDULER_TICK_SECONDS.time():
+                        await self._check_schedules()
                     await asyncio.sleep(self.check_interval)
                 except Exception as e:
                     logger.error(f"Erreur dans la boucle de scheduling: {e}")
@@ -88,6 +147,7 @@ class SchedulerEngine:
             logger.info("Tâche de scheduling annulée")
             raise
 
+    @traced("scheduler.check_schedules")
     async def _check_schedules(self):
         """
         Vérifie toutes les programmations et exécute les actions nécessaires.
@@ -96,7 +156,8 @@ class SchedulerEngine:
             schedules = await self.client.get(url=f"{self.api_url}/schedules")
             schedules_dict = schedules.json()
 
-            logger.info(f"Vérification de {len(schedules_dict)} programmations à {datetime.now(self.timezone).strftime('%H:%M:%S')}")
+            now = self.clock()
+            logger.info(f"Vérification de {len(schedules_dict)} programmations à {now.strftime('%H:%M:%S')}")
 
             if not schedules_dict:
                 logger.info("Aucune programmation trouvée dans la base de données")
@@ -105,15 +166,34 @@ class SchedulerEngine:
             # Convertir les dictionnaires en objets WorkloadSchedule
             schedule_objects = [WorkloadSchedule.from_api_response(item) for item in schedules_dict]
 
-            now = datetime.now(self.timezone)
-
-            for schedule in schedule_objects:
-                await self._process_schedule(schedule, now)
+            await self.evaluate_schedules(schedule_objects, now)
 
         except Exception as e:
             logger.error(f"Erreur lors de la vérification des programmations: {e}")
             logger.exception(e)
 
+    async def evaluate_schedules(self, schedules, now: datetime):
+        """
+        Évalue un tick. Chaque tick couvre la fenêtre [fin de la fenêtre du tick
+        précédent, now + check_interval) : une occurrence cron est déclenchée au
+        tick qui la précède, une seule fois, même si les ticks dérivent (un tick
+        en retard rattrape au plus max_catch_up secondes).
+
+        Utilisée par _check_schedules et par la simulation.
+        """
+        if self._window_end is None:
+            self._window_start_offset = timedelta(0)
+        else:
+            self._window_start_offset = max(self._window_end - now, timedelta(seconds=-self.max_catch_up))
+        self._window_end = now + timedelta(seconds=self.check_interval)
+
+        if any(getattr(schedule, "auto_lead_time", False) for schedule in schedules):
+            await self._refresh_startup_summary()
+
+        for schedule in schedules:
+            await self._process_schedule(schedule, now)
+        SCHEDULES_EVALUATED.inc(len(schedules))
+
     async def _process_schedule(self, schedule: WorkloadSchedule, now: datetime):
         """
         Traite une programmation individuelle.
@@ -122,28 +202,32 @@ class SchedulerEngine:
             schedule: La programmation à traiter
             now: L'heure actuelle
         """
-        
         try:
-            should_start = self._should_execute(schedule.cron_start, now)
+            lead_time = self._lead_time(schedule)
+            start_now = now + timedelta(seconds=lead_time) if lead_time else now
+            should_start = self._should_execute(schedule.cron_start, start_now)
             should_stop = self._should_execute(schedule.cron_stop, now)
 
+            # Formatage paresseux : exécuté pour chaque programmation à chaque tick
             logger.debug(
-                f"Programmation {schedule.id} ({schedule.name}, UID: {schedule.uid}): status={schedule.status}, active={schedule.active}, should_start={should_start}, should_stop={should_stop}"
-            )
-            logger.debug(
-                f"cron_start: {schedule.cron_start}, cron_stop: {schedule.cron_stop}"
+                "Programmation {} ({}, UID: {}): status={}, active={}, should_start={}, should_stop={}, "
+                "cron_start: {}, cron_stop: {}, lead_time: {}s",
+                schedule.id, schedule.name, schedule.uid, schedule.status, schedule.active,
+                should_start, should_stop, schedule.cron_start, schedule.cron_stop, lead_time,
             )
 
             if should_start and (schedule.status == ScheduleStatus.NOT_SCHEDULED or not schedule.active):
                 logger.info(
                     f"Déclenchement du démarrage pour {schedule.name} (ID: {schedule.id}, UID: {schedule.uid})"
                 )
-                await self._start_workload(schedule)
+                with self._action_span(schedule):
+                    await self._start_workload(schedule)
             elif should_stop and schedule.status == ScheduleStatus.SCHEDULED and schedule.active:
                 logger.info(
                     f"Déclenchement de l'arrêt pour {schedule.name} (ID: {schedule.id}, UID: {schedule.uid})"
                 )
-                await self._stop_workload(schedule)
+                with self._action_span(schedule):
+                    await self._stop_workload(schedule)
             elif not schedule.active:
                 logger.debug(
                     f"Programmation {schedule.id} ({schedule.name}, UID: {schedule.uid}) inactive, mais vérifiée pour un éventuel démarrage"
@@ -155,13 +239,62 @@ class SchedulerEngine:
             )
             logger.exception(e)
 
+    @staticmethod
+    def _action_span(schedule):
+        """
+        Span d'une action déclenchée. Ouvert seulement quand une action a lieu :
+        un span par programmation et par tick coûtait autant que leur évaluation.
+        """
+        return tracer.start_as_current_span("scheduler.process_schedule", attributes={
+            "schedule.id": str(schedule.id),
+            "schedule.name": str(schedule.name),
+            "schedule.uid": str(schedule.uid),
+        })
+
+    def _lead_time(self, schedule) -> int:
+        """
+        Calcule l'avance (en secondes) avec laquelle déclencher le démarrage,
+        pour que le workload soit Ready à l'heure de cron_start.
+
+        Priorité à la valeur explicite (lead_time), sinon p95 des temps de
+        démarrage mesurés si auto_lead_time est activé.
+        """
+        explicit = getattr(schedule, "lead_time", None)
+        if explicit:
+            return int(min(explicit, self.max_lead_time))
+
+        if getattr(schedule, "auto_lead_time", False):
+            p95 = self._startup_summary.get(schedule.uid, {}).get("p95")
+            if p95:
+                return int(min(math.ceil(p95), self.max_lead_time))
+        return 0
+
+    async def _refresh_startup_summary(self):
+        """Rafraîchit le cache des percentiles de démarrage (au plus une fois par lead_time_refresh)."""
+        if self._startup_summary_at is not None and time.monotonic() - self._startup_summary_at < self.lead_time_refresh:
+            record_cache("startup_summary", hit=True)
+            return
+        record_cache("startup_summary", hit=False)
+        try:
+            response = await self.client.get(url=f"{self.api_url}/startup-summary")
+            self._startup_summary = response.json()
+            self._startup_summary_at = time.monotonic()
+            logger.debug(f"Percentiles de démarrage rafraîchis pour {len(self._startup_summary)} workloads")
+        except Exception as e:
+            # On garde les valeurs précédentes : l'avance n'est qu'une optimisation
+            logger.warning(f"Impossible de récupérer les temps de démarrage: {e}")
+
     def _should_execute(self, cron_expression: str | None, now: datetime) -> bool:
         """
-        Vérifie si une expression cron doit être exécutée.
+        Vérifie si une expression cron doit être exécutée : vrai si sa prochaine
+        occurrence tombe dans la fenêtre du tick, [now + début, now + check_interval).
+
+        La prochaine occurrence est mise en cache par expression : croniter n'est
+        réévalué qu'une fois par occurrence, pas à chaque tick.
 
         Args:
             cron_expression: L'expression cron à vérifier (peut être None)
-            now: L'heure actuelle
+            now: L'heure actuelle (décalée de l'avance pour un démarrage)
         Returns:
             True si l'expression doit être exécutée, False sinon
         """
@@ -169,24 +302,28 @@ class SchedulerEngine:
             return False
 
         try:
-            cron = croniter(cron_expression, now)
-            next_dt = cron.get_next(datetime)
-            cron.get_prev()
-            prev_dt = cron.get_prev(datetime)
-            delta = (now - prev_dt).total_seconds()
-            next_delta = (next_dt - now).total_seconds()
+            window_start = now + self._window_start_offset
+            key = (cron_expression, str(now.tzinfo))
+            bracket = self._cron_brackets.get(key)
+            # (précédente, prochaine) : aucune occurrence entre les deux
+            if bracket is None or not bracket[0] < window_start <= bracket[1]:
+                # Décalage d'1µs : une occurrence exactement au début de la fenêtre est incluse
+                anchor = window_start - timedelta(microseconds=1)
+                bracket = (
+                    croniter(cron_expression, anchor).get_prev(datetime),
+                    croniter(cron_expression, anchor).get_next(datetime),
+                )
+                if len(self._cron_brackets) >= 10_000:
+                    self._cron_brackets.clear()
+                self._cron_brackets[key] = bracket
+                logger.debug(
+                    "Expression cron '{}': précédente={}, actuelle={}, prochaine={}, intervalle={}s",
+                    cron_expression, bracket[0], now, bracket[1], self.check_interval,
+                )
 
-            logger.debug(
-                f"Expression cron '{cron_expression}': "
-                f"précédente={prev_dt}, "
-                f"actuelle={now}, "
-                f"prochaine={next_dt}, "
-                f"delta={delta}s, "
-                f"intervalle={self.check_interval}s"
-            )
-            return (0 <= delta < self.check_interval) or (
-                0 <= next_delta < self.check_interval
-            )
+            next_dt = bracket[1]
+            next_delta = (next_dt - now).total_seconds()
+            return next_delta < self.check_interval and not self._repeated_wall_time(next_dt)
 
         except Exception as e:
             logger.error(
@@ -194,38 +331,176 @@ class SchedulerEngine:
             )
             return False
 
+    @staticmethod
+    def _repeated_wall_time(occurrence: datetime) -> bool:
+        """
+        Vrai pour la seconde occurrence d'une même heure locale au passage à
+        l'heure d'hiver (ex. 02:30 CEST puis 02:30 CET) : elle n'est pas rejouée.
+        """
+        tz = occurrence.tzinfo
+        if tz is None or not hasattr(tz, "normalize"):
+            return False
+        earlier = tz.normalize(occurrence - timedelta(hours=1))
+        return earlier.replace(tzinfo=None) == occurrence.replace(tzinfo=None)
+
+    @staticmethod
+    def _cron_time(cron_expression: str, now: datetime) -> datetime:
+        """Occurrence de l'expression cron la plus proche de now (heure visée par l'action)."""
+        try:
+            cron = croniter(cron_expression, now)
+            prev_dt = cron.get_prev(datetime)
+            next_dt = croniter(cron_expression, now).get_next(datetime)
+        except Exception:
+            return now
+        return prev_dt if now - prev_dt <= next_dt - now else next_dt
+
+    def _record_action(self, action: str, schedule, success: bool, started_monotonic: float):
+        """
+        Métriques d'une action : résultat, durée de l'appel et délai par rapport
+        à l'heure cron visée (base d'un SLO "scalé moins de N secondes après le cron").
+        Au démarrage, l'heure visée tient compte de l'avance (lead time).
+        """
+        kind = "group" if self._group_params(schedule) else "workload"
+        ACTIONS_TOTAL.labels(action=action, kind=kind, result="success" if success else "failure").inc()
+        ACTION_SECONDS.labels(action=action, kind=kind).observe(time.monotonic() - started_monotonic)
+
+        cron_expression = getattr(schedule, "cron_start" if action == "start" else "cron_stop", None)
+        if not success or not isinstance(cron_expression, str):
+            return
+        try:
+            lead = timedelta(seconds=self._lead_time(schedule) if action == "start" else 0)
+            now = self.clock()
+            target = self._cron_time(cron_expression, now + lead) - lead
+            ACTION_DELAY_SECONDS.labels(action=action, kind=kind).observe(max((now - target).total_seconds(), 0))
+        except Exception as e:
+            # Une métrique ne doit jamais faire échouer l'action
+            logger.debug(f"Impossible de mesurer le délai de {action} pour {schedule.name}: {e}")
+
+    @staticmethod
+    def _group_params(schedule) -> dict:
+        """Paramètres de sélection d'une programmation de groupe (vide pour une programmation par UID)"""
+        params = {
+            "namespace": getattr(schedule, "target_namespace", None),
+            "label_selector": getattr(schedule, "label_selector", None),
+        }
+        return {key: value for key, value in params.items() if value}
+
+    def _manage_url(self, action: str, schedule) -> str:
+        """
+        URL de l'action à appeler : une seule opération groupée pour une
+        programmation de groupe (job d'arrière-plan, réponse "accepted"), sinon
+        l'action sur le workload ciblé par son UID.
+        """
+        params = self._group_params(schedule)
+        if params:
+            return f"{self.api_url}/manage-group/{action}?{urlencode(params)}"
+        return f"{self.api_url}/manage/{action}/deploy/{schedule.uid}"
+
+    def _schedule_update(self, schedule, active: bool) -> dict:
+        """
+        Construit le corps du PUT après une action. Tous les champs configurables
+        sont renvoyés, sinon la mise à jour les remettrait à leur valeur par défaut.
+        """
+        return {
+            "name": schedule.name,
+            "uid": schedule.uid,
+            "active": active,
+            "status": ScheduleStatus.SCHEDULED.value,
+            "last_update": self.clock().isoformat(),
+            "cron_start": getattr(schedule, "cron_start", None),
+            "cron_stop": getattr(schedule, "cron_stop", None),
+            "lead_time": getattr(schedule, "lead_time", None),
+            "auto_lead_time": getattr(schedule, "auto_lead_time", False),
+            "target_namespace": getattr(schedule, "target_namespace", None),
+            "label_selector": getattr(schedule, "label_selector", None),
+        }
+
     async def _start_workload(self, schedule):
         """
         Démarre un workload en utilisant son UID.
         """
+        if self.action_sink is not None:
+            await self.action_sink("start", schedule, self.clock())
+            return
+        success = False
+        action_started = time.monotonic()
         try:
             logger.info(f"🚀 Démarrage du workload: {schedule.name} (ID: {schedule.id}, UID: {schedule.uid})")
 
-            result = await self.client.get(url=f"{self.api_url}/manage/up/deploy/{schedule.uid}")
+            started_at = datetime.now(timezone.utc)
+            started_monotonic = time.monotonic()
+            result = await self.client.get(url=self._manage_url("up", schedule))
             result_data = result.json()
 
-            if result_data.get("status") == "success":
-                # Créer un dictionnaire pour la mise à jour
-                update_data = {
-                    "active": True,
-                    "status": ScheduleStatus.SCHEDULED.value,
-                    "last_update": datetime.now(self.timezone).isoformat(),
-                    "cron_start": schedule.cron_start if hasattr(schedule, 'cron_start') else None,
-                    "cron_stop": schedule.cron_stop if hasattr(schedule, 'cron_stop') else None
-                }
-
+            if result_data.get("status") in ACCEPTED_STATUSES:
                 await self.client.put(
                     url=f"{self.api_url}/schedules/{schedule.id}",
-                    json=update_data
+                    json=self._schedule_update(schedule, active=True)
                 )
+                success = True
                 logger.success(f"✅ Workload démarré avec succès: {schedule.name}")
+
+                # Le suivi de disponibilité est par UID : pas pour les programmations de groupe
+                if self.wait_for_ready and not self._group_params(schedule):
+                    task = asyncio.create_task(
+                        self._wait_for_ready(schedule, started_at, started_monotonic)
+                    )
+                    self._readiness_tasks.add(task)
+                    task.add_done_callback(self._readiness_tasks.discard)
             else:
-                logger.error(f"❌ Échec du démarrage: {result_data.get('message', 'Unknown error')}")
+                logger.error(f"❌ Échec du démarrage: {result_data.get('message') or result_data.get('detail', 'Unknown error')}")
                 
         except Exception as e:
             logger.error(f"Erreur lors du démarrage: {e}")
             logger.exception(e)
+        finally:
+            self._record_action("start", schedule, success, action_started)
             
+    async def _wait_for_ready(self, schedule, started_at: datetime, started_monotonic: float):
+        """
+        Surveille un workload démarré jusqu'à ce que ready_replicas == desired
+        (ou jusqu'au délai d'attente), puis enregistre son temps de démarrage.
+
+        Exécuté en tâche de fond pour ne pas retarder les autres programmations.
+        """
+        deadline = started_monotonic + self.ready_timeout
+        status: dict = {}
+        ready = False
+        try:
+            while time.monotonic() < deadline:
+                response = await self.client.get(url=f"{self.api_url}/status/deploy/{schedule.uid}")
+                status = response.json()
+                if status.get("status") == "success" and status.get("ready"):
+                    ready = True
+                    break
+                await asyncio.sleep(self.ready_poll_interval)
+
+            duration = time.monotonic() - started_monotonic
+            if ready:
+                logger.success(f"✅ Workload {schedule.name} Ready en {duration:.1f}s")
+            else:
+                logger.warning(
+                    f"⏳ Workload {schedule.name} non Ready après {self.ready_timeout}s "
+                    f"({status.get('ready_replicas')}/{status.get('desired_replicas')} réplicas)"
+                )
+
+            metric = {
+                "schedule_id": schedule.id,
+                "uid": schedule.uid,
+                "name": schedule.name,
+                "started_at": started_at.isoformat(),
+                "ready_at": datetime.now(timezone.utc).isoformat() if ready else None,
+                "duration_seconds": round(duration, 3) if ready else None,
+                "desired_replicas": status.get("desired_replicas"),
+                "timed_out": not ready,
+            }
+            await self.client.post(url=f"{self.api_url}/startup-metrics", json=metric)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Erreur lors du suivi de disponibilité de {schedule.name}: {e}")
+            logger.exception(e)
+
     async def _stop_workload(self, schedule):
         """
         Arrête un workload en utilisant son UID.
@@ -233,35 +508,31 @@ class SchedulerEngine:
         Args:
             schedule: La programmation du workload à arrêter
         """
+        if self.action_sink is not None:
+            await self.action_sink("stop", schedule, self.clock())
+            return
+        success = False
+        action_started = time.monotonic()
         try:
             logger.info(
                 f"🛑 Arrêt du workload: {schedule.name} (ID: {schedule.id}, UID: {schedule.uid})"
             )
 
-            result = await self.client.get(
-                url=f"{self.api_url}/manage/down/deploy/{schedule.uid}"
-            )
+            result = await self.client.get(url=self._manage_url("down", schedule))
             result_data = result.json()
 
-            if result_data.get("status") == "success":
-                update_data = {
-                    "active": False,
-                    "status": ScheduleStatus.SCHEDULED.value,
-                    "last_update": datetime.now(self.timezone).isoformat(),
-                    "cron_start": schedule.cron_start if hasattr(schedule, 'cron_start') else None,
-                    "cron_stop": schedule.cron_stop if hasattr(schedule, 'cron_stop') else None
-                }
-
+            if result_data.get("status") in ACCEPTED_STATUSES:
                 await self.client.put(
                     url=f"{self.api_url}/schedules/{schedule.id}",
-                    json=update_data,
+                    json=self._schedule_update(schedule, active=False),
                 )
+                success = True
                 logger.success(
                     f"✅ Workload arrêté avec succès: {schedule.name} (UID: {schedule.uid})"
                 )
             else:
                 logger.error(
-                    f"❌ Échec de l'arrêt du workload {schedule.name} (UID: {schedule.uid}): {result_data.get('message', 'Unknown error')}"
+                    f"❌ Échec de l'arrêt du workload {schedule.name} (UID: {schedule.uid}): {result_data.get('message') or result_data.get('detail', 'Unknown error')}"
                 )
 
         except Exception as e:
@@ -269,11 +540,18 @@ class SchedulerEngine:
                 f"Erreur lors de l'arrêt du workload {schedule.name} (UID: {schedule.uid}): {e}"
             )
             logger.exception(e)
+        finally:
+            self._record_action("stop", schedule, success, action_started)
 
 
 if __name__ == "__main__":
 
     async def main():
+        # Le moteur tourne dans son propre processus : il expose ses propres métriques
+        from prometheus_client import start_http_server
+        start_http_server(int(os.getenv("SCHEDULER_METRICS_PORT", "9100")))
+        configure_tracing(service_name="workload-scheduler", component="scheduler")
+
         # Créer une instance du scheduler
         scheduler = SchedulerEngine(check_interval=60)
 
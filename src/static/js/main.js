@@ -29,7 +29,7 @@ function toggleWorkloadDetails(button) {
     }
 }
 function shutdownWorkerNodes() {
-    if (!confirm('Are you sure you want to shutdown all workloads on worker nodes (ryzen, nvidia)? This will NOT affect control-plane workloads.')) {
+    if (!confirm('Are you sure you want to shutdown all workloads on worker nodes (node pool from NODE_POOLS)? This will NOT affect control-plane workloads.')) {
         return;
     }
 
@@ -10,7 +10,7 @@ from unittest.mock import AsyncMock, patch, MagicMock
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.models import WorkloadSchedule, ScheduleStatus
+from core.models import WorkloadSchedule, ScheduleStatus, WorkloadStartup
 from api.scheduler import scheduler
 from fastapi import FastAPI, HTTPException
 
@@ -51,6 +51,9 @@ def mock_db_manager():
         mock_manager.update_schedule = AsyncMock(return_value=True)
         mock_manager.delete_schedule = AsyncMock(return_value=True)
         mock_manager.store_schedule = AsyncMock(return_value=1)
+        mock_manager.store_startup_metric = AsyncMock()
+        mock_manager.get_startup_metrics = AsyncMock(return_value=[])
+        mock_manager.get_startup_summary = AsyncMock(return_value={})
         yield mock_manager
 
 def test_get_schedules(mock_db_manager):
@@ -517,4 +520,90 @@ def test_start_workload_api_failure(mock_db_manager):
         assert response.status_code == 500
         data = response.json()
         assert "detail" in data
-        assert "API Failure" in data["detail"] or "Error" in data["detail"]
\ No newline at end of file
+        assert "API Failure" in data["detail"] or "Error" in data["detail"]
+
+def test_create_startup_metric(mock_db_manager):
+    """Test d'enregistrement d'un temps de démarrage"""
+    response = client.post("/startup-metrics", json={
+        "schedule_id": 1,
+        "uid": "test-uid-123",
+        "name": "Test Workload",
+        "started_at": "2025-05-07T07:30:00+00:00",
+        "ready_at": "2025-05-07T07:31:30+00:00",
+        "duration_seconds": 90.0,
+        "desired_replicas": 3,
+        "timed_out": False
+    })
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "created"
+    stored = mock_db_manager.store_startup_metric.call_args[0][0]
+    assert isinstance(stored, WorkloadStartup)
+    assert stored.duration_seconds == 90.0
+    assert isinstance(stored.started_at, datetime)
+
+def test_get_startup_metrics(mock_db_manager):
+    """Test de récupération des temps de démarrage d'un workload"""
+    mock_db_manager.get_startup_metrics.return_value = [
+        WorkloadStartup(id=1, uid="test-uid-123", name="Test Workload",
+                        started_at=datetime.now(), duration_seconds=42.0)
+    ]
+
+    response = client.get("/startup-metrics/test-uid-123?limit=10")
+
+    assert response.status_code == 200
+    assert response.json()[0]["duration_seconds"] == 42.0
+    mock_db_manager.get_startup_metrics.assert_called_once_with("test-uid-123", 10)
+
+def test_get_startup_summary(mock_db_manager):
+    """Test de récupération des percentiles de démarrage"""
+    mock_db_manager.get_startup_summary.return_value = {
+        "test-uid-123": {"count": 5, "p50": 60.0, "p95": 120.0}
+    }
+
+    response = client.get("/startup-summary")
+
+    assert response.status_code == 200
+    assert response.json()["test-uid-123"]["p95"] == 120.0
+    mock_db_manager.get_startup_summary.assert_called_once_with(samples=20)
+
+
+@pytest.mark.asyncio
+async def test_manage_group_resolves_selector():
+    """Une programmation de groupe est résolue en un seul appel de liste par type de ressource"""
+    from api import workload as workload_api
+
+    deploy = MagicMock()
+    deploy.metadata.namespace = "dev"
+    deploy.metadata.name = "api"
+    apps_v1 = MagicMock()
+    apps_v1.list_namespaced_deployment.return_value.items = [deploy]
+    apps_v1.list_namespaced_deployment.return_value.metadata._continue = None
+    apps_v1.list_namespaced_stateful_set.return_value.items = []
+
+    async def run_waves(workloads, mode, hpa_index=None, progress=None):
+        progress["waves"] = [["deploy:dev/api"]]
+
+    with patch.object(workload_api, "apps_v1", apps_v1), \
+         patch.object(workload_api, "run_scale_waves", AsyncMock(side_effect=run_waves)) as mock_waves:
+        result = await workload_api.manage_group(
+            "up", MagicMock(), namespace="dev", label_selector="tier=batch", wait=True
+        )
+
+    assert result["status"] == "success"
+    assert result["matched"] == 1
+    assert result["waves"] == [["deploy:dev/api"]]
+    apps_v1.list_namespaced_deployment.assert_called_once_with(
+        "dev", limit=500, _continue=None, label_selector="tier=batch"
+    )
+    mock_waves.assert_called_once()
+    assert mock_waves.call_args.args == ([("deploy", deploy)], "up")
+
+@pytest.mark.asyncio
+async def test_manage_group_requires_selector():
+    """Une programmation de groupe sans namespace ni sélecteur est refusée"""
+    from api import workload as workload_api
+
+    result = await workload_api.manage_group("down", MagicMock())
+
+    assert result["status"] == "error"
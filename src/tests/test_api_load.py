@@ -0,0 +1,36 @@
+import pytest
+import os
+import sys
+from contextlib import ExitStack
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.bench_api_load import DEFAULT_MIX, in_memory_app, run_load
+from benchmarks.fake_kube import FakeApiServer
+from benchmarks.synthetic_cluster import ClusterSpec
+
+
+@pytest.mark.asyncio
+async def test_load_harness_covers_endpoints(tmp_path):
+    """Une courte charge touche chaque endpoint du mélange, sans erreur, contre le faux apiserver"""
+    with ExitStack() as stack:
+        server = stack.enter_context(FakeApiServer.from_spec(ClusterSpec(pods=60, namespaces=2)))
+        app, db = in_memory_app(stack, server, f"sqlite+aiosqlite:///{tmp_path}/schedule.db")
+        await db.create_table()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as client:
+            rows = await run_load(
+                client, users=3, duration=1.5, schedules=10, scheduler_replicas=1, scheduler_interval=0.5,
+                mix={kind: 1 for kind in DEFAULT_MIX},
+            )
+            schedules = (await client.get("/schedules")).json()
+        await db.engine.dispose()
+
+    assert rows["total"]["errors"] == 0
+    assert {"GET /", "GET /schedules", "GET /schedule/{uid}", "POST /schedule", "PUT /schedules/{id}",
+            "GET /manage/{action}/{type}/{uid}", "GET /schedules (scheduler)"} <= set(rows)
+    assert rows["total"]["p50_ms"] <= rows["total"]["p99_ms"] <= rows["total"]["max_ms"]
+    assert len(schedules) == 10 + rows["POST /schedule"]["count"]
+    assert server.requests[("patch", "deployments")] + server.requests[("patch", "statefulsets")] \
+        == rows["GET /manage/{action}/{type}/{uid}"]["count"]
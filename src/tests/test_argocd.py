@@ -1,5 +1,6 @@
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import AsyncMock, patch, MagicMock, mock_open
 import json
 import os
 import sys
@@ -9,7 +10,16 @@ from jwt import encode as jwt_encode
 
 # Import the module to test
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.argocd import ArgoTokenManager, handle_argocd_auto_sync, enable_auto_sync, patch_argocd_application
+import httpx
+from utils.argocd import (
+    ArgoCDClient,
+    ArgoTokenManager,
+    disable_auto_sync_for_resources,
+    enable_auto_sync,
+    handle_argocd_auto_sync,
+    patch_argocd_application,
+    set_auto_sync_for_applications,
+)
 
 class TestArgoTokenManager:
     
@@ -123,26 +133,6 @@ class TestArgoTokenManager:
         
         assert result is False
     
-    def test_verify_token_valid(self, token_manager, mock_response):
-        """Test de vérification d'un token valide"""
-        token = mock_response.json()["token"]
-        
-        with patch.object(token_manager, '_verify_signature', return_value=True):
-            result = token_manager._verify_token(token)
-            
-            assert result == token
-            token_manager._verify_signature.assert_called_once()
-    
-    def test_verify_token_expired(self, token_manager, mock_response_expired):
-        """Test de vérification d'un token expiré"""
-        token = mock_response_expired.json()["token"]
-        
-        with patch.object(token_manager, '_authenticate', return_value="new-token"):
-            result = token_manager._verify_token(token)
-            
-            assert result == "new-token"
-            token_manager._authenticate.assert_called_once()
-    
     def test_get_token_first_call(self, token_manager):
         """Test de récupération de token pour le premier appel"""
         with patch.object(token_manager, '_authenticate', return_value="test-token"):
@@ -152,15 +142,83 @@ class TestArgoTokenManager:
             token_manager._authenticate.assert_called_once()
     
     def test_get_token_cached(self, token_manager):
-        """Test de récupération de token en cache"""
+        """Test de récupération de token en cache sans décodage à chaque appel"""
         token_manager.token = "cached-token"
+        token_manager.token_expiry = (datetime.now() + timedelta(hours=1)).timestamp()
         
-        with patch.object(token_manager, '_verify_token', return_value="verified-token"):
+        with patch.object(token_manager, '_authenticate') as mock_auth:
             token = token_manager.get_token()
             
-            assert token == "verified-token"
-            token_manager._verify_token.assert_called_once_with("cached-token")
+            assert token == "cached-token"
+            mock_auth.assert_not_called()
+
+    def test_get_token_expired_cache(self, token_manager, mock_response):
+        """Test de réauthentification quand l'expiration mémorisée est dépassée"""
+        token_manager.token = "old-token"
+        token_manager.token_expiry = (datetime.now() - timedelta(minutes=1)).timestamp()
+        new_token = mock_response.json()["token"]
+
+        with patch.object(token_manager, '_authenticate', return_value=new_token):
+            token = token_manager.get_token()
+
+            assert token == new_token
+            assert token_manager.token_expiry > datetime.now().timestamp()
+
+    @pytest.mark.asyncio
+    async def test_aget_token_single_flight(self, token_manager, mock_response):
+        """Test que des rafraîchissements concurrents n'authentifient qu'une fois"""
+        token_manager.token = None
+        token_manager.token_expiry = None
+        new_token = mock_response.json()["token"]
+
+        async def slow_auth():
+            await asyncio.sleep(0.01)
+            return new_token
+
+        with patch.object(token_manager, '_authenticate_async', side_effect=slow_auth) as mock_auth:
+            tokens = await asyncio.gather(*(token_manager.aget_token() for _ in range(10)))
+
+            assert set(tokens) == {new_token}
+            mock_auth.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_aget_token_background_refresh(self, token_manager):
+        """Test du rafraîchissement proactif avant expiration"""
+        token_manager.token = "expiring-token"
+        token_manager.token_expiry = (datetime.now() + timedelta(seconds=30)).timestamp()
+
+        with patch.object(token_manager, '_authenticate_async', new_callable=AsyncMock, return_value="fresh-token") as mock_auth:
+            token = await token_manager.aget_token()
+            assert token == "expiring-token"
+
+            await token_manager._refresh_task
+            mock_auth.assert_called_once()
+            assert token_manager.token == "fresh-token"
+
+    @pytest.mark.asyncio
+    async def test_aget_token_force_refresh_stale(self, token_manager):
+        """Test qu'un 401 sur un token déjà remplacé ne réauthentifie pas"""
+        token_manager.token = "new-token"
+        token_manager.token_expiry = None
+
+        with patch.object(token_manager, '_authenticate_async', new_callable=AsyncMock) as mock_auth:
+            token = await token_manager.aget_token(force_refresh=True, stale_token="old-token")
+
+            assert token == "new-token"
+            mock_auth.assert_not_called()
     
+    @pytest.mark.asyncio
+    async def test_aget_token_force_refresh_without_stale_token(self, token_manager):
+        """Test qu'un rafraîchissement forcé sans stale_token réauthentifie même si le token est valide"""
+        token_manager.token = "valid-token"
+        token_manager.token_expiry = None
+
+        with patch.object(token_manager, '_authenticate_async', new_callable=AsyncMock, return_value="fresh-token") as mock_auth:
+            assert await token_manager.aget_token(force_refresh=True) == "fresh-token"
+            assert await token_manager.aget_token(force_refresh=True, stale_token="fresh-token") == "fresh-token"
+
+            assert mock_auth.call_count == 2
+
     def test_get_token_force_refresh(self, token_manager):
         """Test de rafraîchissement forcé du token"""
         token_manager.token = "old-token"
@@ -328,4 +386,167 @@ class TestArgocdFunctions:
         with patch('requests.get', return_value=mock_get_resp):
             with patch('requests.put', return_value=mock_put_resp):
                 # Aucune assertion directe, vérifie juste que la fonction ne lève pas d'exception
-                patch_argocd_application("test-app", enable_auto_sync=True)
\ No newline at end of file
+                patch_argocd_application("test-app", enable_auto_sync=True)
+
+
+class TestArgoCDClient:
+
+    @pytest.fixture
+    def argocd_client(self):
+        """Fixture pour un ArgoCDClient branché sur un transport httpx simulé"""
+        client = ArgoCDClient()
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            body = json.loads(request.content) if request.content else {}
+            if request.method == "PATCH" and body.get("name") == "missing-app":
+                return httpx.Response(404, json={"error": "not found"})
+            patch_body = json.loads(body.get("patch", "{}"))
+            return httpx.Response(200, json=patch_body)
+
+        client.transport = httpx.MockTransport(handler)
+        client._http = None
+        with patch.object(ArgoTokenManager, "aget_token", new_callable=AsyncMock, return_value="test-token"), \
+             patch.object(ArgoTokenManager(), "ARGOCD_API_URL", "https://argocd-test/api/v1"):
+            yield client, requests_seen
+        client.transport = None
+        client._http = None
+
+    @pytest.mark.asyncio
+    async def test_set_auto_sync_single_merge_patch(self, argocd_client):
+        """Test qu'une bascule d'auto-sync ne fait qu'un seul PATCH merge"""
+        client, requests_seen = argocd_client
+
+        result = await client.set_auto_sync("test-app", enabled=False, verify=True)
+
+        assert len(requests_seen) == 1
+        request = requests_seen[0]
+        assert request.method == "PATCH"
+        assert request.url.path == "/api/v1/applications/test-app"
+        assert request.headers["Authorization"] == "Bearer test-token"
+        body = json.loads(request.content)
+        assert body["patchType"] == "merge"
+        assert json.loads(body["patch"]) == {"spec": {"syncPolicy": {"automated": {"enabled": False}}}}
+        assert result["spec"]["syncPolicy"]["automated"]["enabled"] is False
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_set_auto_sync_restore_policy(self, argocd_client):
+        """Test de restauration de l'auto-sync avec prune et selfHeal"""
+        client, requests_seen = argocd_client
+
+        await client.set_auto_sync("test-app", enabled=True)
+
+        patch_body = json.loads(json.loads(requests_seen[0].content)["patch"])
+        assert patch_body["spec"]["syncPolicy"]["automated"] == {"enabled": True, "prune": True, "selfHeal": True}
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_request_retries_once_on_401(self, argocd_client):
+        """Test qu'un 401 déclenche un seul rafraîchissement forcé puis un retry"""
+        client, _ = argocd_client
+        calls = []
+
+        def handler(request):
+            calls.append(request.headers["Authorization"])
+            if request.headers["Authorization"] == "Bearer revoked-token":
+                return httpx.Response(401)
+            return httpx.Response(200, json={"spec": {}})
+
+        client.transport = httpx.MockTransport(handler)
+        client._http = None
+        with patch.object(ArgoTokenManager, "aget_token", new_callable=AsyncMock,
+                          side_effect=["revoked-token", "fresh-token"]) as mock_token:
+            await client.get_application("test-app")
+
+        assert calls == ["Bearer revoked-token", "Bearer fresh-token"]
+        mock_token.assert_called_with(force_refresh=True, stale_token="revoked-token")
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_set_auto_sync_many_reports_errors(self, argocd_client):
+        """Test de bascule concurrente avec une Application en erreur"""
+        client, requests_seen = argocd_client
+
+        with patch("utils.argocd.argocd_configured", return_value=True):
+            results = await set_auto_sync_for_applications(["app-a", "missing-app", "app-a"], enabled=False)
+
+        assert results["app-a"] is None
+        assert "404" in results["missing-app"]
+        assert len(requests_seen) == 2
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_set_auto_sync_dev_mode_skipped(self, argocd_client):
+        """Test qu'aucune requête n'est émise quand ArgoCD n'est pas configuré"""
+        client, requests_seen = argocd_client
+
+        with patch("utils.argocd.argocd_configured", return_value=False):
+            results = await set_auto_sync_for_applications(["app-a"], enabled=False)
+
+        assert results == {"app-a": None}
+        assert requests_seen == []
+
+
+class TestBulkAutoSyncDeduplication:
+
+    @staticmethod
+    def make_resource(name, namespace, labels):
+        resource = MagicMock()
+        resource.metadata.name = name
+        resource.metadata.namespace = namespace
+        resource.metadata.labels = labels
+        return resource
+
+    @pytest.mark.asyncio
+    async def test_disable_once_per_application(self):
+        """Test que dix workloads d'une même Application ne la désactivent qu'une fois"""
+        resources = [
+            self.make_resource(f"web-{i}", "shop", {"argocd.argoproj.io/instance": "shop"})
+            for i in range(10)
+        ]
+        resources.append(self.make_resource("db", "data", {"app.kubernetes.io/instance": "db"}))
+        applications = [{
+            "metadata": {"name": "db"},
+            "spec": {"destination": {"namespace": "data"}, "syncPolicy": {"automated": {"selfHeal": True}}},
+        }]
+
+        with patch("utils.argocd.argocd_configured", return_value=True), \
+             patch("utils.argocd.list_argocd_applications", return_value=applications) as mock_list, \
+             patch("utils.argocd.set_auto_sync_for_applications", new_callable=AsyncMock,
+                   return_value={"shop": None, "db": None}) as mock_toggle:
+            report = await disable_auto_sync_for_resources(resources)
+
+        mock_list.assert_called_once()
+        mock_toggle.assert_called_once()
+        toggled_apps, = mock_toggle.call_args[0]
+        assert set(toggled_apps) == {"shop", "db"}
+        assert mock_toggle.call_args[1] == {"enabled": False}
+        assert report["shop/web-3"] == ["shop"]
+        assert report["data/db"] == ["db"]
+
+    @pytest.mark.asyncio
+    async def test_manual_sync_applications_left_untouched(self):
+        """Test qu'une Application sans auto-sync actif n'est pas patchée (pas de bloc automated ajouté)"""
+        resources = [
+            self.make_resource("web", "shop", {"argocd.argoproj.io/instance": "shop"}),
+            self.make_resource("api", "blog", {"argocd.argoproj.io/instance": "blog"}),
+            self.make_resource("db", "data", {"argocd.argoproj.io/instance": "data"}),
+        ]
+        applications = [
+            {"metadata": {"name": "shop"}, "spec": {"syncPolicy": {"automated": {"prune": True}}}},
+            {"metadata": {"name": "blog"}, "spec": {}},
+            {"metadata": {"name": "data"}, "spec": {"syncPolicy": {"automated": {"enabled": False}}}},
+        ]
+
+        with patch("utils.argocd.argocd_configured", return_value=True), \
+             patch("utils.argocd.list_argocd_applications", return_value=applications) as mock_list, \
+             patch("utils.argocd.set_auto_sync_for_applications", new_callable=AsyncMock, return_value={}) as mock_toggle:
+            report = await disable_auto_sync_for_resources(resources)
+
+        mock_list.assert_called_once()
+        toggled_apps, = mock_toggle.call_args[0]
+        assert set(toggled_apps) == {"shop"}
+        assert report == {"shop/web": ["shop"], "blog/api": ["blog"], "data/db": ["data"]}
+
@@ -1,15 +1,16 @@
 import pytest
 import sys
 import os
-from datetime import datetime
+import sqlite3
+from datetime import datetime, timedelta, timezone
 import uuid
 from unittest.mock import patch, AsyncMock
 from loguru import logger
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.dbManager import DatabaseManager
-from core.models import WorkloadSchedule
+from core.dbManager import DatabaseManager, percentile
+from core.models import WorkloadSchedule, WorkloadStartup
 
 pytestmark = pytest.mark.asyncio
 
@@ -93,6 +94,35 @@ async def test_update_schedule(db_manager, stored_schedule):
     assert updated_schedule.cron_start == "0 9 * * 1-5"
     logger.success("Planification mise à jour avec succès")
 
+async def test_put_crons_keeps_other_fields(tmp_path):
+    """Un PUT de l'UI (crons seulement) conserve l'avance et la cible de groupe"""
+    import httpx
+    from fastapi import FastAPI
+    from api.scheduler import scheduler
+
+    manager = DatabaseManager(database_url=f"sqlite+aiosqlite:///{tmp_path}/schedule.db")
+    await manager.create_table()
+    await manager.store_schedule_status({
+        "uid": "group-team-a", "name": "team-a", "cron_start": "0 8 * * 1-5", "cron_stop": "0 18 * * 1-5",
+        "lead_time": 600, "auto_lead_time": True, "target_namespace": "team-a", "label_selector": "tier=web",
+    })
+    stored = await manager.get_schedule("group-team-a")
+
+    app = FastAPI()
+    app.include_router(scheduler)
+    with patch("api.scheduler.db_manager", manager):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.put(f"/schedules/{stored.id}", json={
+                "id": stored.id, "uid": "group-team-a", "cron_start": "0 7 * * 1-5", "cron_stop": "0 19 * * 1-5",
+                "active": True, "status": "scheduled", "last_update": datetime.now(timezone.utc).isoformat(),
+            })
+    assert response.status_code == 200
+
+    updated = await manager.get_schedule("group-team-a")
+    assert (updated.cron_start, updated.cron_stop, updated.name) == ("0 7 * * 1-5", "0 19 * * 1-5", "team-a")
+    assert (updated.lead_time, updated.auto_lead_time) == (600, True)
+    assert (updated.target_namespace, updated.label_selector) == ("team-a", "tier=web")
+
 async def test_delete_schedule(db_manager, stored_schedule):
     logger.info(f"Test: Suppression de la planification avec ID {stored_schedule.id}")
     success = await db_manager.delete_schedule(stored_schedule.id)
@@ -124,3 +154,48 @@ async def test_store_uid_mock(mock_db_manager, test_uid):
     assert schedule.name == "Test Workload"
     mock_db_manager.store_uid.assert_called_once_with(test_uid, "Test Workload")
     mock_db_manager.get_schedule.assert_called_once_with(test_uid)
+
+def test_percentile():
+    values = [float(v) for v in range(1, 21)]
+    assert percentile(values, 50) == 10.0
+    assert percentile(values, 95) == 19.0
+    assert percentile([], 95) is None
+
+async def test_startup_summary(tmp_path):
+    manager = DatabaseManager(database_url=f"sqlite+aiosqlite:///{tmp_path}/schedule.db")
+    await manager.create_table()
+    now = datetime.now(timezone.utc)
+    for i, duration in enumerate([30.0, 60.0, 90.0, 600.0]):
+        await manager.store_startup_metric(WorkloadStartup(
+            uid="uid-1", name="api", started_at=now - timedelta(days=1, minutes=i), duration_seconds=duration
+        ))
+    await manager.store_startup_metric(WorkloadStartup(
+        uid="uid-1", name="api", started_at=now, timed_out=True
+    ))
+
+    summary = await manager.get_startup_summary(samples=3)
+    await manager.close()
+
+    assert summary["uid-1"]["count"] == 3
+    assert summary["uid-1"]["p95"] == 90.0
+
+async def test_create_table_adds_missing_columns(tmp_path):
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE workloadschedule (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, uid VARCHAR NOT NULL, "
+        "last_update DATETIME NOT NULL, status VARCHAR(13) NOT NULL, active BOOLEAN NOT NULL, "
+        "cron_start VARCHAR, cron_stop VARCHAR)"
+    )
+    conn.execute("INSERT INTO workloadschedule VALUES (1, 'api', 'uid-1', '2025-01-01 00:00:00', 'NOT_SCHEDULED', 1, NULL, NULL)")
+    conn.commit()
+    conn.close()
+
+    manager = DatabaseManager(database_url=f"sqlite+aiosqlite:///{path}")
+    await manager.create_table()
+    schedule = await manager.get_schedule("uid-1")
+    await manager.close()
+
+    assert schedule.lead_time is None
+    assert schedule.auto_lead_time is False
+
@@ -0,0 +1,76 @@
+import pytest
+import os
+import sys
+import threading
+import tracemalloc
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.debug import debug
+
+TOKEN = {"X-Debug-Token": "s3cret"}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(debug)
+    with patch("api.debug.debug_endpoints", True), patch("api.debug.debug_token", "s3cret"):
+        yield TestClient(app)
+    tracemalloc.stop()
+
+
+def test_debug_endpoints_are_guarded(client):
+    """Désactivés : 404 ; activés : token obligatoire"""
+    with patch("api.debug.debug_endpoints", False):
+        assert client.get("/debug/memory", headers=TOKEN).status_code == 404
+    with patch("api.debug.debug_token", ""):
+        assert client.get("/debug/memory").status_code == 404
+    assert client.get("/debug/memory").status_code == 403
+    assert client.get("/debug/memory", headers={"X-Debug-Token": "wrong"}).status_code == 403
+    assert client.get("/debug/memory", headers=TOKEN).status_code == 409
+
+
+def _busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profile_samples_running_threads(client):
+    """Le profil voit un thread occupé, en piles repliées comme en texte"""
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_loop, args=(stop,), name="busy")
+    worker.start()
+    try:
+        collapsed = client.get("/debug/profile", params={"seconds": 0.3}, headers=TOKEN)
+        text = client.get("/debug/profile", params={"seconds": 0.3, "format": "text"}, headers=TOKEN)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert collapsed.status_code == 200
+    busy = [line for line in collapsed.text.splitlines() if line.startswith("busy;")]
+    assert busy and all("_busy_loop (test_debug.py:" in line for line in busy)
+    assert int(busy[0].rsplit(" ", 1)[1]) > 0
+    assert "_busy_loop (test_debug.py:" in text.text and "cumulative" in text.text
+
+
+def test_memory_report_diff_and_snapshot(client, tmp_path):
+    """Le diff entre deux rapports montre l'allocation faite entre les deux"""
+    assert client.post("/debug/memory/start", headers=TOKEN).json()["status"] == "started"
+    first = client.get("/debug/memory", headers=TOKEN)
+    assert "top 25 allocations" in first.text
+
+    retained = [bytearray(1024) for _ in range(2000)]  # noqa: F841
+    report = client.get("/debug/memory", params={"top": 5}, headers=TOKEN).text
+    assert "differences since the previous report" in report
+    assert "test_debug.py" in report.split("\n", 3)[3]
+
+    snapshot = client.get("/debug/memory/snapshot", headers=TOKEN)
+    assert snapshot.headers["content-type"] == "application/octet-stream"
+    (tmp_path / "memory.snapshot").write_bytes(snapshot.content)
+    assert tracemalloc.Snapshot.load(str(tmp_path / "memory.snapshot")).traces
+    assert client.post("/debug/memory/stop", headers=TOKEN).json()["status"] == "stopped"
@@ -0,0 +1,83 @@
+import pytest
+import os
+import sys
+import threading
+import time
+
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fake_kube import FakeApiServer, Faults
+from benchmarks.synthetic_cluster import ClusterSpec, FakeCluster
+from core.kub_list import iter_list, list_all_deployments, list_all_sts
+
+
+@pytest.fixture
+def fake_apiserver():
+    with FakeApiServer.from_spec(ClusterSpec(pods=120, namespaces=2), ready_delay=0.1, seed=1) as server:
+        yield server
+
+
+def test_fake_apiserver_inventory_and_scale(fake_apiserver):
+    """Les vrais clients listent (pages, sélecteurs), patchent et suivent un scale par watch"""
+    apps_v1, core_v1 = fake_apiserver.apps_v1(), fake_apiserver.core_v1()
+    args = (apps_v1, core_v1, ["kube-system"], {})
+    reference = FakeCluster(ClusterSpec(pods=120, namespaces=2))
+    ref_args = (reference.apps_v1, reference.core_v1, ["kube-system"], {})
+
+    assert list_all_deployments(*args) == list_all_deployments(*ref_args)
+    assert list_all_sts(*args, lean=True) == list_all_sts(*ref_args, lean=True)
+    assert len(list(iter_list(core_v1.list_pod_for_all_namespaces, limit=7))) == len(fake_apiserver.objects("pods"))
+
+    deployment = apps_v1.list_namespaced_deployment("team-0").items[0]
+    name, rv = deployment.metadata.name, apps_v1.list_namespaced_deployment("team-0").metadata.resource_version
+    events = []
+
+    def follow():
+        for event in watch.Watch().stream(core_v1.list_namespaced_pod, "team-0", resource_version=rv, timeout_seconds=1):
+            events.append(event["type"])
+
+    watcher = threading.Thread(target=follow)
+    watcher.start()
+    time.sleep(0.1)
+    patched = apps_v1.patch_namespaced_deployment(name, "team-0", {"spec": {"replicas": 5}})
+    assert (patched.spec.replicas, patched.status.ready_replicas) == (5, 3)
+    time.sleep(0.3)
+    assert apps_v1.read_namespaced_deployment_status(name, "team-0").status.ready_replicas == 5
+    apps_v1.patch_namespaced_deployment_scale(name, "team-0", {"spec": {"replicas": 0}})
+    watcher.join()
+
+    assert events == ["ADDED"] * 2 + ["DELETED"] * 5
+    assert apps_v1.list_replica_set_for_all_namespaces(field_selector="status.replicas=0").items
+
+
+def test_fake_apiserver_fault_injection():
+    """Erreurs, limitation de débit (429) et watch trop ancien (410) remontent en ApiException"""
+    server = FakeApiServer.from_spec(
+        ClusterSpec(pods=60, namespaces=2),
+        faults=Faults(qps=1, burst=1, retry_after=0),
+        verb_faults={"patch": Faults(error_rate=1.0, error_status=503)},
+        history=1,
+    )
+    with server:
+        apps_v1 = server.apps_v1()
+        deployments = apps_v1.list_namespaced_deployment("team-0")
+        with pytest.raises(ApiException) as throttled:
+            apps_v1.list_namespaced_deployment("team-0")
+        assert throttled.value.status == 429
+
+        server.faults = Faults()
+        name = deployments.items[0].metadata.name
+        with pytest.raises(ApiException) as failed:
+            apps_v1.patch_namespaced_deployment(name, "team-0", {"spec": {"replicas": 1}})
+        assert failed.value.status == 503
+
+        server.verb_faults = {}
+        for replicas in (1, 2):
+            apps_v1.patch_namespaced_deployment_scale(name, "team-0", {"spec": {"replicas": replicas}})
+        with pytest.raises(ApiException) as expired:
+            list(watch.Watch().stream(apps_v1.list_namespaced_deployment, "team-0",
+                                      resource_version=deployments.metadata.resource_version, timeout_seconds=1))
+        assert expired.value.status == 410
+    assert server.injected[503] == 1 and server.injected[429] >= 1
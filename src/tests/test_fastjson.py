@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.inventory import PodRecord
+from core.models import ScheduleStatus
+from utils import fastjson
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Exécute le test avec orjson (s'il est installé) puis avec le fallback stdlib"""
+    if request.param == "orjson" and fastjson.orjson is None:
+        pytest.skip("orjson not installed")
+    if request.param == "stdlib":
+        monkeypatch.setattr(fastjson, "orjson", None)
+    return request.param
+
+
+def test_dumps_supported_types(backend):
+    """Dataclasses, dates, enums et clés non str sont sérialisés par les deux backends"""
+    pod = PodRecord(name="api-0", node=None, status="Running", has_pvc=False,
+                    resource_requests={"cpu": "100m"}, resource_limits={})
+    payload = {
+        "pod": pod,
+        "at": datetime(2025, 1, 1, tzinfo=timezone.utc),
+        "status": ScheduleStatus.SCHEDULED,
+        1: "non-str key",
+    }
+
+    data = json.loads(fastjson.dumps(payload))
+
+    assert data["pod"]["name"] == "api-0"
+    assert data["pod"]["resource_requests"] == {"cpu": "100m"}
+    assert data["at"].startswith("2025-01-01T00:00:00")
+    assert data["status"] == "scheduled"
+    assert data["1"] == "non-str key"
+
+
+def test_dumps_custom_default(backend):
+    """Le sink de logs passe default=str pour ne jamais perdre une ligne"""
+    assert json.loads(fastjson.dumps_str({"obj": object}, default=str))["obj"] == str(object)
+
+
+def test_loads(backend):
+    assert fastjson.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+
+def test_fast_json_response(backend):
+    response = fastjson.FastJSONResponse({"status": "ok"})
+
+    assert json.loads(response.body) == {"status": "ok"}
+    assert response.media_type == "application/json"
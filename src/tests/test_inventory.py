@@ -0,0 +1,42 @@
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.inventory import DaemonSetRecord, DaemonSetStatus, PodRecord, WorkloadRecord, dumps_records, intern_mapping
+
+
+def test_intern_mapping_shares_equal_maps():
+    """Des maps de labels égales sont partagées entre records"""
+    first = intern_mapping({"app": "api", "team": "shop"})
+    second = intern_mapping({"team": "shop", "app": "api"})
+
+    assert first is second
+    assert first == {"app": "api", "team": "shop"}
+    assert intern_mapping(None) is None
+
+
+def test_records_are_slotted():
+    """Les records n'ont pas de __dict__ par instance"""
+    pod = PodRecord(name="api-0", node="node-1", status="Running", has_pvc=False,
+                    resource_requests={}, resource_limits={})
+
+    assert not hasattr(pod, "__dict__")
+
+
+def test_dumps_records():
+    """Les records imbriqués sont sérialisés directement en JSON"""
+    pod = PodRecord(name="agent-x", node="node-1", status="Running", has_pvc=False,
+                    resource_requests={"cpu": "100m"}, resource_limits={}, start_time=None, node_conditions="")
+    deploy = WorkloadRecord(namespace="shop", name="api", uid="uid-1", replicas=1,
+                            available_replicas=1, ready_replicas=1, labels={"app": "api"})
+    ds = DaemonSetRecord(namespace="shop", name="agent", uid="uid-2", labels=None,
+                         status=DaemonSetStatus(1, 1, 1, 1, 1, 0), pods=[pod],
+                         update_strategy="RollingUpdate", selector=None)
+
+    data = json.loads(dumps_records({"deploy": [deploy], "ds": [ds]}))
+
+    assert data["deploy"][0]["labels"] == {"app": "api"}
+    assert data["deploy"][0]["pods"] == []
+    assert data["ds"][0]["status"]["number_misscheduled"] == 0
+    assert data["ds"][0]["pods"][0]["resource_requests"] == {"cpu": "100m"}
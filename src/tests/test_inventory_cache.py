@@ -0,0 +1,112 @@
+import pytest
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fake_kube import FakeApiServer, Faults
+from benchmarks.synthetic_cluster import ClusterSpec
+from core.inventory_cache import SNAPSHOT_MAGIC, InventoryCache
+from core.kub_list import list_lean_daemonsets, list_lean_deployments, list_lean_sts
+from utils.fastjson import loads
+
+PROTECTED = ["kube-system"]
+
+
+@pytest.fixture
+def server():
+    with FakeApiServer.from_spec(ClusterSpec(pods=120, namespaces=2), ready_delay=0.05, seed=1) as server:
+        yield server
+
+
+def _cache(server, tmp_path):
+    return InventoryCache(server.apps_v1(), server.core_v1(), PROTECTED, {},
+                          snapshot_path=str(tmp_path / "inventory.snapshot"), snapshot_interval=0, watch_timeout=2)
+
+
+def _eventually(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.02)
+
+
+def _listed(server):
+    args = (server.apps_v1(), server.core_v1(), PROTECTED, {})
+    return list_lean_deployments(*args), list_lean_sts(*args), list_lean_daemonsets(*args)
+
+
+def _scale(server, replicas):
+    apps_v1 = server.apps_v1()
+    name = apps_v1.list_namespaced_deployment("team-0").items[0].metadata.name
+    apps_v1.patch_namespaced_deployment_scale(name, "team-0", {"spec": {"replicas": replicas}})
+    return name
+
+
+def _cached(cache):
+    return cache.deployments(), cache.statefulsets(), cache.daemonsets()
+
+
+def test_cache_matches_listing_and_follows_watches(server, tmp_path):
+    """Le cache sert les mêmes records que les listes directes, puis suit les watches"""
+    cache = _cache(server, tmp_path)
+    cache.start()
+    try:
+        assert cache.wait_available(5) and not cache.loaded_from_snapshot
+        assert _cached(cache) == _listed(server)
+
+        name = _scale(server, 0)
+        _eventually(lambda: next(d for d in cache.deployments() if d.name == name).pods == [])
+        assert _cached(cache) == _listed(server)
+    finally:
+        cache.stop()
+    assert os.path.exists(tmp_path / "inventory.snapshot")
+
+
+def test_warm_restart_serves_snapshot_and_resumes_watches(server, tmp_path):
+    """Au redémarrage, l'instantané est servi tout de suite et les watches reprennent sans reliste"""
+    first = _cache(server, tmp_path)
+    first.start()
+    first.wait_available(5)
+    first.stop()
+    before = _cached(first)
+
+    with open(tmp_path / "inventory.snapshot", "rb") as f:
+        data = f.read()
+    assert data.startswith(SNAPSHOT_MAGIC) and "deployments" in loads(data[len(SNAPSHOT_MAGIC):])["reflectors"]
+
+    name = _scale(server, 0)  # pendant l'arrêt
+    lists = sum(count for (verb, _), count in server.requests.items() if verb == "list")
+    server.verb_faults["watch"] = Faults(latency=0.5)
+    second = _cache(server, tmp_path)
+    second.start()
+    try:
+        # Watches pas encore repris : l'instantané est servi tel quel, marqué stale
+        assert second.loaded_from_snapshot and second.available and second.deployments() == before[0]
+        assert second.stale
+        _eventually(lambda: not second.stale)
+        _eventually(lambda: next(d for d in second.deployments() if d.name == name).pods == [])
+        assert sum(count for (verb, _), count in server.requests.items() if verb == "list") == lists
+        assert all(reflector["relists"] == 0 for reflector in second.status()["reflectors"].values())
+        assert not second.stale and _cached(second) == _listed(server) != before
+    finally:
+        second.stop()
+
+
+def test_expired_snapshot_resource_version_relists(tmp_path):
+    """Un resourceVersion compacté par l'apiserver (410 Gone) déclenche une nouvelle liste"""
+    with FakeApiServer.from_spec(ClusterSpec(pods=60, namespaces=2), ready_delay=0.05, history=3, seed=1) as server:
+        first = _cache(server, tmp_path)
+        first.start()
+        first.wait_available(5)
+        first.stop()
+        for replicas in (0, 2, 0):
+            _scale(server, replicas)
+
+        second = _cache(server, tmp_path)
+        second.start()
+        try:
+            _eventually(lambda: second.status()["reflectors"]["deployments"]["relists"] == 1)
+            _eventually(lambda: _cached(second) == _listed(server))
+        finally:
+            second.stop()
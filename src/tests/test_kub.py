@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import MagicMock, patch
 import sys
@@ -15,8 +16,14 @@ from core.kub_list import (
     process_deployment,
     list_all_sts,
     meets_sts_criteria,
-    process_statefulset
+    process_statefulset,
+    build_label_selector,
+    build_namespace_field_selector,
+    list_filtered,
+    iter_list,
+    index_pods_by_owner,
 )
+from kubernetes.client import ApiClient
 
 protected_labels = {
     "app.kubernetes.io/part-of": "argocd"
@@ -113,26 +120,26 @@ def test_get_pod_details_daemonset(mock_pod):
     """Test de get_pod_details pour un DaemonSet"""
     result = get_pod_details(mock_pod, owner_type="DaemonSet", owner_name="test-daemonset")
     
-    assert result["name"] == "test-pod"
-    assert result["node"] == "test-node"
-    assert result["status"] == "Running"
-    assert result["has_pvc"] is False
-    assert result["resource_requests"] == {"cpu": "100m", "memory": "128Mi"}
-    assert result["resource_limits"] == {"cpu": "200m", "memory": "256Mi"}
-    assert result["start_time"] == "2025-05-07T12:00:00Z"
-    assert result["node_conditions"] == ""
+    assert result.name == "test-pod"
+    assert result.node == "test-node"
+    assert result.status == "Running"
+    assert result.has_pvc is False
+    assert result.resource_requests == {"cpu": "100m", "memory": "128Mi"}
+    assert result.resource_limits == {"cpu": "200m", "memory": "256Mi"}
+    assert result.start_time == "2025-05-07T12:00:00Z"
+    assert result.node_conditions == ""
 
 
 def test_get_pod_details_deployment(mock_pod):
     """Test de get_pod_details pour un Deployment"""
     result = get_pod_details(mock_pod, owner_type="Deployment", owner_name="test-replicaset")
     
-    assert result["name"] == "test-pod"
-    assert result["node"] == "test-node"
-    assert result["status"] == "Running"
-    assert result["has_pvc"] is False
-    assert result["uid"] == "test-pod-uid"
-    assert result["replicaset"] == "test-replicaset"
+    assert result.name == "test-pod"
+    assert result.node == "test-node"
+    assert result.status == "Running"
+    assert result.has_pvc is False
+    assert result.uid == "test-pod-uid"
+    assert result.replicaset == "test-replicaset"
 
 
 def test_get_pod_details_with_pvc(mock_pod):
@@ -141,7 +148,7 @@ def test_get_pod_details_with_pvc(mock_pod):
     
     result = get_pod_details(mock_pod)
     
-    assert result["has_pvc"] is True
+    assert result.has_pvc is True
 
 
 def test_filter_pods_by_owner_daemonset(mock_pod):
@@ -152,7 +159,7 @@ def test_filter_pods_by_owner_daemonset(mock_pod):
     result = filter_pods_by_owner([mock_pod], "DaemonSet", owner_name="test-daemonset")
     
     assert len(result) == 1
-    assert result[0]["name"] == "test-pod"
+    assert result[0].name == "test-pod"
 
 
 def test_filter_pods_by_owner_statefulset(mock_pod):
@@ -163,7 +170,7 @@ def test_filter_pods_by_owner_statefulset(mock_pod):
     result = filter_pods_by_owner([mock_pod], "StatefulSet", owner_uid="test-sts-uid")
     
     assert len(result) == 1
-    assert result[0]["name"] == "test-pod"
+    assert result[0].name == "test-pod"
 
 
 def test_filter_pods_by_owner_replicaset(mock_pod):
@@ -174,7 +181,7 @@ def test_filter_pods_by_owner_replicaset(mock_pod):
     result = filter_pods_by_owner([mock_pod], "ReplicaSet", owner_name="test-replicaset")
     
     assert len(result) == 1
-    assert result[0]["name"] == "test-pod"
+    assert result[0].name == "test-pod"
 
 
 def test_filter_pods_by_owner_no_match(mock_pod):
@@ -219,12 +226,12 @@ def test_get_daemonset_status(mock_daemonset):
     """Test de get_daemonset_status"""
     result = get_daemonset_status(mock_daemonset)
     
-    assert result["desired_number_scheduled"] == 3
-    assert result["current_number_scheduled"] == 3
-    assert result["number_ready"] == 3
-    assert result["updated_number_scheduled"] == 3
-    assert result["number_available"] == 3
-    assert result["number_misscheduled"] == 0
+    assert result.desired_number_scheduled == 3
+    assert result.current_number_scheduled == 3
+    assert result.number_ready == 3
+    assert result.updated_number_scheduled == 3
+    assert result.number_available == 3
+    assert result.number_misscheduled == 0
 
 
 def test_create_daemonset_info(mock_daemonset):
@@ -242,14 +249,14 @@ def test_create_daemonset_info(mock_daemonset):
     
     result = create_daemonset_info(mock_daemonset, status, pod_info)
     
-    assert result["namespace"] == "test-namespace"
-    assert result["name"] == "test-daemonset"
-    assert result["uid"] == "test-ds-uid"
-    assert result["labels"] == {"app": "test-app"}
-    assert result["status"] == status
-    assert result["pods"] == pod_info
-    assert result["update_strategy"] == "RollingUpdate"
-    assert result["selector"] == {"app": "test-app"}
+    assert result.namespace == "test-namespace"
+    assert result.name == "test-daemonset"
+    assert result.uid == "test-ds-uid"
+    assert result.labels == {"app": "test-app"}
+    assert result.status == status
+    assert result.pods == pod_info
+    assert result.update_strategy == "RollingUpdate"
+    assert result.selector == {"app": "test-app"}
 
 
 def test_list_all_daemonsets():
@@ -281,8 +288,8 @@ def test_list_all_daemonsets():
     result = list_all_daemonsets(apps_v1, core_v1, ["kube-system"], protected_labels)
     
     assert len(result) == 1
-    assert result[0]["name"] == "test-daemonset"
-    assert result[0]["namespace"] == "test-namespace"
+    assert result[0].name == "test-daemonset"
+    assert result[0].namespace == "test-namespace"
     
     apps_v1.list_daemon_set_for_all_namespaces.assert_called_once()
     core_v1.list_namespaced_pod.assert_called_once_with("test-namespace")
@@ -357,15 +364,15 @@ def test_process_deployment(mock_deployment):
     
     result = process_deployment(mock_deployment, apps_v1, core_v1)
     
-    assert result["namespace"] == "test-namespace"
-    assert result["name"] == "test-deployment"
-    assert result["uid"] == "test-deploy-uid"
-    assert result["replicas"] == 3
-    assert result["available_replicas"] == 3
-    assert result["ready_replicas"] == 3
-    assert result["labels"] == {"app": "test-app"}
-    assert len(result["pods"]) == 1
-    assert result["pods"][0]["name"] == "test-pod"
+    assert result.namespace == "test-namespace"
+    assert result.name == "test-deployment"
+    assert result.uid == "test-deploy-uid"
+    assert result.replicas == 3
+    assert result.available_replicas == 3
+    assert result.ready_replicas == 3
+    assert result.labels == {"app": "test-app"}
+    assert len(result.pods) == 1
+    assert result.pods[0].name == "test-pod"
     
     apps_v1.list_namespaced_replica_set.assert_called_once()
     core_v1.list_namespaced_pod.assert_called_once_with("test-namespace", watch=False)
@@ -401,8 +408,8 @@ def test_list_all_deployments():
         result = list_all_deployments(apps_v1, core_v1, ["kube-system"], protected_labels)
     
     assert len(result) == 1
-    assert result[0]["name"] == "test-deployment"
-    assert result[0]["namespace"] == "test-namespace"
+    assert result[0].name == "test-deployment"
+    assert result[0].namespace == "test-namespace"
     
     apps_v1.list_deployment_for_all_namespaces.assert_called_once()
     mock_process.assert_called_once_with(deployment, apps_v1, core_v1)
@@ -505,14 +512,14 @@ def test_process_statefulset(mock_statefulset):
     
     result = process_statefulset(mock_statefulset, core_v1)
     
-    assert result["namespace"] == "test-namespace"
-    assert result["name"] == "test-statefulset"
-    assert result["uid"] == "test-sts-uid"
-    assert result["replicas"] == 3
-    assert result["available_replicas"] == 3
-    assert result["ready_replicas"] == 3
-    assert "argocd.argoproj.io/instance" in result["labels"]
-    assert len(result["pods"]) == 1
+    assert result.namespace == "test-namespace"
+    assert result.name == "test-statefulset"
+    assert result.uid == "test-sts-uid"
+    assert result.replicas == 3
+    assert result.available_replicas == 3
+    assert result.ready_replicas == 3
+    assert "argocd.argoproj.io/instance" in result.labels
+    assert len(result.pods) == 1
     
     core_v1.list_namespaced_pod.assert_called_once_with("test-namespace", watch=False)
 
@@ -553,8 +560,8 @@ def test_list_all_sts():
         result = list_all_sts(apps_v1, core_v1, ["kube-system"], protected_labels)
     
     assert len(result) == 1
-    assert result[0]["name"] == "test-statefulset"
-    assert result[0]["namespace"] == "test-namespace"
+    assert result[0].name == "test-statefulset"
+    assert result[0].namespace == "test-namespace"
     
     apps_v1.list_stateful_set_for_all_namespaces.assert_called_once()
     mock_process.assert_called_once_with(statefulset, core_v1)
@@ -595,3 +602,163 @@ def test_list_all_sts_api_exception():
     assert result["status"] == "error"
     assert "message" in result
     assert "API Error" in result["message"]
+
+
+def test_build_selectors():
+    """Les filtres protégés sont traduits en sélecteurs apiserver"""
+    assert build_label_selector(protected_labels) == "app.kubernetes.io/part-of!=argocd"
+    assert build_namespace_field_selector(["kube-system", "kube-public"]) == (
+        "metadata.namespace!=kube-system,metadata.namespace!=kube-public"
+    )
+
+
+def make_page(items, continue_token=None):
+    """Crée une page de liste Kubernetes"""
+    page = MagicMock()
+    page.items = items
+    page.metadata._continue = continue_token
+    return page
+
+
+def make_object(namespace, uid):
+    """Crée un objet Kubernetes minimal"""
+    obj = MagicMock()
+    obj.metadata.namespace = namespace
+    obj.metadata.uid = uid
+    return obj
+
+
+def test_list_filtered_cluster_wide():
+    """Sans allow-list, un seul appel cluster-wide avec les sélecteurs"""
+    a = make_object("dev", "uid-a")
+    list_all = MagicMock(return_value=make_page([a]))
+    list_namespaced = MagicMock()
+
+    items = list_filtered(list_all, list_namespaced, ["kube-system"], protected_labels,
+                          field_selector="spec.nodeName=node-1")
+
+    assert items == [a]
+    list_namespaced.assert_not_called()
+    list_all.assert_called_once_with(
+        limit=500,
+        _continue=None,
+        watch=False,
+        label_selector="app.kubernetes.io/part-of!=argocd",
+        field_selector="spec.nodeName=node-1,metadata.namespace!=kube-system",
+    )
+
+
+def test_list_filtered_allowed_namespaces():
+    """Avec une allow-list courte, une liste par namespace non protégé"""
+    list_all = MagicMock()
+    list_namespaced = MagicMock()
+    list_namespaced.side_effect = lambda ns, **kwargs: make_page([make_object(ns, f"uid-{ns}")])
+
+    items = list_filtered(list_all, list_namespaced, ["kube-system"], allowed_namespaces=["dev", "kube-system", "shop"])
+
+    assert [item.metadata.namespace for item in items] == ["dev", "shop"]
+    list_all.assert_not_called()
+    list_namespaced.assert_any_call("dev", limit=500, _continue=None, watch=False)
+
+
+def test_iter_list_follows_continue_token():
+    """Les pages sont parcourues avec limit/_continue"""
+    a, b = make_object("dev", "uid-a"), make_object("dev", "uid-b")
+    list_fn = MagicMock(side_effect=[make_page([a], "token-1"), make_page([b])])
+
+    assert list(iter_list(list_fn, limit=1)) == [a, b]
+    list_fn.assert_called_with(limit=1, _continue="token-1")
+
+
+def test_iter_list_restarts_on_expired_token():
+    """Un jeton continue expiré (410) relance la liste sans doublons"""
+    from kubernetes.client.exceptions import ApiException
+
+    a, b = make_object("dev", "uid-a"), make_object("dev", "uid-b")
+    list_fn = MagicMock(side_effect=[
+        make_page([a], "token-1"),
+        ApiException(status=410),
+        make_page([a], "token-2"),
+        make_page([b]),
+    ])
+
+    assert list(iter_list(list_fn, limit=1)) == [a, b]
+    assert list_fn.call_count == 4
+
+
+def test_index_pods_by_owner():
+    """Les pods sont indexés par UID de leur propriétaire"""
+    owner = MagicMock()
+    owner.kind = "StatefulSet"
+    owner.uid = "sts-uid"
+    pod = MagicMock()
+    pod.metadata.owner_references = [owner]
+    pod.spec.volumes = []
+    pod.spec.containers = []
+
+    index = index_pods_by_owner([pod], "StatefulSet")
+
+    assert list(index) == ["sts-uid"]
+    assert index["sts-uid"][0].name == pod.metadata.name
+
+
+class FakeListCall:
+    """Simule une méthode de liste du client : modèles OpenAPI, ou réponse brute avec _preload_content=False"""
+
+    def __init__(self, items, klass):
+        self.body = {"metadata": {}, "items": items}
+        self.klass = klass
+
+    def __call__(self, *args, _preload_content=True, **kwargs):
+        if not _preload_content:
+            return MagicMock(data=json.dumps(self.body).encode())
+        return ApiClient()._ApiClient__deserialize(self.body, self.klass)
+
+
+def raw_object(name, uid, owner=None, **fields):
+    """Crée un objet Kubernetes en JSON brut"""
+    metadata = {"name": name, "namespace": "shop", "uid": uid, "labels": {"app": name},
+                "creationTimestamp": "2025-01-01T00:00:00Z"}
+    if owner:
+        metadata["ownerReferences"] = [{"apiVersion": "apps/v1", "kind": owner[0], "name": owner[1],
+                                        "uid": owner[2]}]
+    return {"metadata": metadata, **fields}
+
+
+def test_lean_listing_matches_model_listing():
+    """Le listing JSON brut produit le même inventaire que le listing par modèles"""
+    pod_spec = {
+        "nodeName": "node-1",
+        "containers": [{"name": "c", "resources": {"requests": {"cpu": "100m"}, "limits": {"memory": "1Gi"}}}],
+        "volumes": [{"name": "data", "persistentVolumeClaim": {"claimName": "data"}}],
+    }
+    pod_status = {"phase": "Running", "startTime": "2025-01-01T00:00:00Z"}
+    status = {"replicas": 2, "availableReplicas": 1, "readyReplicas": 1}
+
+    apps_v1 = MagicMock()
+    core_v1 = MagicMock()
+    apps_v1.list_deployment_for_all_namespaces = FakeListCall(
+        [raw_object("api", "deploy-uid", spec={"selector": {"matchLabels": {"app": "api"}}, "template": {}},
+                    status=status)], "V1DeploymentList")
+    apps_v1.list_replica_set_for_all_namespaces = FakeListCall(
+        [raw_object("api-1", "rs-uid", owner=("Deployment", "api", "deploy-uid"),
+                    spec={"selector": {"matchLabels": {"app": "api"}}})], "V1ReplicaSetList")
+    apps_v1.list_stateful_set_for_all_namespaces = FakeListCall(
+        [raw_object("db", "sts-uid", spec={"selector": {}, "template": {}, "serviceName": "db"},
+                    status=status)], "V1StatefulSetList")
+    apps_v1.list_daemon_set_for_all_namespaces = FakeListCall(
+        [raw_object("agent", "ds-uid", spec={"selector": {"matchLabels": {"app": "agent"}}, "template": {},
+                                             "updateStrategy": {"type": "RollingUpdate"}},
+                    status={"desiredNumberScheduled": 1, "currentNumberScheduled": 1, "numberReady": 1,
+                            "numberMisscheduled": 0})], "V1DaemonSetList")
+    core_v1.list_pod_for_all_namespaces = FakeListCall([
+        raw_object("api-1-x", "pod-1", owner=("ReplicaSet", "api-1", "rs-uid"), spec=pod_spec, status=pod_status),
+        raw_object("db-0", "pod-2", owner=("StatefulSet", "db", "sts-uid"), spec=pod_spec, status=pod_status),
+        raw_object("agent-x", "pod-3", owner=("DaemonSet", "agent", "ds-uid"), spec=pod_spec, status=pod_status),
+    ], "V1PodList")
+
+    for list_all in (list_all_deployments, list_all_sts, list_all_daemonsets):
+        model = list_all(apps_v1, core_v1, ["kube-system"], protected_labels, lean=False)
+        lean = list_all(apps_v1, core_v1, ["kube-system"], protected_labels, lean=True)
+        assert lean == model
+        assert len(lean) == 1 and len(lean[0].pods) == 1
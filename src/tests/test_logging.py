@@ -0,0 +1,67 @@
+import io
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.logging_config import BatchingWriter, CallSiteRateLimiter
+
+
+def make_record(level_no=10, line=42, path="/app/core/kub_list.py"):
+    """Crée un record loguru minimal pour le filtre"""
+    level = MagicMock()
+    level.no = level_no
+    file = MagicMock()
+    file.path = path
+    return {"level": level, "line": line, "file": file, "extra": {}}
+
+
+def test_writer_writes_batches_in_background():
+    """Les lignes mises en file sont écrites en JSON par le thread du writer"""
+    stream = io.StringIO()
+    writer = BatchingWriter(stream=stream)
+
+    for i in range(3):
+        writer.put({"message": f"line {i}"})
+    writer.flush()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["message"] for line in lines] == ["line 0", "line 1", "line 2"]
+
+
+def test_writer_reports_dropped_lines():
+    """Une file pleine ne bloque pas l'appelant, les pertes sont signalées"""
+    stream = io.StringIO()
+    writer = BatchingWriter(max_queue=1, stream=stream)
+    writer.dropped = 4
+
+    writer.put({"message": "after"})
+    writer.flush()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert "4 lines dropped" in lines[0]["message"]
+    assert lines[1]["message"] == "after"
+
+
+def test_rate_limiter_per_call_site():
+    """Au-delà de la limite, un call site est coupé jusqu'à la fenêtre suivante"""
+    now = [0.0]
+    limiter = CallSiteRateLimiter(limit=2, window=10, clock=lambda: now[0])
+
+    assert [limiter(make_record()) for _ in range(4)] == [True, True, False, False]
+    # Un autre call site n'est pas affecté
+    assert limiter(make_record(line=43)) is True
+
+    now[0] = 10
+    record = make_record()
+    assert limiter(record) is True
+    assert record["extra"]["suppressed"] == 2
+
+
+def test_rate_limiter_keeps_info_and_above():
+    """INFO, SUCCESS (lignes d'audit des scalings), warnings et erreurs ne sont jamais limités"""
+    limiter = CallSiteRateLimiter(limit=1, window=10)
+
+    for level_no in (20, 25, 30):
+        assert all(limiter(make_record(level_no=level_no)) for _ in range(5))
@@ -0,0 +1,82 @@
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from kubernetes.client.rest import ApiException
+from prometheus_client import REGISTRY
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.dbManager import DatabaseManager
+from utils.metrics import instrument_kube_client, kube_resource, render_metrics, track_scale
+
+
+def sample(name, **labels):
+    """Valeur courante d'une métrique (0 si la série n'existe pas encore)"""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://k8s/apis/apps/v1/deployments?limit=500", "deployments"),
+    ("https://k8s/apis/apps/v1/namespaces/shop/deployments/api", "deployments"),
+    ("https://k8s/apis/apps/v1/namespaces/shop/statefulsets/db/status", "statefulsets/status"),
+    ("https://k8s/api/v1/namespaces", "namespaces"),
+    ("https://k8s/api/v1/namespaces/shop/pods", "pods"),
+    ("https://k8s/api/v1/nodes", "nodes"),
+])
+def test_kube_resource(url, expected):
+    """Le namespace et le nom de l'objet ne font pas partie du label"""
+    assert kube_resource(url) == expected
+
+
+def test_instrument_kube_client_counts_calls():
+    """Chaque appel est compté avec son code HTTP, erreurs comprises"""
+    rest_client = SimpleNamespace(request=MagicMock(side_effect=[
+        SimpleNamespace(status=200),
+        ApiException(status=404),
+    ]))
+    api = instrument_kube_client(SimpleNamespace(api_client=SimpleNamespace(rest_client=rest_client)))
+    labels = {"method": "GET", "resource": "replicasets"}
+    before_ok = sample("workload_scheduler_kube_requests_total", code="200", **labels)
+    before_404 = sample("workload_scheduler_kube_requests_total", code="404", **labels)
+
+    api.api_client.rest_client.request("GET", "https://k8s/apis/apps/v1/replicasets")
+    with pytest.raises(ApiException):
+        api.api_client.rest_client.request("GET", "https://k8s/apis/apps/v1/replicasets")
+
+    assert sample("workload_scheduler_kube_requests_total", code="200", **labels) == before_ok + 1
+    assert sample("workload_scheduler_kube_requests_total", code="404", **labels) == before_404 + 1
+    # Une seconde instrumentation ne double pas les mesures
+    assert instrument_kube_client(api).api_client.rest_client.request is api.api_client.rest_client.request
+
+
+def test_track_scale_counts_failures():
+    """Une exception pendant le scale est comptée comme un échec"""
+    before = sample("workload_scheduler_scale_failures_total", kind="sts", action="down")
+
+    with pytest.raises(RuntimeError), track_scale("sts", "down"):
+        raise RuntimeError("patch failed")
+
+    assert sample("workload_scheduler_scale_failures_total", kind="sts", action="down") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_database_query_latency():
+    """Les requêtes SQL sont mesurées par type d'instruction"""
+    db = DatabaseManager("sqlite+aiosqlite:///:memory:")
+    before = sample("workload_scheduler_db_query_duration_seconds_count", statement="SELECT")
+
+    await db.create_table()
+    await db.get_all_schedules()
+    await db.close()
+
+    assert sample("workload_scheduler_db_query_duration_seconds_count", statement="SELECT") > before
+
+
+def test_render_metrics():
+    """Le registre est exposé au format texte Prometheus"""
+    content, content_type = render_metrics()
+
+    assert content_type.startswith("text/plain")
+    assert b"workload_scheduler_tick_duration_seconds" in content
@@ -0,0 +1,105 @@
+import pytest
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.workload import workload
+from benchmarks.fake_kube import FakeApiServer, Faults
+from benchmarks.synthetic_cluster import ClusterSpec
+from utils.config import protected_namespaces
+
+NODE_POOLS = {"workers": "!node-role.kubernetes.io/control-plane", "gpu": "pool=gpu"}
+
+
+@pytest.fixture
+def server():
+    with FakeApiServer.from_spec(ClusterSpec(pods=200, namespaces=3), seed=1) as server:
+        core_v1 = server.core_v1()
+        core_v1.patch_node("node-0", {"metadata": {"labels": {"node-role.kubernetes.io/control-plane": ""}}})
+        core_v1.patch_node("node-1", {"metadata": {"labels": {"pool": "gpu"}}})
+        yield server
+
+
+def _selector_scan(server, node_names):
+    """Ancienne résolution (sélecteurs des workloads contre tous les pods), utilisée comme référence"""
+    apps_v1, core_v1 = server.apps_v1(), server.core_v1()
+    pods = [p for p in core_v1.list_pod_for_all_namespaces().items if p.spec.node_name in node_names]
+    return {
+        (w.metadata.namespace, w.metadata.name)
+        for w in apps_v1.list_deployment_for_all_namespaces().items + apps_v1.list_stateful_set_for_all_namespaces().items
+        if w.metadata.namespace not in protected_namespaces and any(
+            p.metadata.namespace == w.metadata.namespace
+            and all((p.metadata.labels or {}).get(k) == v for k, v in w.spec.selector.match_labels.items())
+            for p in pods
+        )
+    }
+
+
+def _drain(server, **params):
+    app = FastAPI()
+    app.include_router(workload)
+    run_scale_waves = AsyncMock(return_value=[])
+    with patch("api.workload.apps_v1", server.apps_v1()), patch("api.workload.core_v1", server.core_v1()), \
+         patch("api.workload.node_pools", NODE_POOLS), patch("api.workload.default_node_pool", "workers"), \
+         patch("api.workload.run_scale_waves", run_scale_waves), patch("api.workload.list_hpa_index", MagicMock()), \
+         patch("utils.argocd.disable_auto_sync_for_resources", AsyncMock(return_value={})):
+        response = TestClient(app).get("/manage-all/down-workers", params=params)
+    targets = {(r.metadata.namespace, r.metadata.name) for _, r in run_scale_waves.call_args.args[0]} \
+        if run_scale_waves.called else set()
+    return response, targets
+
+
+def test_drain_pool_resolves_owners_by_references(server):
+    """Les workloads d'un pool sont ceux des pods de ses nœuds, résolus en une liste de ReplicaSets et de pods"""
+    response, targets = _drain(server, pool="gpu")
+    assert response.status_code == 200 and response.json()["matched"] == len(targets)
+    assert server.requests[("list", "replicasets")] == 1 and server.requests[("list", "pods")] == 1
+    assert targets and targets == _selector_scan(server, {"node-1"})
+
+    # Pool par défaut : tous les nœuds sauf le control plane, exclusions "name" et "namespace/name"
+    all_workers = _selector_scan(server, {f"node-{n}" for n in range(1, ClusterSpec(pods=200).nodes)})
+    excluded = sorted(all_workers)[:2]
+    with patch("api.workload.drain_excluded_workloads", [excluded[0][1], "/".join(excluded[1])]):
+        _, targets = _drain(server)
+    assert targets == all_workers - set(excluded)
+
+
+@pytest.mark.asyncio
+async def test_drain_listing_does_not_block_event_loop(server):
+    """Les listes cluster-wide du drain tournent hors de l'event loop"""
+    app = FastAPI()
+    app.include_router(workload)
+    server.verb_faults["list"] = Faults(latency=0.5)
+    gaps = []
+
+    async def ticker():
+        last = time.monotonic()
+        while True:
+            await asyncio.sleep(0.01)
+            gaps.append(time.monotonic() - last)
+            last = time.monotonic()
+
+    with patch("api.workload.apps_v1", server.apps_v1()), patch("api.workload.core_v1", server.core_v1()), \
+         patch("api.workload.node_pools", NODE_POOLS), patch("api.workload.run_scale_waves", AsyncMock(return_value=[])), \
+         patch("api.workload.list_hpa_index", MagicMock()), \
+         patch("utils.argocd.disable_auto_sync_for_resources", AsyncMock(return_value={})):
+        task = asyncio.create_task(ticker())
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/manage-all/down-workers", params={"pool": "gpu"})
+        task.cancel()
+
+    assert response.status_code == 200 and response.json()["matched"] > 0
+    assert max(gaps) < 0.4
+
+
+def test_unknown_pool_is_rejected(server):
+    response, targets = _drain(server, pool="arm64")
+    assert response.status_code == 404 and "workers, gpu" in response.json()["detail"] and not targets
@@ -0,0 +1,86 @@
+import pytest
+import os
+import sys
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.jobs import jobs
+from api.workload import workload
+from benchmarks.fake_kube import FakeApiServer
+from benchmarks.synthetic_cluster import ClusterSpec
+from core.replicaset_gc import RateLimiter, _delete, delete_zero_replicasets
+from utils.fastjson import loads
+
+PROTECTED = ["team-1"]
+
+
+@pytest.fixture
+def server():
+    with FakeApiServer.from_spec(ClusterSpec(pods=60, namespaces=3), seed=1) as server:
+        yield server
+
+
+def _zero_replicasets(server):
+    items = server.apps_v1().list_replica_set_for_all_namespaces(field_selector="status.replicas=0").items
+    return [rs for rs in items if rs.metadata.namespace not in PROTECTED]
+
+
+def test_delete_zero_replicasets_single_pass(server):
+    """Une seule liste cluster-wide, puis une suppression par ReplicaSet à zéro hors namespaces protégés"""
+    expected = len(_zero_replicasets(server))
+    assert expected > 0
+
+    progress = delete_zero_replicasets(server.apps_v1(), PROTECTED, concurrency=4, qps=0)
+
+    assert (progress["matched"], progress["deleted"], progress["failed"]) == (expected, expected, 0)
+    assert server.requests[("list", "replicasets")] == 2  # la liste du test et celle de la passe
+    assert server.requests[("delete", "replicasets")] == expected
+    assert _zero_replicasets(server) == []
+    assert any(rs.metadata.namespace in PROTECTED
+               for rs in server.apps_v1().list_replica_set_for_all_namespaces(field_selector="status.replicas=0").items)
+
+
+def test_limit_and_preconditions(server):
+    """Le nombre de suppressions est borné ; un ReplicaSet modifié depuis la liste n'est pas supprimé"""
+    apps_v1 = server.apps_v1()
+    progress = delete_zero_replicasets(apps_v1, PROTECTED, limit=3, qps=0)
+    assert progress["deleted"] == 3 and server.requests[("delete", "replicasets")] == 3
+
+    stale = apps_v1.list_replica_set_for_all_namespaces(field_selector="status.replicas=0", _preload_content=False)
+    rs = next(item for item in loads(stale.data)["items"]
+              if item["metadata"]["namespace"] not in PROTECTED)
+    name, namespace = rs["metadata"]["name"], rs["metadata"]["namespace"]
+    apps_v1.patch_namespaced_replica_set(name, namespace, {"metadata": {"labels": {"touched": "true"}}})
+
+    assert _delete(apps_v1, RateLimiter(0), rs) == "changed"
+    apps_v1.delete_namespaced_replica_set(name, namespace)
+    assert _delete(apps_v1, RateLimiter(0), rs) == "gone"
+
+
+def test_delete_rs_endpoint_runs_as_background_job(server):
+    """GET /delete-rs rend la main tout de suite (202) ; la progression est suivie sur /jobs/{job_id}"""
+    app = FastAPI()
+    app.include_router(workload)
+    app.include_router(jobs)
+    expected = len(_zero_replicasets(server))
+
+    with patch("api.workload.apps_v1", server.apps_v1()), patch("api.workload.protected_namespaces", PROTECTED), \
+         patch("api.workload.replicaset_delete_qps", 0), TestClient(app) as client:
+        response = client.get("/delete-rs")
+        assert response.status_code == 202 and response.json()["status"] == "accepted"
+        job_id = response.json()["job_id"]
+
+        deadline = time.monotonic() + 5
+        while (job := client.get(f"/jobs/{job_id}").json())["status"] != "success":
+            assert job["status"] != "error" and time.monotonic() < deadline
+            time.sleep(0.02)
+        assert job["kind"] == "delete-rs" and job["progress"]["deleted"] == expected
+        assert client.get("/jobs").json()[0]["id"] == job_id
+        assert client.get("/jobs/unknown").status_code == 404
+
+        waited = client.get("/delete-rs", params={"wait": "true"}).json()
+        assert (waited["status"], waited["deleted_replicasets"]) == ("success", 0)
@@ -0,0 +1,132 @@
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.scale_state import (
+    build_scale_down_patch,
+    build_scale_up_patch,
+    find_hpa,
+    index_hpas,
+    restore_replicas,
+    workload_readiness,
+)
+from utils.config import scale_state_annotation
+
+
+@pytest.fixture
+def mock_workload():
+    """Crée un mock de Deployment avec 10 réplicas"""
+    deploy = MagicMock()
+    deploy.metadata.name = "api"
+    deploy.metadata.namespace = "shop"
+    deploy.metadata.annotations = {}
+    deploy.spec.replicas = 10
+    return deploy
+
+
+@pytest.fixture
+def mock_hpa():
+    """Crée un mock de HPA ciblant le Deployment api"""
+    hpa = MagicMock()
+    hpa.metadata.name = "api-hpa"
+    hpa.metadata.namespace = "shop"
+    hpa.spec.scale_target_ref.kind = "Deployment"
+    hpa.spec.scale_target_ref.name = "api"
+    hpa.spec.min_replicas = 4
+    hpa.spec.max_replicas = 8
+    return hpa
+
+
+def test_scale_down_records_replicas(mock_workload):
+    """Test que le scale-down mémorise la capacité en annotation"""
+    body = build_scale_down_patch(mock_workload)
+
+    assert body["spec"]["replicas"] == 0
+    state = json.loads(body["metadata"]["annotations"][scale_state_annotation])
+    assert state == {"replicas": 10}
+
+
+def test_scale_down_records_hpa_bounds(mock_workload, mock_hpa):
+    """Test que les bornes du HPA sont mémorisées"""
+    body = build_scale_down_patch(mock_workload, mock_hpa)
+
+    state = json.loads(body["metadata"]["annotations"][scale_state_annotation])
+    assert state["hpa"] == {"name": "api-hpa", "min": 4, "max": 8}
+
+
+def test_scale_down_already_stopped_keeps_state(mock_workload):
+    """Test qu'un second scale-down n'écrase pas la capacité d'origine"""
+    mock_workload.spec.replicas = 0
+
+    body = build_scale_down_patch(mock_workload)
+
+    assert body == {"spec": {"replicas": 0}}
+
+
+def test_scale_up_restores_recorded_replicas(mock_workload):
+    """Test que le scale-up restaure la capacité mémorisée en un PATCH"""
+    mock_workload.spec.replicas = 0
+    mock_workload.metadata.annotations = {scale_state_annotation: json.dumps({"replicas": 10})}
+
+    body = build_scale_up_patch(mock_workload)
+
+    assert body == {
+        "spec": {"replicas": 10},
+        "metadata": {"annotations": {scale_state_annotation: None}},
+    }
+
+
+def test_scale_up_clamps_to_hpa_bounds(mock_workload):
+    """Test que la capacité restaurée respecte les bornes du HPA"""
+    state = {"replicas": 10, "hpa": {"name": "api-hpa", "min": 4, "max": 8}}
+    mock_workload.metadata.annotations = {scale_state_annotation: json.dumps(state)}
+
+    assert restore_replicas(mock_workload) == 8
+
+
+def test_scale_up_without_state_defaults_to_one(mock_workload):
+    """Test qu'un workload arrêté sans capacité mémorisée repart à 1 réplica"""
+    mock_workload.metadata.annotations = None
+    mock_workload.spec.replicas = 0
+
+    assert build_scale_up_patch(mock_workload) == {"spec": {"replicas": 1}}
+
+
+def test_scale_up_running_without_state_keeps_replicas(mock_workload):
+    """Test qu'un scale-up sur un workload déjà démarré ne le réduit pas"""
+    mock_workload.metadata.annotations = None
+
+    assert build_scale_up_patch(mock_workload) == {"spec": {"replicas": 10}}
+
+
+def test_find_hpa_uses_index(mock_workload, mock_hpa):
+    """Test de la recherche de HPA via un index pré-calculé"""
+    autoscaling = MagicMock()
+    index = index_hpas([mock_hpa])
+
+    assert find_hpa(autoscaling, "deploy", mock_workload, index) is mock_hpa
+    assert find_hpa(autoscaling, "sts", mock_workload, index) is None
+    autoscaling.list_namespaced_horizontal_pod_autoscaler.assert_not_called()
+
+
+def test_workload_readiness(mock_workload):
+    """Test de la disponibilité d'un workload"""
+    mock_workload.metadata.generation = 2
+    mock_workload.status.observed_generation = 2
+    mock_workload.status.ready_replicas = 10
+
+    assert workload_readiness(mock_workload) == {"desired_replicas": 10, "ready_replicas": 10, "ready": True}
+
+
+def test_workload_readiness_stale_status(mock_workload):
+    """Test qu'un statut antérieur au dernier PATCH n'est pas considéré Ready"""
+    mock_workload.metadata.generation = 3
+    mock_workload.status.observed_generation = 2
+    mock_workload.status.ready_replicas = 10
+
+    assert workload_readiness(mock_workload)["ready"] is False
+
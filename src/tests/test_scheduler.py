@@ -4,6 +4,7 @@ import sys
 import os
 import asyncio
 import datetime
+import time
 import pytz
 from types import SimpleNamespace
 
@@ -427,4 +428,191 @@ async def test_init():
     
     with patch.dict('os.environ', {'TIMEZONE': 'America/New_York'}):
         scheduler = SchedulerEngine()
-        assert scheduler.timezone.zone == 'America/New_York'
\ No newline at end of file
+        assert scheduler.timezone.zone == 'America/New_York'
+
+
+@pytest.mark.asyncio
+async def test_start_workload_wait_for_ready(scheduler, mock_schedule, mock_response):
+    scheduler.wait_for_ready = True
+    scheduler.client.get = AsyncMock(return_value=mock_response)
+    scheduler.client.put = AsyncMock()
+    scheduler._wait_for_ready = AsyncMock()
+
+    await scheduler._start_workload(mock_schedule)
+    await asyncio.gather(*scheduler._readiness_tasks)
+
+    scheduler._wait_for_ready.assert_called_once()
+    assert scheduler._wait_for_ready.call_args[0][0] is mock_schedule
+
+
+@pytest.mark.asyncio
+async def test_start_workload_without_wait_for_ready(scheduler, mock_schedule, mock_response):
+    scheduler.wait_for_ready = False
+    scheduler.client.get = AsyncMock(return_value=mock_response)
+    scheduler.client.put = AsyncMock()
+    scheduler._wait_for_ready = AsyncMock()
+
+    await scheduler._start_workload(mock_schedule)
+
+    scheduler._wait_for_ready.assert_not_called()
+    assert not scheduler._readiness_tasks
+
+
+@pytest.mark.asyncio
+async def test_wait_for_ready_records_time_to_ready(scheduler, mock_schedule):
+    scheduler.ready_poll_interval = 0
+    scheduler.ready_timeout = 5
+    not_ready = MagicMock()
+    not_ready.json.return_value = {"status": "success", "ready": False, "desired_replicas": 3, "ready_replicas": 1}
+    ready = MagicMock()
+    ready.json.return_value = {"status": "success", "ready": True, "desired_replicas": 3, "ready_replicas": 3}
+    scheduler.client.get = AsyncMock(side_effect=[not_ready, ready])
+    scheduler.client.post = AsyncMock()
+
+    started_at = datetime.datetime.now(datetime.timezone.utc)
+    await scheduler._wait_for_ready(mock_schedule, started_at, time.monotonic())
+
+    assert scheduler.client.get.call_count == 2
+    scheduler.client.get.assert_called_with(url=f"{scheduler.api_url}/status/deploy/{mock_schedule.uid}")
+    metric = scheduler.client.post.call_args[1]["json"]
+    assert scheduler.client.post.call_args[1]["url"] == f"{scheduler.api_url}/startup-metrics"
+    assert metric["uid"] == mock_schedule.uid
+    assert metric["timed_out"] is False
+    assert metric["desired_replicas"] == 3
+    assert metric["duration_seconds"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_wait_for_ready_timeout(scheduler, mock_schedule):
+    scheduler.ready_poll_interval = 0
+    scheduler.ready_timeout = 0
+    scheduler.client.get = AsyncMock()
+    scheduler.client.post = AsyncMock()
+
+    await scheduler._wait_for_ready(mock_schedule, datetime.datetime.now(datetime.timezone.utc), time.monotonic())
+
+    metric = scheduler.client.post.call_args[1]["json"]
+    assert metric["timed_out"] is True
+    assert metric["duration_seconds"] is None
+
+
+def test_lead_time_explicit(scheduler, mock_schedule):
+    mock_schedule.lead_time = 900
+    mock_schedule.auto_lead_time = False
+
+    assert scheduler._lead_time(mock_schedule) == 900
+
+
+def test_lead_time_learned_from_p95(scheduler, mock_schedule):
+    mock_schedule.lead_time = None
+    mock_schedule.auto_lead_time = True
+    scheduler._startup_summary = {mock_schedule.uid: {"count": 12, "p50": 300.0, "p95": 842.3}}
+
+    assert scheduler._lead_time(mock_schedule) == 843
+
+
+def test_lead_time_capped(scheduler, mock_schedule):
+    mock_schedule.lead_time = 10 * 3600
+    scheduler.max_lead_time = 3600
+
+    assert scheduler._lead_time(mock_schedule) == 3600
+
+
+def test_lead_time_default(scheduler, mock_schedule):
+    assert scheduler._lead_time(mock_schedule) == 0
+
+
+@pytest.mark.asyncio
+async def test_process_schedule_prewarm_fires_early(scheduler, mock_schedule):
+    tz = pytz.timezone('Europe/Paris')
+    mock_schedule.cron_start = "30 7 * * *"
+    mock_schedule.cron_stop = "0 20 * * *"
+    mock_schedule.lead_time = 900
+    scheduler.check_interval = 60
+    scheduler._start_workload = AsyncMock()
+
+    now = tz.localize(datetime.datetime(2025, 5, 7, 7, 14, 30))
+    await scheduler._process_schedule(mock_schedule, now)
+
+    scheduler._start_workload.assert_called_once_with(mock_schedule)
+
+
+@pytest.mark.asyncio
+async def test_refresh_startup_summary_cached(scheduler):
+    response = MagicMock()
+    response.json.return_value = {"uid-1": {"count": 3, "p50": 10.0, "p95": 20.0}}
+    scheduler.client.get = AsyncMock(return_value=response)
+
+    await scheduler._refresh_startup_summary()
+    await scheduler._refresh_startup_summary()
+
+    scheduler.client.get.assert_called_once_with(url=f"{scheduler.api_url}/startup-summary")
+    assert scheduler._startup_summary["uid-1"]["p95"] == 20.0
+
+
+
+@pytest.mark.asyncio
+async def test_start_group_schedule(scheduler, mock_schedule, mock_response):
+    mock_schedule.target_namespace = "dev"
+    mock_schedule.label_selector = "tier=batch"
+    mock_schedule.lead_time = 300
+    scheduler.wait_for_ready = True
+    scheduler.client.get = AsyncMock(return_value=mock_response)
+    scheduler.client.put = AsyncMock(return_value=mock_response)
+
+    await scheduler._start_workload(mock_schedule)
+
+    scheduler.client.get.assert_called_once_with(
+        url=f"{scheduler.api_url}/manage-group/up?namespace=dev&label_selector=tier%3Dbatch"
+    )
+    update = scheduler.client.put.call_args.kwargs["json"]
+    assert update["target_namespace"] == "dev"
+    assert update["label_selector"] == "tier=batch"
+    assert update["lead_time"] == 300
+    assert not scheduler._readiness_tasks
+
+
+@pytest.mark.asyncio
+async def test_group_schedule_accepted_job_marks_active(scheduler, mock_schedule, mock_response):
+    """/manage-group répond "accepted" (job d'arrière-plan) : la programmation passe active, puis inactive"""
+    mock_schedule.target_namespace = "dev"
+    mock_response.json.return_value = {"status": "accepted", "job_id": "abc"}
+    scheduler.client.get = AsyncMock(return_value=mock_response)
+    scheduler.client.put = AsyncMock(return_value=mock_response)
+
+    await scheduler._start_workload(mock_schedule)
+    assert scheduler.client.put.call_args.kwargs["json"]["active"] is True
+
+    await scheduler._stop_workload(mock_schedule)
+    assert scheduler.client.put.call_args.kwargs["json"]["active"] is False
+
+
+@pytest.mark.asyncio
+async def test_stop_uid_schedule_url(scheduler, mock_scheduled_workload, mock_response):
+    scheduler.client.get = AsyncMock(return_value=mock_response)
+    scheduler.client.put = AsyncMock(return_value=mock_response)
+
+    await scheduler._stop_workload(mock_scheduled_workload)
+
+    scheduler.client.get.assert_called_once_with(
+        url=f"{scheduler.api_url}/manage/down/deploy/{mock_scheduled_workload.uid}"
+    )
+
+
+@pytest.mark.asyncio
+async def test_start_workload_records_metrics(scheduler, mock_schedule, mock_response):
+    """Une action réussie est comptée et son délai par rapport au cron est mesuré"""
+    from prometheus_client import REGISTRY
+
+    labels = {"action": "start", "kind": "workload"}
+    before = REGISTRY.get_sample_value("workload_scheduler_actions_total", {**labels, "result": "success"}) or 0
+    before_delay = REGISTRY.get_sample_value("workload_scheduler_action_delay_seconds_count", labels) or 0
+    scheduler.client.get = AsyncMock(return_value=mock_response)
+    scheduler.client.put = AsyncMock(return_value=mock_response)
+
+    await scheduler._start_workload(mock_schedule)
+
+    assert REGISTRY.get_sample_value("workload_scheduler_actions_total", {**labels, "result": "success"}) == before + 1
+    assert REGISTRY.get_sample_value("workload_scheduler_action_delay_seconds_count", labels) == before_delay + 1
+    # Cron chaque minute : l'occurrence la plus proche est à moins de 30s
+    assert REGISTRY.get_sample_value("workload_scheduler_action_delay_seconds_bucket", {**labels, "le": "30.0"}) >= 1
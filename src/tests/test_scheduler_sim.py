@@ -0,0 +1,64 @@
+import pytest
+import os
+import sys
+import datetime
+import pytz
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.scheduler_sim import RecordingSink, VirtualClock, make_schedules, simulate
+from core.models import ScheduleStatus
+from scheduler_engine import SchedulerEngine
+
+PARIS = pytz.timezone("Europe/Paris")
+
+
+def _schedule(cron_start, cron_stop):
+    return SimpleNamespace(
+        id=1, name="sim", uid="sim-uid", active=False, status=ScheduleStatus.NOT_SCHEDULED,
+        cron_start=cron_start, cron_stop=cron_stop, lead_time=None, auto_lead_time=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_simulation_drift_no_missed_or_duplicate_fires():
+    """Avec des ticks qui dérivent et se bloquent, chaque occurrence est déclenchée une seule fois"""
+    start = PARIS.localize(datetime.datetime(2025, 10, 20))
+    report = await simulate(
+        make_schedules(40, seed=3), start, days=1, interval=300,
+        drift=20, stall_probability=0.05, stall=400, seed=3,
+    )
+
+    assert report.expected > 0
+    assert report.missed == 0
+    assert report.unexpected == 0
+    # Déclenché au tick qui précède l'occurrence, ou en retard d'au plus un blocage
+    assert -300 < min(report.offsets) and max(report.offsets) <= 400 + 20
+
+
+@pytest.mark.asyncio
+async def test_simulation_dst_fall_back_fires_once():
+    """02:30 existe deux fois au passage à l'heure d'hiver : un seul démarrage"""
+    start = PARIS.localize(datetime.datetime(2025, 10, 25, 12))
+    schedule = _schedule("30 2 * * *", "45 2 * * *")
+
+    report = await simulate([schedule], start, days=1, interval=60, drift=2)
+
+    assert (report.expected, report.fired, report.missed, report.unexpected) == (2, 2, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_late_tick_catches_up_once():
+    """Un tick en retard rattrape l'occurrence passée entre-temps, sans la rejouer au tick suivant"""
+    clock = VirtualClock(PARIS.localize(datetime.datetime(2025, 10, 20, 10, 0)))
+    sink = RecordingSink()
+    engine = SchedulerEngine(check_interval=60, clock=clock, action_sink=sink)
+    schedule = _schedule("3 10 * * *", "0 18 * * *")
+
+    for minute in (0, 5, 6):
+        clock.now = clock.now.replace(minute=minute)
+        await engine.evaluate_schedules([schedule], clock.now)
+    await engine.client.aclose()
+
+    assert sink.fires == {("sim-uid", "start"): [clock.now.replace(minute=5)]}
+    assert schedule.active
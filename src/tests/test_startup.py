@@ -0,0 +1,101 @@
+import pytest
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.bench_import import measure_import
+from utils import helpers
+from utils.startup import StartupTasks
+
+
+def test_import_does_no_kubernetes_io():
+    """Hors mode test et sans cluster joignable, importer l'API ne charge pas la configuration Kubernetes"""
+    result = measure_import("main", runs=1)
+    assert result["kube_config_loaded"] is False
+
+
+def test_lazy_kube_client_loads_config_on_first_use(monkeypatch):
+    """Le kubeconfig est chargé et le client créé une seule fois, au premier attribut demandé"""
+    monkeypatch.setattr(helpers, "_kube_config_loaded", False)
+    with patch.object(helpers, "config") as mock_config, patch.object(helpers, "client") as mock_client, \
+         patch.object(helpers, "instrument_kube_client", side_effect=lambda api: api):
+        lazy = helpers.LazyKubeClient("AppsV1Api")
+        assert not mock_config.load_incluster_config.called and "not initialized" in repr(lazy)
+
+        lazy.list_namespaced_deployment("default")
+        lazy.patch_namespaced_deployment("web", "default", {})
+
+    mock_config.load_incluster_config.assert_called_once()
+    mock_client.AppsV1Api.assert_called_once()
+    mock_client.AppsV1Api.return_value.list_namespaced_deployment.assert_called_once_with("default")
+
+
+@pytest.mark.asyncio
+async def test_startup_tasks_retry_required_and_tolerate_optional():
+    """Une tâche requise est relancée jusqu'au succès ; l'échec d'une optionnelle ne bloque pas la readiness"""
+    tasks = StartupTasks(retry_min=0.01)
+    flaky = AsyncMock(side_effect=[ConnectionError("apiserver unreachable"), ConnectionError("still down"), None])
+    gate = asyncio.Event()
+
+    tasks.start("kubernetes", flaky)
+    tasks.start("database", gate.wait)
+    tasks.start("argocd", AsyncMock(side_effect=RuntimeError("bad credentials")), required=False)
+    await asyncio.sleep(0.1)
+    assert not tasks.ready() and tasks.status()["database"]["status"] == "running"
+
+    gate.set()
+    assert await tasks.wait(timeout=1)
+    status = tasks.status()
+    assert status["kubernetes"]["status"] == "success" and status["kubernetes"]["attempts"] == 3
+    assert (status["argocd"]["status"], status["argocd"]["error"], status["argocd"]["attempts"]) \
+        == ("error", "bad credentials", 1)
+    await tasks.shutdown()
+
+
+def test_server_is_up_before_background_init_completes():
+    """Le lifespan rend la main tout de suite ; /ready passe de 503 à 200 à la fin des tâches"""
+    import main
+
+    tasks = StartupTasks()
+    release = asyncio.Event()
+
+    async def slow_database():
+        await release.wait()
+
+    with patch.object(main, "startup_tasks", tasks), patch("api.workload.startup_tasks", tasks), \
+         patch.object(main, "initialize_kubernetes", MagicMock()) as init_kube, \
+         patch.object(main, "init_database", slow_database), \
+         patch.object(main, "init_argocd_token", AsyncMock()), patch.object(main, "inventory_cache", None):
+        with TestClient(main.app) as client:
+            assert client.get("/live").status_code == 200
+            starting = client.get("/ready")
+            assert starting.status_code == 503 and starting.json()["tasks"]["database"]["status"] == "running"
+
+            client.portal.call(release.set)
+            deadline = time.monotonic() + 5
+            while client.get("/ready").status_code != 200 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            ready = client.get("/ready")
+        assert ready.status_code == 200 and set(ready.json()["tasks"]) == {"kubernetes", "database", "argocd"}
+        init_kube.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_argocd_task_reports_missing_token(monkeypatch):
+    """Sans token ArgoCD, la tâche argocd passe en erreur au lieu de se dire initialisée"""
+    import main
+
+    monkeypatch.setenv("ARGOCD_API_URL", "https://argocd.example/api/v1")
+    tasks = StartupTasks()
+    with patch.object(main.token_manager, "aget_token", AsyncMock(return_value=None)):
+        tasks.start("argocd", main.init_argocd_token, required=False)
+        assert await tasks.wait(timeout=1)
+
+    assert (tasks.status()["argocd"]["status"], tasks.status()["argocd"]["error"]) \
+        == ("error", "Failed to obtain ArgoCD token")
+    await tasks.shutdown()
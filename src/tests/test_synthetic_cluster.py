@@ -0,0 +1,37 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.synthetic_cluster import ClusterSpec, FakeCluster
+from core.kub_list import iter_list, list_all_daemonsets, list_all_deployments, list_all_sts
+
+
+def test_synthetic_cluster_inventory():
+    """Les ownerReferences du cluster synthétique rattachent chaque pod à son workload"""
+    spec = ClusterSpec(pods=300, namespaces=4)
+    cluster = FakeCluster(spec)
+    args = (cluster.apps_v1, cluster.core_v1, ["kube-system"], {})
+
+    deployments = list_all_deployments(*args)
+    statefulsets = list_all_sts(*args)
+    daemonsets = list_all_daemonsets(*args)
+
+    assert len(deployments) == spec.deployments
+    assert all(len(record.pods) == spec.deployment_replicas for record in deployments)
+    assert all(len(record.pods) == spec.sts_replicas and record.pods[0].has_pvc for record in statefulsets)
+    assert all(len(record.pods) == spec.nodes for record in daemonsets)
+    assert sum(len(r.pods) for r in [*deployments, *statefulsets, *daemonsets]) == len(cluster.objects["pods"])
+    # Le mode LEAN_LISTING produit le même inventaire
+    assert list_all_deployments(*args, lean=True) == deployments
+
+
+def test_synthetic_cluster_pagination_and_selectors():
+    """Les fausses listes paginent et appliquent les sélecteurs comme l'apiserver"""
+    cluster = FakeCluster(ClusterSpec(pods=300, namespaces=4))
+    list_pods = cluster.core_v1.list_pod_for_all_namespaces
+
+    pods = list(iter_list(list_pods, limit=50, field_selector="spec.nodeName=node-1"))
+
+    assert pods and all(pod.spec.node_name == "node-1" for pod in pods)
+    assert list_pods.calls == -(-len([p for p in cluster.objects["pods"] if p["spec"]["nodeName"] == "node-1"]) // 50)
+    assert not list(iter_list(cluster.apps_v1.list_namespaced_deployment, "team-0", label_selector="team!=team-0"))
@@ -0,0 +1,101 @@
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from opentelemetry.trace import SpanKind
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.dbManager import DatabaseManager
+from utils.helpers import RetryableAsyncClient
+from utils.metrics import instrument_kube_client
+from utils.tracing import TracingMiddleware, in_memory_exporter, traced, tracer
+
+
+@pytest.fixture
+def exporter():
+    exporter = in_memory_exporter()
+    exporter.clear()
+    yield exporter
+    exporter.clear()
+
+
+def spans_by_name(exporter):
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+@pytest.mark.asyncio
+async def test_context_propagates_from_engine_to_api(exporter):
+    """Le span serveur de l'API est rattaché à la trace du moteur (traceparent)"""
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+
+    @app.get("/manage/{action}/deploy/{uid}")
+    async def manage(action: str, uid: str):
+        return {"status": "success"}
+
+    async with RetryableAsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api") as client:
+        with tracer.start_as_current_span("scheduler.tick"):
+            await client.get(url="/manage/up/deploy/abc")
+
+    spans = spans_by_name(exporter)
+    tick, http_client = spans["scheduler.tick"], spans["HTTP GET"]
+    server = spans["GET /manage/{action}/deploy/{uid}"]
+    assert server.kind == SpanKind.SERVER
+    assert http_client.parent.span_id == tick.context.span_id
+    assert server.parent.span_id == http_client.context.span_id
+    assert server.context.trace_id == tick.context.trace_id
+    assert server.attributes["http.response.status_code"] == 200
+
+
+@pytest.mark.asyncio
+async def test_traced_decorator(exporter):
+    """Le décorateur fonctionne sur les fonctions synchrones et asynchrones"""
+    @traced("sync.op", kind="deploy")
+    def sync_op():
+        return 1
+
+    @traced("async.op")
+    async def async_op():
+        return sync_op() + 1
+
+    assert await async_op() == 2
+
+    spans = spans_by_name(exporter)
+    assert spans["sync.op"].parent.span_id == spans["async.op"].context.span_id
+    assert spans["sync.op"].attributes["kind"] == "deploy"
+
+
+def test_kube_calls_are_spans(exporter):
+    """Chaque appel à l'apiserver est un span client enfant du span courant"""
+    rest_client = SimpleNamespace(request=MagicMock(return_value=SimpleNamespace(status=200)))
+    api = instrument_kube_client(SimpleNamespace(api_client=SimpleNamespace(rest_client=rest_client)))
+
+    with tracer.start_as_current_span("scale"):
+        api.api_client.rest_client.request("PATCH", "https://k8s/apis/apps/v1/namespaces/shop/deployments/api")
+
+    spans = spans_by_name(exporter)
+    patch = spans["kube PATCH deployments"]
+    assert patch.parent.span_id == spans["scale"].context.span_id
+    assert patch.attributes["http.response.status_code"] == "200"
+
+
+@pytest.mark.asyncio
+async def test_database_queries_are_spans(exporter):
+    """Les requêtes SQL sont des spans enfants de l'opération appelante"""
+    db = DatabaseManager("sqlite+aiosqlite:///:memory:")
+    await db.create_table()
+    exporter.clear()
+
+    with tracer.start_as_current_span("get_schedules"):
+        await db.get_all_schedules()
+    await db.close()
+
+    spans = exporter.get_finished_spans()
+    parent = next(span for span in spans if span.name == "get_schedules")
+    queries = [span for span in spans if span.name == "db SELECT"]
+    assert queries
+    assert all(span.parent.span_id == parent.context.span_id for span in queries)
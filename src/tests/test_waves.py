@@ -0,0 +1,201 @@
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.jobs import jobs
+from api.workload import workload
+from core.waves import build_scale_waves, describe_waves, wait_for_wave_ready
+from utils.config import depends_on_annotation, wave_label
+
+
+def make_workload(name, namespace="shop", labels=None, depends_on=None):
+    """Crée un mock de workload avec labels et annotation depends-on optionnels"""
+    resource = MagicMock()
+    resource.metadata.name = name
+    resource.metadata.namespace = namespace
+    resource.metadata.labels = labels or {}
+    resource.metadata.annotations = {depends_on_annotation: depends_on} if depends_on else {}
+    resource.metadata.generation = 1
+    resource.status.observed_generation = 1
+    resource.spec.replicas = 1
+    resource.status.ready_replicas = 1
+    return resource
+
+
+def test_statefulsets_before_deployments():
+    """Sans annotation, les StatefulSets démarrent avant les Deployments"""
+    api = make_workload("api")
+    db = make_workload("db")
+
+    waves = build_scale_waves([("deploy", api), ("sts", db)])
+
+    assert describe_waves(waves) == [["sts:shop/db"], ["deploy:shop/api"]]
+
+
+def test_depends_on_annotation():
+    """Un workload démarre dans la vague qui suit celle de ses dépendances"""
+    cache = make_workload("cache")
+    api = make_workload("api", depends_on="cache, other/auth")
+    auth = make_workload("auth", namespace="other")
+    front = make_workload("front", depends_on="api")
+
+    waves = build_scale_waves([("deploy", front), ("deploy", api), ("deploy", auth), ("deploy", cache)])
+
+    assert describe_waves(waves) == [
+        ["deploy:other/auth", "deploy:shop/cache"],
+        ["deploy:shop/api"],
+        ["deploy:shop/front"],
+    ]
+
+
+def test_wave_label_overrides_default_tier():
+    """Le label wave remplace le tier par défaut"""
+    db = make_workload("db", labels={wave_label: "2"})
+    api = make_workload("api")
+
+    waves = build_scale_waves([("sts", db), ("deploy", api)])
+
+    assert describe_waves(waves) == [["deploy:shop/api"], ["sts:shop/db"]]
+
+
+def test_dependency_cycle_does_not_loop():
+    """Une dépendance cyclique est ignorée au lieu de boucler"""
+    a = make_workload("a", depends_on="b")
+    b = make_workload("b", depends_on="a")
+
+    waves = build_scale_waves([("deploy", a), ("deploy", b)])
+
+    assert sorted(w for wave in describe_waves(waves) for w in wave) == ["deploy:shop/a", "deploy:shop/b"]
+
+
+@pytest.mark.asyncio
+async def test_wait_for_wave_ready():
+    """La vague est Ready dès que tous ses workloads le sont"""
+    db = make_workload("db")
+    not_ready = make_workload("db")
+    not_ready.status.ready_replicas = 0
+    apps_v1 = MagicMock()
+    apps_v1.read_namespaced_stateful_set_status.side_effect = [not_ready, db]
+
+    ready = await wait_for_wave_ready(apps_v1, [("sts", db)], timeout=5, poll_interval=0)
+
+    assert ready is True
+    assert apps_v1.read_namespaced_stateful_set_status.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_wait_for_wave_ready_timeout():
+    """Le délai dépassé ne bloque pas l'opération"""
+    api = make_workload("api")
+    api.status.ready_replicas = 0
+    apps_v1 = MagicMock()
+    apps_v1.read_namespaced_deployment_status.return_value = api
+
+    ready = await wait_for_wave_ready(apps_v1, [("deploy", api)], timeout=0, poll_interval=0)
+
+    assert ready is False
+
+
+def _waves_app():
+    app = FastAPI()
+    app.include_router(workload)
+    app.include_router(jobs)
+    return app
+
+
+def _list_result(items):
+    result = MagicMock()
+    result.items = items
+    result.metadata._continue = None
+    return result
+
+
+def test_manage_all_up_runs_waves_as_job():
+    """/manage-all/up répond 202 tout de suite ; les vagues et leur attente Ready tournent dans un job"""
+    apps_v1 = MagicMock()
+    apps_v1.list_deployment_for_all_namespaces.return_value = _list_result([make_workload("api")])
+    apps_v1.list_stateful_set_for_all_namespaces.return_value = _list_result([make_workload("db")])
+    release = asyncio.Event()
+
+    async def slow_wave_ready(api, wave):
+        await release.wait()
+
+    with patch("api.workload.apps_v1", apps_v1), patch("api.workload.wait_for_wave_ready", slow_wave_ready), \
+         patch("api.workload.process_deployment", AsyncMock()) as deploy, \
+         patch("api.workload.process_statefulset", AsyncMock()) as sts, TestClient(_waves_app()) as client:
+        response = client.get("/manage-all/up")
+        assert response.status_code == 202
+        body = response.json()
+        assert (body["status"], body["matched"]) == ("accepted", 2)
+
+        job = client.get(f"/jobs/{body['job_id']}").json()
+        assert job["status"] == "running" and job["progress"]["wave"] == 1 and not deploy.called
+        assert client.get("/manage-all/up").json()["job_id"] == body["job_id"]
+
+        client.portal.call(release.set)
+        deadline = time.monotonic() + 5
+        while (job := client.get(f"/jobs/{body['job_id']}").json())["status"] != "success":
+            assert job["status"] != "error" and time.monotonic() < deadline
+            time.sleep(0.01)
+    assert job["progress"]["waves"] == [["sts:shop/db"], ["deploy:shop/api"]]
+    sts.assert_called_once()
+    deploy.assert_called_once()
+
+
+def test_manage_all_down_rejected_while_up_runs():
+    """Un scale-down demandé pendant le scale-up est refusé : les vagues restantes le déferaient"""
+    apps_v1 = MagicMock()
+    apps_v1.list_deployment_for_all_namespaces.return_value = _list_result([make_workload("api")])
+    apps_v1.list_stateful_set_for_all_namespaces.return_value = _list_result([make_workload("db")])
+    release = asyncio.Event()
+
+    async def slow_wave_ready(api, wave):
+        await release.wait()
+
+    with patch("api.workload.apps_v1", apps_v1), patch("api.workload.wait_for_wave_ready", slow_wave_ready), \
+         patch("api.workload.process_deployment", AsyncMock()) as deploy, \
+         patch("api.workload.process_statefulset", AsyncMock()), TestClient(_waves_app()) as client:
+        up = client.get("/manage-all/up").json()
+        response = client.get("/manage-all/down")
+        assert response.status_code == 409
+        assert up["job_id"] in response.json()["detail"]
+
+        client.portal.call(release.set)
+        deadline = time.monotonic() + 5
+        while client.get(f"/jobs/{up['job_id']}").json()["status"] != "success":
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        down = client.get("/manage-all/down")
+        assert down.status_code == 202 and down.json()["job_id"] != up["job_id"]
+    assert deploy.await_args_list[0].args[1] == "up"
+
+
+def test_manage_group_returns_job_immediately():
+    """/manage-group rend la main avant la fin des vagues : le moteur n'attend plus la disponibilité en HTTP"""
+    apps_v1 = MagicMock()
+    apps_v1.list_namespaced_deployment.return_value = _list_result([make_workload("api", namespace="dev")])
+    apps_v1.list_namespaced_stateful_set.return_value = _list_result([make_workload("db", namespace="dev")])
+    release = asyncio.Event()
+
+    async def slow_wave_ready(api, wave):
+        await release.wait()
+
+    with patch("api.workload.apps_v1", apps_v1), patch("api.workload.wait_for_wave_ready", slow_wave_ready), \
+         patch("api.workload.process_deployment", AsyncMock()), \
+         patch("api.workload.process_statefulset", AsyncMock()), TestClient(_waves_app()) as client:
+        response = client.get("/manage-group/up", params={"namespace": "dev"})
+        assert response.status_code == 202
+        assert (response.json()["status"], response.json()["matched"]) == ("accepted", 2)
+        # Un second appel (retry du moteur) ne relance pas le scale-up
+        assert client.get("/manage-group/up", params={"namespace": "dev"}).json()["job_id"] == response.json()["job_id"]
+        # L'arrêt du même groupe attend la fin du démarrage, un autre groupe n'est pas bloqué
+        assert client.get("/manage-group/down", params={"namespace": "dev"}).status_code == 409
+        assert client.get("/manage-group/down", params={"namespace": "qa"}).status_code == 202
+        client.portal.call(release.set)
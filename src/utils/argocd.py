@@ -1,21 +1,28 @@
+import asyncio
 import json
 import os
 import sys
+import time
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
+import httpx
 import requests
 import urllib3
 from jwt import decode as jwt_decode
 from jwt import encode as jwt_encode
 from loguru import logger
 
+from utils.metrics import instrument_kube_client, record_cache, track_argocd
+
 # Disable SSL warnings for unverified HTTPS requests
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 class ArgoTokenManager:
     _instance = None
     token: Optional[str]
+    token_expiry: Optional[float]
+    refresh_margin: float
     ARGOCD_API_URL: str
     USERNAME: str
     PASSWORD: str
@@ -25,24 +32,128 @@ class ArgoTokenManager:
         if cls._instance is None:
             cls._instance = super(ArgoTokenManager, cls).__new__(cls)
             cls._instance.token = None
+            cls._instance.token_expiry = None
+            cls._instance.refresh_margin = float(os.getenv("ARGOCD_TOKEN_REFRESH_MARGIN", "300"))
+            cls._instance._refresh_lock = None
+            cls._instance._refresh_task = None
             cls._instance.ARGOCD_API_URL = os.getenv("ARGOCD_API_URL", "http://localhost:8080/api/v1")
             cls._instance.USERNAME = os.getenv("ARGOCD_USERNAME", "admin")
             cls._instance.PASSWORD = os.getenv("ARGOCD_PASSWORD", "admin")
             cls._instance.headers = {"Content-Type": "application/json"}
         return cls._instance
-    
+
     def get_token(self, force_refresh=False):
-        if not self.token or force_refresh:
-            self.token = self._authenticate()
-            if not self.token:
+        if not force_refresh and self._token_valid():
+            record_cache("argocd_token", hit=True)
+            return self.token
+        record_cache("argocd_token", hit=False)
+
+        token = self._authenticate()
+        if not token:
+            logger.error("Failed to authenticate with ArgoCD. Exiting program.")
+            raise Exception("Failed to authenticate with ArgoCD")
+        self._set_token(token)
+        return self.token
+
+    async def aget_token(self, force_refresh: bool = False, stale_token: Optional[str] = None) -> str:
+        """
+        Version asynchrone de get_token.
+
+        Le chemin nominal ne fait qu'une comparaison d'horodatage. À l'approche
+        de l'expiration, le rafraîchissement est lancé en tâche de fond et le
+        token courant reste servi. Les rafraîchissements concurrents sont
+        dédupliqués (single-flight) par un verrou.
+
+        Args:
+            force_refresh: Force une nouvelle authentification (ex: après un 401)
+            stale_token: Token rejeté par ArgoCD ; si un autre appel l'a déjà
+                remplacé, le nouveau token est retourné sans réauthentification
+        """
+        if not force_refresh and self._token_valid():
+            record_cache("argocd_token", hit=True)
+            if self._expires_soon():
+                self._schedule_refresh()
+            return self.token
+        record_cache("argocd_token", hit=False)
+
+        async with self._get_refresh_lock():
+            # Un appel concurrent a déjà remplacé le token rejeté : inutile de se réauthentifier
+            refresh = not self._token_valid() or (force_refresh and (stale_token is None or self.token == stale_token))
+            if not refresh:
+                return self.token
+
+            token = await self._authenticate_async()
+            if not token:
                 logger.error("Failed to authenticate with ArgoCD. Exiting program.")
                 raise Exception("Failed to authenticate with ArgoCD")
-        else:
-            self.token = self._verify_token(self.token)
-            if not self.token:
-                logger.error("Token verification failed. Could not connect to ArgoCD. Exiting program.")
-                raise Exception("Token verification failed. Could not connect to ArgoCD.")
-        return self.token
+            self._set_token(token)
+            return token
+
+    def _set_token(self, token: str):
+        """Mémorise le token et son expiration, décodée une seule fois."""
+        self.token = token
+        try:
+            exp = jwt_decode(token, options={'verify_signature': False}).get("exp")
+            self.token_expiry = float(exp) if exp else None
+            logger.debug(f"Token expiration: {datetime.fromtimestamp(self.token_expiry) if self.token_expiry else 'none'}")
+        except Exception as e:
+            # Token opaque : considéré valide jusqu'à un 401 d'ArgoCD
+            logger.debug(f"Could not decode token expiration: {e}")
+            self.token_expiry = None
+
+    def _token_valid(self) -> bool:
+        if not self.token:
+            return False
+        return self.token_expiry is None or time.time() < self.token_expiry
+
+    def _expires_soon(self) -> bool:
+        return self.token_expiry is not None and time.time() >= self.token_expiry - self.refresh_margin
+
+    def _get_refresh_lock(self) -> asyncio.Lock:
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        return self._refresh_lock
+
+    def _schedule_refresh(self):
+        """Lance un rafraîchissement proactif en arrière-plan s'il n'y en a pas déjà un."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._background_refresh())
+
+    async def _background_refresh(self):
+        try:
+            async with self._get_refresh_lock():
+                if not self._expires_soon():
+                    return
+                logger.info("ArgoCD token close to expiry, refreshing in background")
+                token = await self._authenticate_async()
+                if token:
+                    self._set_token(token)
+        except Exception as e:
+            logger.warning(f"Background ArgoCD token refresh failed: {e}")
+
+    async def _authenticate_async(self):
+        """Authentification asynchrone via le pool de connexions d'ArgoCDClient."""
+        logger.info("Authenticating with Argo CD...")
+        try:
+            with track_argocd("session") as call:
+                response = await ArgoCDClient()._get_http().post(
+                    f"{self.ARGOCD_API_URL}/session",
+                    headers=self.headers,
+                    json={"username": self.USERNAME, "password": self.PASSWORD},
+                    timeout=5,
+                )
+                call["code"] = response.status_code
+            if response.status_code == 200:
+                logger.success("Successfully authenticated with Argo CD.")
+                return response.json()["token"]
+            logger.error(
+                f"Failed to authenticate with Argo CD. Status code: {response.status_code}, Response: {response.text}"
+            )
+            return None
+        except Exception as e:
+            logger.error(f"Exception during authentication with Argo CD: {str(e)}")
+            return None
     
     def _authenticate(self):
         """
@@ -53,12 +164,14 @@ class ArgoTokenManager:
         auth_payload = {"username": self.USERNAME, "password": self.PASSWORD}
         
         try:
-            response = requests.post(
-                f"{self.ARGOCD_API_URL}/session",
-                headers=self.headers,
-                data=json.dumps(auth_payload),
-                timeout=5,
-            )
+            with track_argocd("session") as call:
+                response = requests.post(
+                    f"{self.ARGOCD_API_URL}/session",
+                    headers=self.headers,
+                    data=json.dumps(auth_payload),
+                    timeout=5,
+                )
+                call["code"] = response.status_code
 
             if response.status_code == 200:
                 session_token = response.json()["token"]
@@ -105,34 +218,38 @@ class ArgoTokenManager:
             logger.error(f"Token signature verification failed: {e}")
             return False
 
-    def _verify_token(self, token):
-        """
-        Verifies if the token is valid. If not, obtains a new one.
-        Returns the valid token.
-        """
-        try:
-            decode_token = jwt_decode(token, options={'verify_signature': False})
-            date_token = datetime.fromtimestamp(decode_token.get("exp"))
-            logger.debug(f"Token expiration: {date_token}")
-
-            current_time = datetime.now()
-            is_expired = date_token < current_time
-            logger.debug(f"Token expired: {is_expired}")
-
-            if is_expired:
-                logger.info("Token expired, getting new token")
-                return self._authenticate()
+def list_argocd_applications() -> list[dict]:
+    """
+    Liste les Applications ArgoCD via l'API Kubernetes (CRD argoproj.io).
+    Un seul appel par opération, à partager entre les résolutions.
+    """
+    from kubernetes import client, config
 
-            return token
-        except Exception as e:
-            logger.error(f"Error verifying token: {e}")
-            return self._authenticate()
-        
-def find_argocd_application_for_resource(resource_name: str, resource_namespace: str, resource_labels: dict) -> list[str]:
+    try:
+        config.load_incluster_config()
+    except Exception:
+        config.load_kube_config()
+
+    custom_api = instrument_kube_client(client.CustomObjectsApi())
+    applications = custom_api.list_namespaced_custom_object(
+        group="argoproj.io",
+        version="v1alpha1",
+        namespace="kube-infra",
+        plural="applications"
+    )
+    return applications.get("items", [])
+
+def find_argocd_application_for_resource(
+    resource_name: str,
+    resource_namespace: str,
+    resource_labels: dict,
+    applications: Optional[list[dict]] = None,
+) -> list[str]:
     """
     Find the ArgoCD Application(s) managing this resource.
 
     Returns a list of Application names. Can be empty, single, or multiple Applications.
+    Pass `applications` (from list_argocd_applications) to avoid one API call per resource.
 
     Logic:
     1. Check for argocd.argoproj.io/instance label (explicit ArgoCD label)
@@ -140,27 +257,14 @@ def find_argocd_application_for_resource(resource_name: str, resource_namespace:
     3. Fallback: match by namespace for all Applications with selfHeal enabled
     """
     try:
-        from kubernetes import client, config
-
-        # Try to load kubernetes config
-        try:
-            config.load_incluster_config()
-        except:
-            config.load_kube_config()
-
         # Check for explicit ArgoCD label first
         if resource_labels and "argocd.argoproj.io/instance" in resource_labels:
             return [resource_labels["argocd.argoproj.io/instance"]]
 
         # Query ArgoCD Applications via Kubernetes API
-        custom_api = client.CustomObjectsApi()
         try:
-            applications = custom_api.list_namespaced_custom_object(
-                group="argoproj.io",
-                version="v1alpha1",
-                namespace="kube-infra",
-                plural="applications"
-            )
+            if applications is None:
+                applications = list_argocd_applications()
 
             # Check for app.kubernetes.io/instance label
             if resource_labels and "app.kubernetes.io/instance" in resource_labels:
@@ -171,7 +275,7 @@ def find_argocd_application_for_resource(resource_name: str, resource_namespace:
                 exact_match = None
                 suffix_match = None
 
-                for app in applications.get("items", []):
+                for app in applications:
                     app_name = app["metadata"]["name"]
                     app_spec = app.get("spec", {})
                     app_dest_ns = app_spec.get("destination", {}).get("namespace", "")
@@ -201,7 +305,7 @@ def find_argocd_application_for_resource(resource_name: str, resource_namespace:
             # Fallback: search by namespace only and check if Application has automated selfHeal enabled
             # This handles cases where resources don't have standard labels
             matching_apps = []
-            for app in applications.get("items", []):
+            for app in applications:
                 app_name = app["metadata"]["name"]
                 app_spec = app.get("spec", {})
                 app_dest_ns = app_spec.get("destination", {}).get("namespace", "")
@@ -229,6 +333,77 @@ def find_argocd_application_for_resource(resource_name: str, resource_namespace:
         logger.error(f"Error finding ArgoCD Application: {e}")
         return []
 
+def resolve_argocd_applications(resources, applications: Optional[list[dict]] = None) -> Dict[str, list[str]]:
+    """
+    Associe chaque workload ("namespace/name") aux Applications ArgoCD qui le gèrent.
+
+    Sans applications, la liste n'est récupérée qu'une fois, et seulement si un
+    workload n'a pas le label argocd.argoproj.io/instance.
+    """
+    report: Dict[str, list[str]] = {}
+    for resource in resources:
+        labels = resource.metadata.labels or {}
+        if applications is None and "argocd.argoproj.io/instance" not in labels:
+            try:
+                applications = list_argocd_applications()
+            except Exception as e:
+                logger.warning(f"Failed to query ArgoCD Applications: {e}")
+                applications = []
+
+        apps = find_argocd_application_for_resource(
+            resource_name=resource.metadata.name,
+            resource_namespace=resource.metadata.namespace,
+            resource_labels=labels,
+            applications=applications,
+        )
+        if apps:
+            report[f"{resource.metadata.namespace}/{resource.metadata.name}"] = apps
+    return report
+
+def auto_sync_active(application: dict) -> bool:
+    """Indique si une Application a un auto-sync actif (syncPolicy.automated sans enabled=false)."""
+    automated = (application.get("spec") or {}).get("syncPolicy", {}).get("automated")
+    return automated is not None and automated.get("enabled", True) is not False
+
+async def disable_auto_sync_for_resources(resources) -> Dict[str, list[str]]:
+    """
+    Désactive l'auto-sync une seule fois par Application distincte, en parallèle,
+    pour l'ensemble des workloads d'une opération groupée. La liste des
+    Applications est lue une fois : celles sans auto-sync actif ne sont pas
+    patchées (si la liste est indisponible, toutes le sont).
+
+    Returns:
+        Le rapport workload ("namespace/name") -> Applications ArgoCD
+    """
+    resources = list(resources)
+    if not resources or not argocd_configured():
+        return {}
+
+    try:
+        applications = await asyncio.to_thread(list_argocd_applications)
+    except Exception as e:
+        logger.warning(f"Failed to query ArgoCD Applications: {e}")
+        applications = []
+    report = await asyncio.to_thread(resolve_argocd_applications, resources, applications)
+    names = {app for apps in report.values() for app in apps}
+    logger.info(f"{len(report)} workloads managed by {len(names)} distinct ArgoCD Applications")
+
+    # Comme enable_auto_sync : une Application en sync manuelle n'est pas modifiée,
+    # un bloc automated écrit dans sa spec dériverait de son manifeste (app-of-apps)
+    manual = {
+        app["metadata"]["name"]
+        for app in applications
+        if app["metadata"]["name"] in names and not auto_sync_active(app)
+    }
+    if manual:
+        logger.info(f"Auto-sync already disabled for ArgoCD Applications {sorted(manual)}, leaving them untouched")
+
+    errors = await set_auto_sync_for_applications(names - manual, enabled=False)
+    for app_name, error in errors.items():
+        if error:
+            logger.warning(f"Failed to disable ArgoCD auto-sync for '{app_name}': {error}. Continuing anyway...")
+    return report
+
 def handle_argocd_auto_sync(resource):
     token_manager = ArgoTokenManager()
     if (token_manager.ARGOCD_API_URL and resource.metadata.labels and "argocd.argoproj.io/instance" in resource.metadata.labels):
@@ -255,12 +430,14 @@ def enable_auto_sync(application_name):
         logger.info(f"Checking auto-sync status for application '{application_name}'")
 
         headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-        res = requests.get(
-            f"{token_manager.ARGOCD_API_URL}/applications/{application_name}",
-            headers=headers,
-            timeout=3,
-            verify=False
-        )
+        with track_argocd("get") as call:
+            res = requests.get(
+                f"{token_manager.ARGOCD_API_URL}/applications/{application_name}",
+                headers=headers,
+                timeout=3,
+                verify=False
+            )
+            call["code"] = res.status_code
 
         if res.status_code != 200:
             logger.error(f"ArgoCD application '{application_name}' not found or API error: {res.status_code}. Exiting program")
@@ -297,12 +474,14 @@ def patch_argocd_application(app_name, enable_auto_sync):
     headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
     
     try:
-        res = requests.get(
-            f"{token_manager.ARGOCD_API_URL}/applications/{app_name}",
-            headers=headers,
-            timeout=3,
-            verify=False
-        )
+        with track_argocd("get") as call:
+            res = requests.get(
+                f"{token_manager.ARGOCD_API_URL}/applications/{app_name}",
+                headers=headers,
+                timeout=3,
+                verify=False
+            )
+            call["code"] = res.status_code
         
         if res.status_code != 200:
             logger.error(f"Failed to fetch application '{app_name}'. Status code: {res.status_code}. Exiting program.")
@@ -333,13 +512,15 @@ def patch_argocd_application(app_name, enable_auto_sync):
 
         logger.info(f" app name {app_name}")
 
-        response = requests.put(
-            f"{token_manager.ARGOCD_API_URL}/applications/{app_name}?validate=false",
-            headers=headers,
-            data=json.dumps(app_config),
-            timeout=10,
-            verify=False
-        )
+        with track_argocd("put") as call:
+            response = requests.put(
+                f"{token_manager.ARGOCD_API_URL}/applications/{app_name}?validate=false",
+                headers=headers,
+                data=json.dumps(app_config),
+                timeout=10,
+                verify=False
+            )
+            call["code"] = response.status_code
 
         if response.status_code == 200:
             logger.success("Application patched successfully.")
@@ -350,12 +531,14 @@ def patch_argocd_application(app_name, enable_auto_sync):
             raise Exception(f"Failed to patch application '{app_name}'. Status code: {res.status_code}, Response: {res.text}")
         
         # Verify the patch worked
-        res = requests.get(
-            f"{token_manager.ARGOCD_API_URL}/applications/{app_name}",
-            headers=headers,
-            timeout=5,
-            verify=False
-        )
+        with track_argocd("get") as call:
+            res = requests.get(
+                f"{token_manager.ARGOCD_API_URL}/applications/{app_name}",
+                headers=headers,
+                timeout=5,
+                verify=False
+            )
+            call["code"] = res.status_code
 
         if res.status_code != 200:
             logger.error(f"Failed to verify patch for application '{app_name}'. Status code: {res.status_code}. Exiting program.")
@@ -372,4 +555,168 @@ def patch_argocd_application(app_name, enable_auto_sync):
         raise Exception(f"Network error while patching application: {e}")
     except Exception as e:
         logger.error(f"Unexpected error while patching application: {e}. Exiting program.")
-        raise Exception(f"Unexpected error while patching application: {e}")
\ No newline at end of file
+        raise Exception(f"Unexpected error while patching application: {e}")
+
+# Politique auto-sync restaurée, identique à patch_argocd_application(enable_auto_sync=True)
+AUTO_SYNC_ENABLED_POLICY = {"enabled": True, "prune": True, "selfHeal": True}
+AUTO_SYNC_DISABLED_POLICY = {"enabled": False}
+
+
+def argocd_configured() -> bool:
+    """Indique si ArgoCD est configuré (hors mode dev avec l'URL par défaut)."""
+    token_manager = ArgoTokenManager()
+    return bool(token_manager.ARGOCD_API_URL) and token_manager.ARGOCD_API_URL != "http://localhost:8080/api/v1"
+
+
+class ArgoCDClient:
+    """
+    Client HTTP asynchrone mutualisé pour l'API ArgoCD.
+
+    Une seule instance httpx.AsyncClient (keep-alive, pool de connexions) est
+    partagée par toutes les requêtes. L'activation/désactivation de l'auto-sync
+    se fait en un seul aller-retour via un JSON merge PATCH sur spec.syncPolicy.
+    """
+    _instance = None
+    transport: Optional[httpx.AsyncBaseTransport]
+    max_connections: int
+    concurrency: int
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ArgoCDClient, cls).__new__(cls)
+            cls._instance._http = None
+            cls._instance._loop = None
+            cls._instance.transport = None
+            cls._instance.max_connections = int(os.getenv("ARGOCD_MAX_CONNECTIONS", "20"))
+            cls._instance.concurrency = int(os.getenv("ARGOCD_CONCURRENCY", "10"))
+        return cls._instance
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """Retourne le client httpx partagé, recréé s'il appartient à une autre boucle."""
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http.is_closed or self._loop is not loop:
+            self._http = httpx.AsyncClient(
+                base_url=ArgoTokenManager().ARGOCD_API_URL,
+                verify=False,
+                timeout=httpx.Timeout(10.0, connect=3.0),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                transport=self.transport,
+            )
+            self._loop = loop
+        return self._http
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        token_manager = ArgoTokenManager()
+        token = await token_manager.aget_token()
+        headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+        res = await self._send(method, path, headers, **kwargs)
+
+        if res.status_code == 401:
+            # Token révoqué ou expiré côté serveur : un seul rafraîchissement forcé puis retry
+            logger.warning("ArgoCD returned 401, refreshing token and retrying once")
+            token = await token_manager.aget_token(force_refresh=True, stale_token=token)
+            headers["Authorization"] = f"Bearer {token}"
+            res = await self._send(method, path, headers, **kwargs)
+        return res
+
+    async def _send(self, method: str, path: str, headers: Dict[str, str], **kwargs) -> httpx.Response:
+        with track_argocd(method.lower()) as call:
+            res = await self._get_http().request(method, path, headers=headers, **kwargs)
+            call["code"] = res.status_code
+        return res
+
+    async def get_application(self, app_name: str) -> dict:
+        """Récupère la définition d'une Application ArgoCD."""
+        res = await self._request("GET", f"/applications/{app_name}")
+        if res.status_code != 200:
+            raise Exception(f"Application '{app_name}' not found in Argo CD. Status code: {res.status_code}")
+        return res.json()
+
+    async def set_auto_sync(self, app_name: str, enabled: bool, verify: bool = False) -> dict:
+        """
+        Active ou désactive l'auto-sync d'une Application en un seul PATCH.
+
+        Args:
+            app_name: Nom de l'Application ArgoCD
+            enabled: True pour restaurer l'auto-sync, False pour le désactiver
+            verify: Vérifie la syncPolicy retournée par ArgoCD après le PATCH
+        Returns:
+            L'Application telle que renvoyée par ArgoCD après le PATCH
+        """
+        policy = AUTO_SYNC_ENABLED_POLICY if enabled else AUTO_SYNC_DISABLED_POLICY
+        patch = {"spec": {"syncPolicy": {"automated": policy}}}
+        logger.info(f"{'Enabling' if enabled else 'Disabling'} auto-sync for application '{app_name}'")
+
+        res = await self._request(
+            "PATCH",
+            f"/applications/{app_name}",
+            json={"name": app_name, "patch": json.dumps(patch), "patchType": "merge"},
+        )
+        if res.status_code != 200:
+            logger.error(f"Failed to patch application '{app_name}'. Status code: {res.status_code}, Response: {res.text}")
+            raise Exception(f"Failed to patch application '{app_name}'. Status code: {res.status_code}")
+
+        app_config = res.json()
+        if verify:
+            # La réponse du PATCH contient l'objet persisté : pas de GET supplémentaire
+            automated = app_config.get("spec", {}).get("syncPolicy", {}).get("automated") or {}
+            if bool(automated.get("enabled", bool(automated))) != enabled:
+                raise Exception(f"Auto-sync verification failed for application '{app_name}': {automated}")
+
+        logger.success(f"Auto-sync {'enabled' if enabled else 'disabled'} for application '{app_name}'")
+        return app_config
+
+    async def set_auto_sync_many(
+        self, app_names: Iterable[str], enabled: bool, verify: bool = False
+    ) -> Dict[str, Optional[str]]:
+        """
+        Bascule l'auto-sync de plusieurs Applications en parallèle.
+
+        Returns:
+            Un dictionnaire nom d'Application -> message d'erreur (None si succès)
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def toggle(app_name: str) -> Optional[str]:
+            async with semaphore:
+                try:
+                    await self.set_auto_sync(app_name, enabled, verify=verify)
+                    return None
+                except Exception as e:
+                    logger.warning(f"Failed to toggle auto-sync for '{app_name}': {e}")
+                    return str(e)
+
+        names = list(dict.fromkeys(app_names))
+        results = await asyncio.gather(*(toggle(name) for name in names))
+        return dict(zip(names, results))
+
+    async def aclose(self):
+        """Ferme le pool de connexions."""
+        if self._http is not None and not self._http.is_closed:
+            await self._http.aclose()
+        self._http = None
+        self._loop = None
+
+
+async def disable_auto_sync(application_name: str, verify: bool = False):
+    """Désactive l'auto-sync d'une Application ArgoCD (no-op en mode dev)."""
+    if not argocd_configured():
+        logger.info(f"ArgoCD not configured (dev mode), skipping auto-sync check for '{application_name}'")
+        return
+    await ArgoCDClient().set_auto_sync(application_name, enabled=False, verify=verify)
+
+
+async def set_auto_sync_for_applications(
+    application_names: Iterable[str], enabled: bool, verify: bool = False
+) -> Dict[str, Optional[str]]:
+    """Bascule l'auto-sync de plusieurs Applications en parallèle (no-op en mode dev)."""
+    names = list(dict.fromkeys(application_names))
+    if not names:
+        return {}
+    if not argocd_configured():
+        logger.info(f"ArgoCD not configured (dev mode), skipping auto-sync toggle for {names}")
+        return {name: None for name in names}
+    return await ArgoCDClient().set_auto_sync_many(names, enabled, verify=verify)
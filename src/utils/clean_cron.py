@@ -8,24 +8,19 @@ def clean_cron_expression(expression: Optional[str] = None) -> str:
     Cette fonction s'assure que l'expression CRON a exactement 5 parties
     (minute, heure, jour du mois, mois, jour de la semaine).
     """
-    logger.debug(f"Nettoyage de l'expression CRON: '{expression}'")
-
     if not expression:
-        logger.debug("Expression vide ou None, utilisation de l'expression par défaut")
+        logger.debug("Expression CRON vide ou None, utilisation de l'expression par défaut")
         return "* * * * *"
 
-    cleaned = ' '.join(expression.split())
-    logger.debug(f"Expression après normalisation des espaces: '{cleaned}'")
-    parts = cleaned.split(' ')
-
+    parts = expression.split()
     if len(parts) < 5:
-        logger.debug(f"Expression incomplète ({len(parts)}/5 parties), ajout des parties manquantes")
-        while len(parts) < 5:
-            parts.append('*')
-    if len(parts) > 5:
-        logger.debug(f"Expression trop longue ({len(parts)}/5 parties), suppression des parties excédentaires")
+        parts += ['*'] * (5 - len(parts))
+    elif len(parts) > 5:
         parts = parts[:5]
 
     result = ' '.join(parts)
-    logger.debug(f"Expression CRON nettoyée: '{result}'")
-    return result
\ No newline at end of file
+    # Appelée plusieurs fois par programmation et par requête : une seule ligne,
+    # formatée paresseusement et seulement si l'expression a changé
+    if result != expression:
+        logger.debug("Expression CRON nettoyée: '{}' -> '{}'", expression, result)
+    return result
@@ -1,3 +1,5 @@
+import os
+
 # Protected namespaces and label criteria
 protected_namespaces = [
     "kube-system",
@@ -12,3 +14,66 @@ protected_labels = {
 }
 
 shutdown_label_selector = 'shutdown="false"'
+
+# Optional allow-list (ALLOWED_NAMESPACES, comma-separated) restricting inventory and bulk operations.
+# Up to namespaced_list_threshold namespaces are listed one by one; above that a single
+# cluster-wide list is filtered client-side.
+allowed_namespaces = [ns.strip() for ns in os.getenv("ALLOWED_NAMESPACES", "").split(",") if ns.strip()]
+namespaced_list_threshold = int(os.getenv("NAMESPACED_LIST_THRESHOLD", "5"))
+
+# Page size of list calls (limit/continue), bounding memory by page rather than by cluster size
+list_page_size = int(os.getenv("LIST_PAGE_SIZE", "500"))
+
+# Lean inventory listing: read list responses as raw JSON and keep only the fields the UI needs
+lean_listing = os.getenv("LEAN_LISTING", "false").lower() == "true"
+
+# Annotation recording the capacity of a workload before it is scaled down
+scale_state_annotation = "workload-scheduler/scale-state"
+
+# Ordered startup: workloads are scaled up in waves (lowest first) and down in reverse order.
+# The wave can be forced with a label; dependencies ("name" or "namespace/name", comma-separated)
+# are declared with an annotation and always place a workload after the ones it depends on.
+wave_label = "workload-scheduler/wave"
+depends_on_annotation = "workload-scheduler/depends-on"
+default_wave_tiers = {
+    "sts": 0,
+    "deploy": 1,
+}
+
+# On-demand profiling endpoints (/debug/profile, /debug/memory): hidden (404) unless DEBUG_ENDPOINTS=true
+# and DEBUG_TOKEN is set; every call must then send the token in the X-Debug-Token header.
+debug_endpoints = os.getenv("DEBUG_ENDPOINTS", "false").lower() == "true"
+debug_token = os.getenv("DEBUG_TOKEN", "")
+
+# Watch-based inventory cache serving / and /inventory. Its state is snapshotted to disk so that a restart
+# serves the last inventory immediately and resumes the watches instead of relisting the cluster.
+inventory_cache_enabled = os.getenv("INVENTORY_CACHE", "true").lower() == "true"
+inventory_snapshot_path = os.getenv("INVENTORY_SNAPSHOT_PATH", "data/inventory.snapshot")
+inventory_snapshot_interval = float(os.getenv("INVENTORY_SNAPSHOT_INTERVAL", "60"))
+inventory_watch_timeout = int(os.getenv("INVENTORY_WATCH_TIMEOUT", "300"))
+
+# Deletion of ReplicaSets scaled to zero (/delete-rs jobs and the optional periodic garbage collector).
+# The collector is disabled unless REPLICASET_GC_INTERVAL (seconds) is set, and deletes at most
+# REPLICASET_GC_BATCH ReplicaSets per pass.
+replicaset_delete_concurrency = int(os.getenv("REPLICASET_DELETE_CONCURRENCY", "8"))
+replicaset_delete_qps = float(os.getenv("REPLICASET_DELETE_QPS", "20"))
+replicaset_gc_interval = float(os.getenv("REPLICASET_GC_INTERVAL", "0"))
+replicaset_gc_batch = int(os.getenv("REPLICASET_GC_BATCH", "100"))
+
+# Node pools drained by /manage-all/down-workers, defined by node label selectors:
+# NODE_POOLS="name=selector;name=selector", e.g. "gpu=nvidia.com/gpu.present=true;batch=pool=batch".
+# The default pool "workers" selects every node without the control-plane role.
+node_pools = {
+    name.strip(): selector.strip()
+    for name, _, selector in (
+        pool.partition("=") for pool in os.getenv(
+            "NODE_POOLS", "workers=!node-role.kubernetes.io/control-plane"
+        ).split(";") if pool.strip()
+    )
+}
+default_node_pool = os.getenv("DEFAULT_NODE_POOL", next(iter(node_pools), "workers"))
+
+# Workloads never scaled down when draining a node pool ("name" or "namespace/name", comma-separated)
+drain_excluded_workloads = [
+    w.strip() for w in os.getenv("DRAIN_EXCLUDED_WORKLOADS", "traefik,kyverno").split(",") if w.strip()
+]
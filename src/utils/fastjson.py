@@ -0,0 +1,66 @@
+"""
+Backend JSON rapide : orjson s'il est installé, sinon la bibliothèque standard.
+
+Utilisé par la classe de réponse de l'API, le sink de logs et la sérialisation
+de l'inventaire.
+"""
+import dataclasses
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Optional
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Types non natifs du json standard (orjson gère déjà dataclasses et datetimes)."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        # Champ par champ, sans la copie profonde de dataclasses.asdict
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Sérialise obj en JSON (bytes UTF-8).
+
+    Args:
+        obj: Objet à sérialiser
+        default: Conversion des types non supportés (par défaut dataclasses, dates, enums, sets)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default or _default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        obj, default=default or _default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps_str(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Comme dumps, mais renvoie une chaîne."""
+    return dumps(obj, default).decode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Désérialise un document JSON (str ou bytes)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """Réponse JSON sérialisée avec le backend rapide."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,35 +1,87 @@
 import os
+import threading
+
 import httpx
 from kubernetes import client, config
 from loguru import logger
+from opentelemetry.trace import SpanKind, Status, StatusCode
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from utils.metrics import instrument_kube_client
+from utils.tracing import inject_headers, tracer
+
+
+_kube_config_lock = threading.Lock()
+_kube_config_loaded = False
+
+
+def load_kubernetes_config():
+    """Load the Kubernetes configuration once, based on environment"""
+    global _kube_config_loaded
+    with _kube_config_lock:
+        if _kube_config_loaded:
+            return
+        if os.getenv("KUBE_ENV") == "development":
+            config.load_kube_config()  # For local development
+            logger.info("Kubernetes local configuration loaded.")
+        else:
+            config.load_incluster_config()  # For running inside a cluster
+            logger.info("Kubernetes in cluster configuration loaded.")
+        _kube_config_loaded = True
+
+
+class LazyKubeClient:
+    """
+    Client d'API Kubernetes créé au premier usage.
+
+    Importer ce module ne touche ni au kubeconfig ni au réseau : la
+    configuration est chargée et le client instancié (puis instrumenté) au
+    premier attribut demandé, par une requête ou par la tâche de démarrage
+    qui les prépare en arrière-plan (voir main.lifespan). La classe elle-même
+    est résolue par son nom : kubernetes.client charge ses API et modèles à la
+    demande, et y accéder à l'import coûte près d'une seconde.
+    """
+
+    def __init__(self, api_class: str):
+        self._api_class = api_class
+        self._client = None
+        self._lock = threading.Lock()
+
+    def resolve(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    load_kubernetes_config()
+                    self._client = instrument_kube_client(getattr(client, self._api_class)())
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+    def __repr__(self):
+        state = "initialized" if self._client is not None else "not initialized"
+        return f"<LazyKubeClient {self._api_class} ({state})>"
+
 
-# Initialize Kubernetes API clients
 def initialize_kubernetes():
-    """Initialize Kubernetes clients based on environment"""
-    if os.getenv("KUBE_ENV") == "development":
-        config.load_kube_config()  # For local development
-        logger.info("Kubernetes local configuration loaded.")
-    else:
-        config.load_incluster_config()  # For running inside a cluster
-        logger.info("Kubernetes in cluster configuration loaded.")
-    
-    # Create API clients
-    apps_v1_api = client.AppsV1Api()
-    core_v1_api = client.CoreV1Api()
+    """Initialize Kubernetes clients (config and API clients) now rather than on first use"""
+    for api in (apps_v1, core_v1, autoscaling_v2):
+        api.resolve()
     logger.info("Kubernetes API clients initialized.")
-    return apps_v1_api, core_v1_api
+    return apps_v1, core_v1
 
-# Initialize at module level, but skip in test mode
+# Declared at module level, but skip in test mode
 if os.getenv("TESTING") == "1":
     # In test mode, create None placeholders (tests should mock these)
     apps_v1 = None
     core_v1 = None
+    autoscaling_v2 = None
     logger.warning("Skipping Kubernetes initialization in test mode")
 else:
-    # Normal initialization for production/development
-    apps_v1, core_v1 = initialize_kubernetes()
+    # Created on first use: importing this module stays free of I/O
+    apps_v1 = LazyKubeClient("AppsV1Api")
+    core_v1 = LazyKubeClient("CoreV1Api")
+    autoscaling_v2 = LazyKubeClient("AutoscalingV2Api")
 
 class RetryableAsyncClient(httpx.AsyncClient):
     """🔄 Client HTTP avec retry intégré"""
@@ -46,26 +98,38 @@ class RetryableAsyncClient(httpx.AsyncClient):
         reraise=True,
     )
     async def request(self, *args, **kwargs) -> httpx.Response:
-        """Surcharge de la méthode request pour ajouter le retry"""
-        try:
-            # Assurons-nous que chaque requête suit les redirections
-            if "follow_redirects" not in kwargs:
-                kwargs["follow_redirects"] = True
-
-            response = await super().request(*args, **kwargs)
-            response.raise_for_status()
-            return response
-
-        except httpx.TimeoutException as e:
-            logger.error(f"Request timed out: {e}")
-            raise  # Relève l'exception pour que le retry puisse fonctionner
-
-        except httpx.RequestError as e:
-            logger.error(f"Request error: {e!s}")
-            raise  # Relève l'exception pour que le retry puisse fonctionner
-
-        except httpx.HTTPError as e:
-            logger.error(f"❌ Erreur HTTP: {e}")
-            if hasattr(e, "response") and e.response is not None:
-                logger.error(f"Réponse: {e.response.text}")
-            raise
\ No newline at end of file
+        """
+        Surcharge de la méthode request pour ajouter le retry.
+
+        Chaque tentative ouvre un span client et propage le contexte de trace
+        (traceparent) vers l'API.
+        """
+        method = args[0] if args else kwargs.get("method", "GET")
+        with tracer.start_as_current_span(f"HTTP {method}", kind=SpanKind.CLIENT) as span:
+            kwargs["headers"] = inject_headers(kwargs.get("headers"))
+            try:
+                # Assurons-nous que chaque requête suit les redirections
+                if "follow_redirects" not in kwargs:
+                    kwargs["follow_redirects"] = True
+
+                response = await super().request(*args, **kwargs)
+                span.set_attribute("http.response.status_code", response.status_code)
+                response.raise_for_status()
+                return response
+
+            except httpx.TimeoutException as e:
+                span.set_status(Status(StatusCode.ERROR, "timeout"))
+                logger.error(f"Request timed out: {e}")
+                raise  # Relève l'exception pour que le retry puisse fonctionner
+
+            except httpx.RequestError as e:
+                span.set_status(Status(StatusCode.ERROR, str(e)))
+                logger.error(f"Request error: {e!s}")
+                raise  # Relève l'exception pour que le retry puisse fonctionner
+
+            except httpx.HTTPError as e:
+                span.set_status(Status(StatusCode.ERROR, str(e)))
+                logger.error(f"❌ Erreur HTTP: {e}")
+                if hasattr(e, "response") and e.response is not None:
+                    logger.error(f"Réponse: {e.response.text}")
+                raise
\ No newline at end of file
@@ -1,13 +1,127 @@
 """
 Configuration centralisée du logging pour Datadog.
 Ce module configure loguru pour produire des logs au format JSON compatibles avec Datadog.
+
+Les lignes sont mises en file et écrites par lots par un thread dédié, pour que
+l'event loop n'attende jamais sur stderr. Les messages DEBUG/TRACE répétitifs
+sont limités par call site (LOG_RATE_LIMIT lignes par LOG_RATE_WINDOW secondes).
 """
-import json
+import atexit
 import os
+import queue
 import sys
+import threading
+import time
 
 from loguru import logger
 
+from utils.fastjson import dumps_str
+
+
+class BatchingWriter:
+    """
+    Écrit les logs sur stderr depuis un thread de fond, par lots.
+
+    Attributes:
+        batch_size: Nombre maximal de lignes écrites (et d'un seul flush) par lot
+        dropped: Lignes perdues parce que la file était pleine
+    """
+
+    def __init__(self, max_queue: int = 10000, batch_size: int = 256, stream=None):
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.batch_size = batch_size
+        self.stream = stream
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, log_data: dict):
+        """Met une ligne en file sans jamais bloquer l'appelant."""
+        try:
+            self._queue.put_nowait(log_data)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0):
+        """Attend que la file soit écrite (arrêt du processus, tests)."""
+        with self._queue.all_tasks_done:
+            self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write(self, batch):
+        lines = []
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            lines.append(dumps_str({"level": "WARNING", "message": f"Log queue full, {dropped} lines dropped"}))
+        # default=str : un extra non sérialisable ne doit pas faire perdre la ligne de log
+        lines.extend(dumps_str(log_data, default=str) for log_data in batch)
+        stream = self.stream or sys.stderr
+        try:
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+        except Exception:
+            pass
+
+
+class CallSiteRateLimiter:
+    """
+    Filtre loguru limitant le nombre de lignes par call site (fichier, ligne).
+
+    Seuls les niveaux jusqu'à max_level (DEBUG par défaut) sont limités : INFO et
+    SUCCESS tracent les actions (scalings...) et ne doivent pas être perdus. Le
+    nombre de lignes supprimées est ajouté à la première ligne émise de la
+    fenêtre suivante.
+    """
+
+    def __init__(self, limit: int = 20, window: float = 10.0, clock=time.monotonic, max_level: str = "DEBUG"):
+        self.limit = limit
+        self.window = window
+        self.clock = clock
+        self.max_level_no = logger.level(max_level).no
+        self._sites: dict = {}
+
+    def __call__(self, record) -> bool:
+        if self.limit <= 0 or record["level"].no > self.max_level_no:
+            return True
+
+        key = (record["file"].path, record["line"])
+        now = self.clock()
+        site = self._sites.get(key)
+        if site is None or now - site[0] >= self.window:
+            suppressed = site[2] if site else 0
+            self._sites[key] = [now, 1, 0]
+            if suppressed:
+                record["extra"]["suppressed"] = suppressed
+            return True
+        if site[1] < self.limit:
+            site[1] += 1
+            return True
+        site[2] += 1
+        return False
+
+
+_writer: BatchingWriter | None = None
+
+
+def get_writer() -> BatchingWriter:
+    """Writer partagé par toutes les configurations du processus."""
+    global _writer
+    if _writer is None:
+        _writer = BatchingWriter(max_queue=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+        atexit.register(_writer.flush)
+    return _writer
+
 
 def configure_logger(service_name: str = "workload-scheduler", component: str = "api"):
     """
@@ -25,9 +139,12 @@ def configure_logger(service_name: str = "workload-scheduler", component: str =
         print(f"Invalid LOG_LEVEL: {log_level}. Using INFO as default.")
         log_level = "INFO"
 
+    writer = get_writer()
+
     def sink(message):
         """
         Custom sink pour formater les logs en JSON pour Datadog.
+        La sérialisation et l'écriture sont faites par le thread du writer.
         """
         record = message.record
         log_data = {
@@ -50,10 +167,9 @@ def configure_logger(service_name: str = "workload-scheduler", component: str =
 
         # Ajouter les extras si présents
         if record["extra"]:
-            log_data["extra"] = record["extra"]
+            log_data["extra"] = dict(record["extra"])
 
-        sys.stderr.write(json.dumps(log_data) + "\n")
-        sys.stderr.flush()
+        writer.put(log_data)
 
     # Supprimer les handlers par défaut
     logger.remove()
@@ -64,6 +180,10 @@ def configure_logger(service_name: str = "workload-scheduler", component: str =
         level=log_level,
         colorize=False,
         catch=True,
+        filter=CallSiteRateLimiter(
+            limit=int(os.getenv("LOG_RATE_LIMIT", "20")),
+            window=float(os.getenv("LOG_RATE_WINDOW", "10")),
+        ),
     )
 
     logger.info(f"Logger configuré pour {service_name}/{component} avec niveau {log_level}")
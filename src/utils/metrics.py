@@ -0,0 +1,211 @@
+"""
+Métriques Prometheus de l'API et du moteur de scheduling.
+
+L'API les expose sur GET /metrics ; le moteur de scheduling, qui tourne dans
+son propre processus, les expose sur SCHEDULER_METRICS_PORT. Les appels
+Kubernetes et ArgoCD mesurés ici ouvrent aussi un span (voir utils/tracing.py).
+"""
+import functools
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+from utils.tracing import tracer
+
+# Les actions de scale et les appels externes vont de quelques ms à plusieurs minutes
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+DELAY_BUCKETS = (1, 5, 10, 30, 60, 90, 120, 180, 300, 600, 1800, 3600)
+
+# --- Moteur de scheduling
+SCHEDULER_TICK_SECONDS = Histogram(
+    "workload_scheduler_tick_duration_seconds",
+    "Durée d'une vérification complète des programmations",
+    buckets=LATENCY_BUCKETS,
+)
+SCHEDULES_EVALUATED = Counter(
+    "workload_scheduler_schedules_evaluated_total",
+    "Programmations évaluées",
+)
+ACTIONS_TOTAL = Counter(
+    "workload_scheduler_actions_total",
+    "Actions déclenchées par le moteur de scheduling",
+    ["action", "kind", "result"],
+)
+ACTION_SECONDS = Histogram(
+    "workload_scheduler_action_duration_seconds",
+    "Durée d'une action déclenchée par le moteur (appel API compris)",
+    ["action", "kind"],
+    buckets=LATENCY_BUCKETS,
+)
+ACTION_DELAY_SECONDS = Histogram(
+    "workload_scheduler_action_delay_seconds",
+    "Délai entre l'heure cron et la fin de l'action (0 si terminée en avance)",
+    ["action", "kind"],
+    buckets=DELAY_BUCKETS,
+)
+
+# --- Scale des workloads (api/workload.py)
+SCALE_SECONDS = Histogram(
+    "workload_scheduler_scale_duration_seconds",
+    "Durée du scale d'un workload",
+    ["kind", "action"],
+    buckets=LATENCY_BUCKETS,
+)
+SCALE_FAILURES = Counter(
+    "workload_scheduler_scale_failures_total",
+    "Échecs de scale d'un workload",
+    ["kind", "action"],
+)
+
+# --- Appels externes
+KUBE_REQUESTS = Counter(
+    "workload_scheduler_kube_requests_total",
+    "Appels à l'API Kubernetes",
+    ["method", "resource", "code"],
+)
+KUBE_REQUEST_SECONDS = Histogram(
+    "workload_scheduler_kube_request_duration_seconds",
+    "Latence des appels à l'API Kubernetes",
+    ["method", "resource"],
+    buckets=LATENCY_BUCKETS,
+)
+ARGOCD_REQUESTS = Counter(
+    "workload_scheduler_argocd_requests_total",
+    "Appels à l'API ArgoCD",
+    ["operation", "code"],
+)
+ARGOCD_REQUEST_SECONDS = Histogram(
+    "workload_scheduler_argocd_request_duration_seconds",
+    "Latence des appels à l'API ArgoCD",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# --- Base de données, caches et inventaire
+DB_QUERY_SECONDS = Histogram(
+    "workload_scheduler_db_query_duration_seconds",
+    "Latence des requêtes SQL",
+    ["statement"],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "workload_scheduler_cache_requests_total",
+    "Accès aux caches (hit ratio = hit / total)",
+    ["cache", "result"],
+)
+INVENTORY_BUILD_SECONDS = Histogram(
+    "workload_scheduler_inventory_build_duration_seconds",
+    "Durée de construction de l'inventaire par type de workload",
+    ["kind"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Renvoie le registre au format texte Prometheus et son content-type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def record_cache(cache: str, hit: bool):
+    """Compte un accès à un cache."""
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def timed_inventory(kind: str):
+    """Décorateur mesurant la construction de l'inventaire d'un type de workload."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with INVENTORY_BUILD_SECONDS.labels(kind=kind).time():
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def track_argocd(operation: str):
+    """
+    Mesure un appel ArgoCD. Le bloc peut renseigner le code HTTP via
+    le dict renvoyé (call["code"] = response.status_code).
+    """
+    call = {"code": "error"}
+    start = time.perf_counter()
+    with tracer.start_as_current_span(f"argocd {operation}", kind=SpanKind.CLIENT) as span:
+        try:
+            yield call
+        finally:
+            ARGOCD_REQUEST_SECONDS.labels(operation=operation).observe(time.perf_counter() - start)
+            ARGOCD_REQUESTS.labels(operation=operation, code=str(call["code"])).inc()
+            span.set_attribute("http.response.status_code", str(call["code"]))
+
+
+@contextmanager
+def track_scale(kind: str, action: str):
+    """Mesure le scale d'un workload ; une exception est comptée comme un échec."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        SCALE_FAILURES.labels(kind=kind, action=action).inc()
+        raise
+    finally:
+        SCALE_SECONDS.labels(kind=kind, action=action).observe(time.perf_counter() - start)
+
+
+def kube_resource(url: str) -> str:
+    """
+    Réduit l'URL d'un appel Kubernetes à sa ressource (et sous-ressource), sans
+    namespace ni nom d'objet, pour garder une cardinalité bornée.
+
+    /apis/apps/v1/namespaces/shop/deployments/api/scale -> deployments/scale
+    """
+    parts = [part for part in urlsplit(url).path.split("/") if part]
+    if not parts:
+        return "unknown"
+    # /api/v1/... ou /apis/<group>/<version>/...
+    rest = parts[2:] if parts[0] == "api" else parts[3:]
+    if len(rest) > 2 and rest[0] == "namespaces":
+        rest = rest[2:]
+    if not rest:
+        return "unknown"
+    return f"{rest[0]}/{rest[2]}" if len(rest) > 2 else rest[0]
+
+
+def instrument_kube_client(api):
+    """
+    Mesure tous les appels HTTP d'un client de l'API Kubernetes (AppsV1Api,
+    CoreV1Api...), au niveau du client REST partagé par toutes ses méthodes.
+    """
+    rest_client = api.api_client.rest_client
+    if getattr(rest_client, "_metrics_instrumented", False):
+        return api
+    request = rest_client.request
+
+    def timed_request(method, url, *args, **kwargs):
+        resource = kube_resource(url)
+        code = "error"
+        start = time.perf_counter()
+        with tracer.start_as_current_span(
+            f"kube {method} {resource}",
+            kind=SpanKind.CLIENT,
+            attributes={"http.request.method": method, "k8s.resource": resource},
+        ) as span:
+            try:
+                response = request(method, url, *args, **kwargs)
+                code = getattr(response, "status", code)
+                return response
+            except Exception as e:
+                code = getattr(e, "status", None) or code
+                span.set_status(Status(StatusCode.ERROR, str(code)))
+                raise
+            finally:
+                KUBE_REQUEST_SECONDS.labels(method=method, resource=resource).observe(time.perf_counter() - start)
+                KUBE_REQUESTS.labels(method=method, resource=resource, code=str(code)).inc()
+                span.set_attribute("http.response.status_code", str(code))
+
+    rest_client.request = timed_request
+    rest_client._metrics_instrumented = True
+    return api
@@ -0,0 +1,161 @@
+"""
+Profilage à la demande du processus en cours : échantillonnage CPU des piles
+de tous les threads et instantanés tracemalloc.
+
+L'échantillonneur lit sys._current_frames() à intervalle fixe depuis son
+propre thread : il voit la boucle asyncio, le threadpool des endpoints
+synchrones et les threads d'arrière-plan (logs, watch...), sans instrumenter
+le code ni redémarrer le processus. Le coût est celui d'un parcours de piles
+par échantillon.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Optional
+
+# Feuilles de pile d'un thread en attente (verrou, file, select) : exclues par défaut
+IDLE_LEAVES = {
+    ("threading.py", "wait"), ("threading.py", "_wait_for_tstate_lock"), ("queue.py", "get"),
+    ("selectors.py", "select"), ("socketserver.py", "serve_forever"), ("thread.py", "_worker"),
+}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_idle(frame) -> bool:
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES
+
+
+class StackSampler:
+    """
+    Échantillonneur de piles, au format "collapsed stacks" (flamegraph.pl,
+    speedscope) : une ligne "thread;racine;...;feuille nombre" par pile.
+
+    Attributes:
+        interval: Intervalle entre deux échantillons (secondes)
+        include_idle: Garde les threads en attente (verrou, file, select)
+        stacks: Nombre d'échantillons par pile
+        samples: Nombre de tours d'échantillonnage
+    """
+
+    def __init__(self, interval: float = 0.005, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+    def sample(self, exclude: Optional[int] = None):
+        """Un tour d'échantillonnage de tous les threads (sauf exclude)."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == exclude or (not self.include_idle and _is_idle(frame)):
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(labels))] += 1
+        self.samples += 1
+
+    def run(self, seconds: float) -> "StackSampler":
+        """Échantillonne pendant seconds secondes (bloquant : à lancer dans un thread)."""
+        own = threading.get_ident()
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            self.sample(exclude=own)
+            time.sleep(self.interval)
+        return self
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+    def top(self, limit: int = 30) -> str:
+        """Fonctions les plus présentes : en feuille (self) et n'importe où dans la pile (cumulé)."""
+        own, cumulative = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")[1:]
+            if frames:
+                own[frames[-1]] += count
+            for label in set(frames):
+                cumulative[label] += count
+        total = sum(own.values()) or 1
+        lines = [f"{self.samples} samples every {self.interval * 1000:.1f} ms, {total} thread stacks"]
+        for title, counter in (("self", own), ("cumulative", cumulative)):
+            lines.append(f"\n{title:>10}  function")
+            for label, count in counter.most_common(limit):
+                lines.append(f"{count / total:>9.1%}  {label}")
+        return "\n".join(lines) + "\n"
+
+
+# --- Mémoire
+
+_baseline: Optional[tracemalloc.Snapshot] = None
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def start_memory_tracing(frames: int = 10) -> bool:
+    """Démarre tracemalloc (aussi possible au lancement avec PYTHONTRACEMALLOC=<frames>)."""
+    global _baseline
+    if tracemalloc.is_tracing():
+        return False
+    tracemalloc.start(frames)
+    _baseline = None
+    return True
+
+
+def stop_memory_tracing() -> bool:
+    global _baseline
+    if not tracemalloc.is_tracing():
+        return False
+    tracemalloc.stop()
+    _baseline = None
+    return True
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+
+def memory_report(top: int = 25, group_by: str = "lineno", diff: bool = True) -> str:
+    """
+    Principales allocations vivantes, ou leur évolution depuis le rapport
+    précédent (diff) ; l'instantané courant devient la référence suivante.
+    """
+    global _baseline
+    snapshot = take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    lines = [f"traced: {current / 2**20:.1f} MiB, peak {peak / 2**20:.1f} MiB, "
+             f"tracemalloc overhead {tracemalloc.get_tracemalloc_memory() / 2**20:.1f} MiB"]
+    if diff and _baseline is not None:
+        lines.append(f"\ntop {top} differences since the previous report ({group_by}):")
+        stats = snapshot.compare_to(_baseline, group_by)
+    else:
+        lines.append(f"\ntop {top} allocations ({group_by}):")
+        stats = snapshot.statistics(group_by)
+    for stat in stats[:top]:
+        lines.append(str(stat))
+        if group_by == "traceback":
+            lines.extend(f"    {line}" for line in stat.traceback.format())
+    _baseline = snapshot
+    return "\n".join(lines) + "\n"
+
+
+def dump_snapshot() -> bytes:
+    """Instantané complet, à analyser hors ligne avec tracemalloc.Snapshot.load()."""
+    with tempfile.NamedTemporaryFile(suffix=".snapshot") as f:
+        take_snapshot().dump(f.name)
+        return f.read()
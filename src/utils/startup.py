@@ -0,0 +1,90 @@
+"""
+Tâches d'initialisation lancées en arrière-plan au démarrage de l'API.
+
+Le serveur accepte les connexions immédiatement ; la configuration
+Kubernetes, la synchronisation des UIDs, le token ArgoCD... s'exécutent
+comme des tâches suivies. /ready ne répond 200 qu'une fois toutes les tâches
+requises terminées, /live reste indépendant.
+
+Une tâche requise qui échoue (apiserver pas encore joignable...) est relancée
+avec un délai exponentiel plutôt que de laisser le pod non prêt pour toujours ;
+une tâche optionnelle est tentée une fois et son échec est seulement signalé.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from loguru import logger
+
+STARTUP_RETRY_MIN = 1.0
+STARTUP_RETRY_MAX = 60.0
+
+
+class StartupTasks:
+    """
+    Registre des tâches de démarrage et de leur état.
+
+    Attributes:
+        tasks: Tâches asyncio en cours, par nom
+        states: État par nom (pending, running, success, error), tentatives, durée, erreur
+    """
+
+    def __init__(self, retry_min: float = STARTUP_RETRY_MIN, retry_max: float = STARTUP_RETRY_MAX):
+        self.retry_min = retry_min
+        self.retry_max = retry_max
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.states: Dict[str, Dict[str, Any]] = {}
+
+    def start(self, name: str, func: Callable[[], Awaitable[Any]], required: bool = True) -> asyncio.Task:
+        """Lance func() en arrière-plan sous le nom name."""
+        self.states[name] = {"status": "pending", "required": required, "attempts": 0,
+                             "duration": None, "error": None}
+        self.tasks[name] = asyncio.create_task(self._run(name, func), name=f"startup:{name}")
+        return self.tasks[name]
+
+    async def _run(self, name: str, func: Callable[[], Awaitable[Any]]):
+        state = self.states[name]
+        started = time.perf_counter()
+        delay = self.retry_min
+        while True:
+            state["status"] = "running"
+            state["attempts"] += 1
+            try:
+                await func()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                state.update(status="error", error=str(e))
+                if not state["required"]:
+                    logger.warning(f"Startup task {name} failed: {e}")
+                    return
+                logger.error(f"Startup task {name} failed (attempt {state['attempts']}), retrying in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.retry_max)
+                continue
+            state.update(status="success", error=None, duration=round(time.perf_counter() - started, 3))
+            logger.success(f"Startup task {name} done in {state['duration']}s")
+            return
+
+    def ready(self) -> bool:
+        """Vrai quand toutes les tâches requises ont réussi."""
+        return all(s["status"] == "success" for s in self.states.values() if s["required"])
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {name: dict(state) for name, state in self.states.items()}
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Attend la fin des tâches lancées (utile aux tests et aux scripts)."""
+        if self.tasks:
+            await asyncio.wait(self.tasks.values(), timeout=timeout)
+        return self.ready()
+
+    async def shutdown(self):
+        """Annule les tâches encore en cours (arrêt du serveur)."""
+        for task in self.tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+        self.tasks.clear()
+
+
+startup_tasks = StartupTasks()
@@ -0,0 +1,148 @@
+"""
+Traces OpenTelemetry, du tick du moteur de scheduling jusqu'aux appels à l'apiserver.
+
+Sans configuration, l'API OpenTelemetry ne produit que des spans no-op : le coût
+reste négligeable. L'export OTLP est activé par OTEL_EXPORTER_OTLP_ENDPOINT (ou
+OTEL_EXPORTER_OTLP_TRACES_ENDPOINT) ; les tests utilisent in_memory_exporter().
+"""
+import functools
+import inspect
+import os
+from typing import Optional
+
+from loguru import logger
+from opentelemetry import context, propagate, trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+tracer = trace.get_tracer("workload-scheduler")
+
+_provider = None
+_memory_exporter = None
+
+
+def _get_provider(service_name: str, component: str):
+    """Crée (une seule fois par processus) le TracerProvider du SDK."""
+    global _provider
+    if _provider is None:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+
+        _provider = TracerProvider(resource=Resource.create({
+            "service.name": service_name,
+            "service.component": component,
+        }))
+        trace.set_tracer_provider(_provider)
+    return _provider
+
+
+def configure_tracing(service_name: str = "workload-scheduler", component: str = "api") -> bool:
+    """
+    Active l'export OTLP/HTTP des traces si un endpoint est configuré.
+
+    Args:
+        service_name: Nom du service (attribut service.name)
+        component: Composant de l'application (api, scheduler)
+    Returns:
+        True si l'export est actif
+    """
+    if not (os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT") or os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT")):
+        return False
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError as e:
+        logger.warning(f"OpenTelemetry SDK/OTLP exporter not installed, tracing disabled: {e}")
+        return False
+
+    _get_provider(service_name, component).add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    logger.info(f"OTLP tracing enabled for {service_name}/{component}")
+    return True
+
+
+def in_memory_exporter():
+    """
+    Exporter en mémoire (tests) : les spans terminés sont disponibles via
+    get_finished_spans(). Appeler clear() entre deux tests.
+    """
+    global _memory_exporter
+    if _memory_exporter is None:
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+            InMemorySpanExporter,
+        )
+
+        _memory_exporter = InMemorySpanExporter()
+        _get_provider("workload-scheduler", "test").add_span_processor(SimpleSpanProcessor(_memory_exporter))
+    return _memory_exporter
+
+
+def inject_headers(headers: Optional[dict] = None) -> dict:
+    """Ajoute le contexte de trace courant (traceparent) aux en-têtes HTTP."""
+    headers = dict(headers or {})
+    propagate.inject(headers)
+    return headers
+
+
+def traced(name: str, **attributes):
+    """Décorateur ouvrant un span autour d'une fonction (synchrone ou asynchrone)."""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.start_as_current_span(name, attributes=attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(name, attributes=attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TracingMiddleware:
+    """
+    Middleware ASGI : un span serveur par requête HTTP, rattaché à la trace
+    de l'appelant (en-tête traceparent du moteur de scheduling).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        token = context.attach(propagate.extract(carrier))
+        status_code = None
+        try:
+            with tracer.start_as_current_span(
+                f"{scope['method']} {scope['path']}",
+                kind=SpanKind.SERVER,
+                attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+            ) as span:
+                async def send_wrapper(message):
+                    nonlocal status_code
+                    if message["type"] == "http.response.start":
+                        status_code = message["status"]
+                    await send(message)
+
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                finally:
+                    # Nom par template de route (/manage/{action}/...) pour une cardinalité bornée
+                    route = scope.get("route")
+                    if route is not None and getattr(route, "path", None):
+                        span.update_name(f"{scope['method']} {route.path}")
+                        span.set_attribute("http.route", route.path)
+                    if status_code is not None:
+                        span.set_attribute("http.response.status_code", status_code)
+                        if status_code >= 500:
+                            span.set_status(Status(StatusCode.ERROR))
+        finally:
+            context.detach(token)